@@ -0,0 +1,138 @@
+"""Batched alignment of many laps onto one distance grid.
+
+All laps are resampled in a single NumPy pass: lap arrays are concatenated,
+each lap's distances are shifted into their own disjoint band, and one
+searchsorted call finds the interpolation brackets for every lap at once.
+Deltas, spreads and consistency bands are then plain reductions over the
+resulting (laps x samples) arrays.
+"""
+import numpy as np
+
+from delta import DEFAULT_RESOLUTION
+
+ALIGNED_CHANNELS = ('Time', 'Speed')
+
+DEFAULT_MINISECTORS = 25
+
+# Laps compared together must cover this share of the median lap distance
+MIN_COVERAGE = 0.95
+
+
+def align_laps(laps, resolution=DEFAULT_RESOLUTION, channels=ALIGNED_CHANNELS):
+    """Resample every lap onto the distance range all of them cover.
+
+    `laps` is a sequence of LapTelemetry (or mappings of arrays) whose
+    Distance is non-decreasing. Returns a dict with 'distance' (samples,)
+    and one (laps, samples) float64 array per channel.
+    """
+    lengths = np.array([len(lap['Distance']) for lap in laps])
+    if len(lengths) == 0 or (lengths < 2).any():
+        raise ValueError("Every lap needs at least two telemetry samples")
+
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    distance = np.concatenate([np.asarray(lap['Distance'], dtype=np.float64) for lap in laps])
+
+    starts = distance[offsets[:-1]]
+    stops = distance[offsets[1:] - 1]
+    grid = np.linspace(starts.max(), stops.min(), resolution)
+
+    # Shift each lap into its own band so one sorted array covers every lap
+    lap_count = len(lengths)
+    base = distance.min()
+    span = distance.max() - base + 1.0
+    bands = np.arange(lap_count) * span
+    keyed = distance - base + np.repeat(bands, lengths)
+    queries = (grid - base)[None, :] + bands[:, None]
+
+    hi = np.searchsorted(keyed, queries.ravel(), side='right').reshape(lap_count, resolution)
+    hi = np.clip(hi, offsets[:-1, None] + 1, offsets[1:, None] - 1)
+    lo = hi - 1
+
+    x0 = distance[lo]
+    dx = distance[hi] - x0
+    weight = np.divide(grid[None, :] - x0, dx, out=np.zeros_like(dx), where=dx > 0)
+
+    aligned = {'distance': grid}
+    for channel in channels:
+        values = np.concatenate([np.asarray(lap[channel], dtype=np.float64) for lap in laps])
+        aligned[channel] = values[lo] + weight * (values[hi] - values[lo])
+    return aligned
+
+
+def summarize_laps(aligned, reference=0):
+    """Reduce aligned laps to deltas against a reference lap and consistency bands.
+
+    Returns a dict of arrays: 'delta' (laps, samples) time gap to the
+    reference lap (positive means slower), its mean/std/min/max across laps,
+    the same spread for speed, and 'final_delta' per lap at the end of the
+    common distance range.
+    """
+    time = aligned['Time']
+    speed = aligned['Speed']
+    delta = time - time[reference]
+
+    return {
+        'distance': aligned['distance'],
+        'delta': delta,
+        'delta_mean': delta.mean(axis=0),
+        'delta_std': delta.std(axis=0),
+        'delta_min': delta.min(axis=0),
+        'delta_max': delta.max(axis=0),
+        'speed_reference': speed[reference],
+        'speed_mean': speed.mean(axis=0),
+        'speed_std': speed.std(axis=0),
+        'speed_min': speed.min(axis=0),
+        'speed_max': speed.max(axis=0),
+        'final_delta': delta[:, -1],
+    }
+
+
+def complete_laps(laps, min_coverage=MIN_COVERAGE):
+    """Return a mask of the laps whose distance covers min_coverage of the median lap.
+
+    A partial lap would shrink the distance range every lap is aligned over.
+    """
+    covered = np.array([np.nanmax(lap['Distance']) for lap in laps])
+    return covered >= min_coverage * np.median(covered)
+
+
+def minisector_times(aligned, minisectors=DEFAULT_MINISECTORS):
+    """Split aligned laps into equal-length minisectors.
+
+    Returns (times, bounds): the (laps, minisectors) time spent in each
+    minisector and the (minisectors + 1,) sample indices of the boundaries.
+    """
+    time = aligned['Time']
+    bounds = np.linspace(0, time.shape[1] - 1, minisectors + 1).round().astype(np.intp)
+    return np.diff(time[:, bounds], axis=1), bounds
+
+
+def field_comparison(aligned, lap_times=None, minisectors=DEFAULT_MINISECTORS):
+    """Compare every aligned lap with every other one, overall and per minisector.
+
+    Minisectors split the common distance range into equal lengths. Pairwise
+    gaps use `lap_times` when given (official lap times), otherwise the
+    aligned time over the common range. Returns a dict of arrays:
+    'pairwise_gap' (laps, laps) row minus column, 'sector_times' and
+    'sector_gap' (laps, minisectors) with the gap to the quickest lap in each
+    minisector, 'sector_winner' (minisectors,) winning lap index,
+    'pairwise_sectors_won' (laps, laps) minisectors where row beats column,
+    and 'sector_bounds' (minisectors + 1,) boundary distances.
+    """
+    time = aligned['Time']
+    sector_times, bounds = minisector_times(aligned, minisectors)
+
+    if lap_times is None:
+        lap_times = time[:, -1] - time[:, 0]
+    lap_times = np.asarray(lap_times, dtype=np.float64)
+
+    pairwise_sector_gap = sector_times[:, None, :] - sector_times[None, :, :]
+
+    return {
+        'pairwise_gap': lap_times[:, None] - lap_times[None, :],
+        'sector_times': sector_times,
+        'sector_gap': sector_times - sector_times.min(axis=0),
+        'sector_winner': sector_times.argmin(axis=0),
+        'pairwise_sectors_won': (pairwise_sector_gap < 0).sum(axis=2),
+        'sector_bounds': aligned['distance'][bounds],
+    }
@@ -0,0 +1,295 @@
+"""Session loading and lap data extraction behind every analysis mode.
+
+Kept free of Streamlit so the same code paths can be driven from scripts and
+benchmarks; app.py only adds caching and the UI around them.
+"""
+import numpy as np
+import pandas as pd
+
+from alignment import align_laps, complete_laps, field_comparison, summarize_laps
+from archive import ARCHIVE_DIR, ArchiveStore, load_archived_session
+from degradation import MIN_STINT_LAPS, degradation_rates, fit_stints
+from delta import DEFAULT_RESOLUTION
+from metrics import timed
+from race_trace import race_trace_cache
+from race_pace import FUEL_CORRECTION, OUTLIER_THRESHOLD, clean_laps, driver_pace, stint_summary
+from session_loader import load_session_laps
+from telemetry_store import SessionStore
+from theoretical_best import minisector_cache
+from workers import extract_executor
+
+# Where sessions are loaded from: Fast-F1 (network + its cache) or the offline archive
+DATA_SOURCES = [SessionStore.source, ArchiveStore.source]
+
+# Samples per aligned lap in a multi-lap comparison
+MULTILAP_RESOLUTION = 500
+
+
+@timed('validate_telemetry')
+def validate_telemetry_data(telemetry_data, driver_name):
+    """Validate telemetry data quality and completeness."""
+    issues = []
+
+    tel = telemetry_data['telemetry']
+
+    # Check if we have position data
+    if 'X' not in tel.columns or 'Y' not in tel.columns:
+        issues.append("Missing track position data")
+    else:
+        # Check for null values in position
+        if np.isnan(tel['X']).any() or np.isnan(tel['Y']).any():
+            issues.append("Incomplete track position data")
+
+        # Check if position data looks reasonable (not all zeros)
+        if np.nanstd(tel['X']) < 1 or np.nanstd(tel['Y']) < 1:
+            issues.append("Invalid track position data")
+
+    # Check speed data
+    if 'Speed' not in tel.columns:
+        issues.append("Missing speed data")
+    else:
+        if np.isnan(tel['Speed']).any():
+            issues.append("Incomplete speed data")
+        if np.nanmax(tel['Speed']) < 50:  # Should have speeds over 50 km/h
+            issues.append("Suspiciously low speed data")
+
+    # Check distance data
+    if 'Distance' not in tel.columns:
+        issues.append("Missing distance data")
+    else:
+        if np.isnan(tel['Distance']).any():
+            issues.append("Incomplete distance data")
+        # A full lap should be at least 3km
+        if np.nanmax(tel['Distance']) < 3000:
+            issues.append(f"Incomplete lap (only {np.nanmax(tel['Distance']):.0f}m)")
+
+    # Check time data
+    if 'Time' not in tel.columns:
+        issues.append("Missing time data")
+
+    return issues
+
+
+@timed('open_session')
+def open_session(year, gp, session_type, source=DATA_SOURCES[0], archive_dir=ARCHIVE_DIR):
+    """Load F1 session lap timing into a telemetry store, from Fast-F1 or the archive."""
+    if source == "Archive":
+        return load_archived_session(year, gp, session_type, archive_dir)
+    session = load_session_laps(year, gp, session_type)
+    return SessionStore(year, gp, session_type, session)
+
+
+@timed('get_driver_telemetry')
+def get_driver_telemetry(store, driver_code):
+    """Get fastest lap telemetry for a specific driver with validation."""
+    try:
+        driver_laps = store.session.laps.pick_drivers(driver_code)
+        if driver_laps.empty:
+            return None, f"No laps found for driver {driver_code}"
+
+        fastest_lap = driver_laps.pick_fastest()
+        if fastest_lap is None or pd.isna(fastest_lap['LapTime']):
+            return None, f"No valid fastest lap for driver {driver_code}"
+
+        telemetry = store.lap_telemetry(fastest_lap)
+        if telemetry.empty:
+            return None, f"No telemetry data available for driver {driver_code}"
+
+        result = {
+            'telemetry': telemetry,
+            'lap_time': fastest_lap['LapTime'],
+            'driver': fastest_lap['Driver'],
+            'team': fastest_lap['Team'],
+            'compound': fastest_lap.get('Compound', 'Unknown'),
+            'lap_number': fastest_lap.get('LapNumber', 'Unknown'),
+            'year': store.year,
+            'gp': store.gp,
+            'session_type': store.session_type,
+            'source': store.source
+        }
+
+        # Validate data quality
+        issues = validate_telemetry_data(result, driver_code)
+        result['data_issues'] = issues
+
+        return result, None
+    except Exception as e:
+        return None, f"Error loading telemetry for {driver_code}: {str(e)}"
+
+
+def get_drivers_telemetry(store, driver_codes):
+    """Get fastest lap telemetry for several drivers concurrently, one (data, error) pair each."""
+    return list(extract_executor.map(lambda code: get_driver_telemetry(store, code), driver_codes))
+
+
+def select_laps(store, driver, count=None, stint=None):
+    """Pick a driver's timed laps, excluding in/out laps: every lap of a stint, or their fastest `count`."""
+    laps = store.session.laps.pick_drivers(driver).pick_wo_box()
+    laps = laps[laps['LapTime'].notna()]
+    if stint is not None:
+        laps = laps[laps['Stint'] == stint]
+    else:
+        laps = laps.nsmallest(count, 'LapTime')
+    return laps.sort_values('LapNumber')
+
+
+@timed('get_multilap_telemetry')
+def get_multilap_telemetry(store, laps):
+    """Get telemetry for several laps concurrently and align them against the fastest one."""
+    try:
+        lap_list = [laps.iloc[i] for i in range(len(laps))]
+        telemetry = list(extract_executor.map(store.lap_telemetry, lap_list))
+
+        lap_times = laps['LapTime'].dt.total_seconds().to_numpy()
+        reference = int(np.argmin(lap_times))
+        summary = summarize_laps(align_laps(telemetry, MULTILAP_RESOLUTION), reference)
+
+        first_lap = lap_list[0]
+        result = {
+            'summary': summary,
+            'reference': reference,
+            'lap_numbers': laps['LapNumber'].astype(int).tolist(),
+            'lap_times': lap_times,
+            'compounds': laps['Compound'].fillna('Unknown').tolist(),
+            'driver': first_lap['Driver'],
+            'team': first_lap['Team'],
+            'year': store.year,
+            'gp': store.gp,
+            'session_type': store.session_type,
+            'source': store.source
+        }
+        return result, None
+    except Exception as e:
+        return None, f"Error loading laps: {str(e)}"
+
+
+@timed('get_field_telemetry')
+def get_field_telemetry(store):
+    """Get every driver's fastest lap concurrently and compare them all against each other."""
+    try:
+        results = get_drivers_telemetry(store, store.drivers)
+        field = [data for data, error in results if not error]
+        if len(field) < 2:
+            return None, "Need at least two drivers with a valid fastest lap"
+
+        complete = complete_laps([data['telemetry'] for data in field])
+        excluded = [data['driver'] for data, keep in zip(field, complete) if not keep]
+        excluded += [code for code, (data, error) in zip(store.drivers, results) if error]
+        field = sorted((data for data, keep in zip(field, complete) if keep), key=lambda d: d['lap_time'])
+
+        lap_times = np.array([data['lap_time'].total_seconds() for data in field])
+        aligned = align_laps([data['telemetry'] for data in field], DEFAULT_RESOLUTION, channels=('Time',))
+
+        result = {
+            'comparison': field_comparison(aligned, lap_times),
+            'drivers': [data['driver'] for data in field],
+            'teams': [data['team'] for data in field],
+            'lap_numbers': [int(data['lap_number']) for data in field],
+            'lap_times': lap_times,
+            'compounds': [data['compound'] for data in field],
+            'excluded': sorted(excluded),
+            'year': store.year,
+            'gp': store.gp,
+            'session_type': store.session_type,
+            'source': store.source
+        }
+        return result, None
+    except Exception as e:
+        return None, f"Error loading field: {str(e)}"
+
+
+@timed('get_race_pace')
+def get_race_pace(store, fuel_correction=FUEL_CORRECTION, threshold=OUTLIER_THRESHOLD):
+    """Get every driver's clean, fuel-corrected laps with stint and driver pace summaries."""
+    try:
+        pace = clean_laps(store.session.laps, fuel_correction, threshold)
+        if not (pace['Excluded'] == '').any():
+            return None, "No clean laps in this session"
+
+        result = {
+            'laps': pace,
+            'stints': stint_summary(pace),
+            'drivers': driver_pace(pace),
+            'fuel_correction': fuel_correction,
+            'threshold': threshold,
+            'year': store.year,
+            'gp': store.gp,
+            'session_type': store.session_type,
+            'source': store.source
+        }
+        return result, None
+    except Exception as e:
+        return None, f"Error computing race pace: {str(e)}"
+
+
+@timed('get_degradation')
+def get_degradation(store, fuel_correction=FUEL_CORRECTION, compounds=None, min_laps=MIN_STINT_LAPS):
+    """Fit tyre degradation to every stint and summarise the rates per compound and team."""
+    try:
+        pace = clean_laps(store.session.laps, fuel_correction)
+        stints, laps = fit_stints(pace, min_laps, compounds)
+        if stints.empty:
+            return None, f"No stint has {min_laps} or more clean laps"
+
+        result = {
+            'stints': stints,
+            'laps': laps,
+            'compounds': degradation_rates(stints, 'Compound'),
+            'teams': degradation_rates(stints, ['Team', 'Compound']),
+            'fuel_correction': fuel_correction,
+            'min_laps': min_laps,
+            'year': store.year,
+            'gp': store.gp,
+            'session_type': store.session_type,
+            'source': store.source
+        }
+        return result, None
+    except Exception as e:
+        return None, f"Error fitting tyre degradation: {str(e)}"
+
+
+@timed('get_race_trace')
+def get_race_trace(store):
+    """Get the session's gap-to-leader trace for every driver and the finishing order."""
+    try:
+        trace = race_trace_cache.get(store)
+        result = {
+            'trace': trace,
+            'classification': trace.classification(),
+            'year': store.year,
+            'gp': store.gp,
+            'session_type': store.session_type,
+            'source': store.source
+        }
+        return result, None
+    except Exception as e:
+        return None, f"Error building race trace: {str(e)}"
+
+
+@timed('get_theoretical_best')
+def get_theoretical_best(store):
+    """Get every driver's and the field's theoretical best lap from their best minisectors."""
+    try:
+        result = minisector_cache.get(store).theoretical_best()
+        result.update({
+            'year': store.year,
+            'gp': store.gp,
+            'session_type': store.session_type,
+            'source': store.source
+        })
+        return result, None
+    except Exception as e:
+        return None, f"Error computing theoretical best: {str(e)}"
+
+
+def session_key(data):
+    """Identify the session a result was built from, including its data source."""
+    return (data['source'], data['year'], data['gp'], data['session_type'])
+
+
+def comparison_key(driver1_data, driver2_data, driver1_name, driver2_name):
+    """Identify a comparison by session, driver pair and lap numbers."""
+    return session_key(driver1_data) + (
+        driver1_name, driver1_data['lap_number'],
+        driver2_name, driver2_data['lap_number'],
+    )
@@ -1,21 +1,53 @@
 import streamlit as st
 import fastf1
-import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
 import numpy as np
 from datetime import datetime
 import warnings
 import os
+import time
+
+from analysis import (DATA_SOURCES, MULTILAP_RESOLUTION, comparison_key, get_drivers_telemetry,
+                      get_degradation, get_field_telemetry, get_multilap_telemetry, get_race_pace, get_race_trace,
+                      get_theoretical_best, open_session, select_laps, session_key)
+from archive import archived_sessions
+from charts import (create_degradation_plot, create_degradation_rates_plot, create_delta_time_plot,
+                    create_field_gap_heatmap, create_minisector_heatmap,
+                    create_multilap_delta_plot, create_race_pace_plot, create_race_trace_plot, create_segment_delta_plot,
+                    create_speed_band_plot, create_speed_comparison, create_stint_pace_plot,
+                    create_theoretical_best_plot, create_track_map)
+from degradation import MIN_STINT_LAPS
+from delta import ADAPTIVE_UNIFORM_WEIGHT, DEFAULT_RESOLUTION
+from downsample import DEFAULT_POINT_BUDGET
+from figure_cache import figure_cache
+from metrics import configure_logging, metrics, span, start_metrics_server
+from prefetch import get_prefetch, start_prefetch
+from race_pace import FUEL_CORRECTION, OUTLIER_THRESHOLD
+from schedule import SEASONS, schedule_index
+from segments import segment_index
+from theme import TEAM_COLORS
 
 warnings.filterwarnings('ignore')
 
+rerun_start = time.perf_counter()
+
+ANALYSIS_MODES = [
+    "Driver Battle", "Multi-Lap", "Field View", "Theoretical Best", "Race Pace", "Tyre Degradation", "Race Trace"
+]
+
+# Upper bound on laps in a multi-lap comparison
+MAX_MULTILAP_LAPS = 60
+
 # Enable Fast-F1 caching
 cache_dir = 'cache'
 if not os.path.exists(cache_dir):
     os.makedirs(cache_dir)
 fastf1.Cache.enable_cache(cache_dir)
 
+# Span lines to stderr, and /metrics for Prometheus when F1_METRICS_PORT is set; both once per process
+configure_logging()
+start_metrics_server()
+
 # Page configuration
 st.set_page_config(
     page_title="F1 Driver Battle",
@@ -608,405 +640,32 @@ st.markdown("""
 </script>
 """, unsafe_allow_html=True)
 
-# Team colors for visualization (2024 season)
-TEAM_COLORS = {
-    'Red Bull Racing': '#3671C6',
-    'Ferrari': '#E8002D',
-    'Mercedes': '#27F4D2',
-    'McLaren': '#FF8000',
-    'Aston Martin': '#229971',
-    'Alpine': '#FF87BC',
-    'Williams': '#64C4FF',
-    'AlphaTauri': '#5E8FAA',
-    'Alfa Romeo': '#C92D4B',
-    'Haas F1 Team': '#B6BABD',
-    'RB': '#6692FF',
-    'Kick Sauber': '#52E252'
-}
-
-
-def validate_telemetry_data(telemetry_data, driver_name):
-    """Validate telemetry data quality and completeness."""
-    issues = []
-
-    tel = telemetry_data['telemetry']
-
-    # Check if we have position data
-    if 'X' not in tel.columns or 'Y' not in tel.columns:
-        issues.append("Missing track position data")
-    else:
-        # Check for null values in position
-        if tel['X'].isna().any() or tel['Y'].isna().any():
-            issues.append("Incomplete track position data")
-
-        # Check if position data looks reasonable (not all zeros)
-        if tel['X'].std() < 1 or tel['Y'].std() < 1:
-            issues.append("Invalid track position data")
-
-    # Check speed data
-    if 'Speed' not in tel.columns:
-        issues.append("Missing speed data")
-    else:
-        if tel['Speed'].isna().any():
-            issues.append("Incomplete speed data")
-        if tel['Speed'].max() < 50:  # Should have speeds over 50 km/h
-            issues.append("Suspiciously low speed data")
-
-    # Check distance data
-    if 'Distance' not in tel.columns:
-        issues.append("Missing distance data")
-    else:
-        if tel['Distance'].isna().any():
-            issues.append("Incomplete distance data")
-        # A full lap should be at least 3km
-        if tel['Distance'].max() < 3000:
-            issues.append(f"Incomplete lap (only {tel['Distance'].max():.0f}m)")
-
-    # Check time data
-    if 'Time' not in tel.columns:
-        issues.append("Missing time data")
-
-    return issues
-
-
-@st.cache_data(show_spinner=False)
-def load_session(year, gp, session_type):
-    """Load F1 session data with caching."""
+@st.cache_resource(show_spinner=False)
+def load_session(year, gp, session_type, source=DATA_SOURCES[0]):
+    """Load F1 session lap timing into a shared telemetry store."""
+    # Only runs when st.cache_resource has no entry for these arguments
+    metrics.increment('session_cache_misses')
     try:
-        session = fastf1.get_session(year, gp, session_type)
-        session.load()
-        return session, None
+        return open_session(year, gp, session_type, source), None
     except Exception as e:
         return None, str(e)
 
 
-@st.cache_data(show_spinner=False)
-def get_driver_telemetry(_session, driver_code, year, gp, session_type):
-    """Get fastest lap telemetry for a specific driver with validation."""
-    try:
-        driver_laps = _session.laps.pick_drivers(driver_code)
-        if driver_laps.empty:
-            return None, f"No laps found for driver {driver_code}"
-
-        fastest_lap = driver_laps.pick_fastest()
-        if fastest_lap is None or pd.isna(fastest_lap['LapTime']):
-            return None, f"No valid fastest lap for driver {driver_code}"
-
-        telemetry = fastest_lap.get_telemetry()
-        if telemetry.empty:
-            return None, f"No telemetry data available for driver {driver_code}"
-
-        result = {
-            'telemetry': telemetry,
-            'lap_time': fastest_lap['LapTime'],
-            'driver': fastest_lap['Driver'],
-            'team': fastest_lap['Team'],
-            'compound': fastest_lap.get('Compound', 'Unknown'),
-            'lap_number': fastest_lap.get('LapNumber', 'Unknown'),
-            'year': year,
-            'gp': gp,
-            'session_type': session_type
-        }
-
-        # Validate data quality
-        issues = validate_telemetry_data(result, driver_code)
-        result['data_issues'] = issues
-
-        return result, None
-    except Exception as e:
-        return None, f"Error loading telemetry for {driver_code}: {str(e)}"
-
-
-def create_speed_comparison(driver1_data, driver2_data, driver1_name, driver2_name):
-    """Create professional speed comparison chart."""
-    fig = go.Figure()
-
-    color1 = TEAM_COLORS.get(driver1_data['team'], '#FF0000')
-    color2 = TEAM_COLORS.get(driver2_data['team'], '#0000FF')
-
-    fig.add_trace(go.Scatter(
-        x=driver1_data['telemetry']['Distance'],
-        y=driver1_data['telemetry']['Speed'],
-        mode='lines',
-        name=f"{driver1_name} (Lap {driver1_data['lap_number']})",
-        line=dict(color=color1, width=3),
-        hovertemplate='<b>%{fullData.name}</b><br>Distance: %{x:.0f}m<br>Speed: %{y:.0f} km/h<extra></extra>'
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=driver2_data['telemetry']['Distance'],
-        y=driver2_data['telemetry']['Speed'],
-        mode='lines',
-        name=f"{driver2_name} (Lap {driver2_data['lap_number']})",
-        line=dict(color=color2, width=3),
-        hovertemplate='<b>%{fullData.name}</b><br>Distance: %{x:.0f}m<br>Speed: %{y:.0f} km/h<extra></extra>'
-    ))
-
-    fig.update_layout(
-        showlegend=True,
-        xaxis_title="Distance (m)",
-        yaxis_title="Speed (km/h)",
-        hovermode='x unified',
-        height=500,
-        plot_bgcolor='#0a0a0a',
-        paper_bgcolor='#000000',
-        font=dict(color='#9b9b9b', size=11, family='Inter'),
-        margin=dict(l=60, r=40, t=20, b=60),
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=1.02,
-            xanchor="left",
-            x=0,
-            font=dict(size=12, color='#ffffff'),
-            bgcolor='rgba(21, 21, 30, 0.95)',
-            bordercolor='#2a2a35',
-            borderwidth=1
-        ),
-        xaxis=dict(
-            gridcolor='#1a1a1a',
-            showgrid=True,
-            zeroline=False,
-            showline=True,
-            linewidth=1.5,
-            linecolor='#2a2a35',
-            title_font=dict(size=12, color='#9b9b9b')
-        ),
-        yaxis=dict(
-            gridcolor='#1a1a1a',
-            showgrid=True,
-            zeroline=False,
-            showline=True,
-            linewidth=1.5,
-            linecolor='#2a2a35',
-            title_font=dict(size=12, color='#9b9b9b')
-        )
-    )
-
-    return fig
-
-
-def create_track_map(driver1_data, driver2_data, driver1_name, driver2_name):
-    """Create professional track map visualization."""
-    fig = go.Figure()
-
-    tel1 = driver1_data['telemetry']
-    tel2 = driver2_data['telemetry']
-
-    color1 = TEAM_COLORS.get(driver1_data['team'], '#FF0000')
-    color2 = TEAM_COLORS.get(driver2_data['team'], '#0000FF')
-
-    # Driver 2 racing line - thick, dashed, semi-transparent background
-    fig.add_trace(go.Scatter(
-        x=tel2['X'],
-        y=tel2['Y'],
-        mode='lines',
-        name=f"{driver2_name} (Lap {driver2_data['lap_number']})",
-        line=dict(color=color2, width=8, dash='dash'),
-        opacity=0.5,
-        hovertemplate='<b>%{fullData.name}</b><br>Speed: ' + tel2['Speed'].astype(str) + ' km/h<extra></extra>'
-    ))
-
-    # Driver 1 racing line - solid, bright, on top
-    fig.add_trace(go.Scatter(
-        x=tel1['X'],
-        y=tel1['Y'],
-        mode='lines',
-        name=f"{driver1_name} (Lap {driver1_data['lap_number']})",
-        line=dict(color=color1, width=3),
-        hovertemplate='<b>%{fullData.name}</b><br>Speed: ' + tel1['Speed'].astype(str) + ' km/h<extra></extra>'
-    ))
-
-    fig.update_layout(
-        showlegend=True,
-        xaxis_title="X Position (m)",
-        yaxis_title="Y Position (m)",
-        height=600,
-        plot_bgcolor='#0a0a0a',
-        paper_bgcolor='#000000',
-        font=dict(color='#9b9b9b', size=11, family='Inter'),
-        margin=dict(l=60, r=40, t=20, b=60),
-        yaxis=dict(
-            scaleanchor="x",
-            scaleratio=1,
-            gridcolor='#1a1a1a',
-            showgrid=True,
-            zeroline=False,
-            showline=True,
-            linewidth=1.5,
-            linecolor='#2a2a35',
-            title_font=dict(size=12, color='#9b9b9b')
-        ),
-        xaxis=dict(
-            gridcolor='#1a1a1a',
-            showgrid=True,
-            zeroline=False,
-            showline=True,
-            linewidth=1.5,
-            linecolor='#2a2a35',
-            title_font=dict(size=12, color='#9b9b9b')
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=1.02,
-            xanchor="left",
-            x=0,
-            font=dict(size=12, color='#ffffff'),
-            bgcolor='rgba(21, 21, 30, 0.95)',
-            bordercolor='#2a2a35',
-            borderwidth=1
-        )
-    )
-
-    return fig
-
-
-def create_delta_time_plot(driver1_data, driver2_data, driver1_name, driver2_name):
-    """Create intuitive delta time plot with color coding."""
-    tel1 = driver1_data['telemetry']
-    tel2 = driver2_data['telemetry']
-
-    min_distance = max(tel1['Distance'].min(), tel2['Distance'].min())
-    max_distance = min(tel1['Distance'].max(), tel2['Distance'].max())
-    common_distance = np.linspace(min_distance, max_distance, 1000)
-
-    time1_seconds = tel1['Time'].dt.total_seconds()
-    time2_seconds = tel2['Time'].dt.total_seconds()
-
-    time1 = np.interp(common_distance, tel1['Distance'], time1_seconds)
-    time2 = np.interp(common_distance, tel2['Distance'], time2_seconds)
-    delta = time1 - time2
-
-    fig = go.Figure()
-
-    color1 = TEAM_COLORS.get(driver1_data['team'], '#FF0000')
-    color2 = TEAM_COLORS.get(driver2_data['team'], '#0000FF')
-
-    delta_driver2_winning = [d if d > 0 else 0 for d in delta]
-    delta_driver1_winning = [d if d < 0 else 0 for d in delta]
-
-    fig.add_trace(go.Scatter(
-        x=common_distance,
-        y=delta_driver2_winning,
-        mode='lines',
-        name=f'{driver2_name} faster here',
-        line=dict(color=color2, width=0),
-        fill='tozeroy',
-        fillcolor=f'rgba({int(color2[1:3], 16)}, {int(color2[3:5], 16)}, {int(color2[5:7], 16)}, 0.3)',
-        hovertemplate=f'<b>{driver2_name} gaining</b><br>Distance: %{{x:.0f}}m<br>Advantage: %{{y:.3f}}s<extra></extra>',
-        showlegend=True
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=common_distance,
-        y=delta_driver1_winning,
-        mode='lines',
-        name=f'{driver1_name} faster here',
-        line=dict(color=color1, width=0),
-        fill='tozeroy',
-        fillcolor=f'rgba({int(color1[1:3], 16)}, {int(color1[3:5], 16)}, {int(color1[5:7], 16)}, 0.3)',
-        hovertemplate=f'<b>{driver1_name} gaining</b><br>Distance: %{{x:.0f}}m<br>Advantage: %{{y:.3f}}s<extra></extra>',
-        showlegend=True
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=common_distance,
-        y=delta,
-        mode='lines',
-        name='Gap between drivers',
-        line=dict(color='#ffffff', width=2),
-        hovertemplate='Distance: %{x:.0f}m<br>Time gap: %{y:.3f}s<extra></extra>',
-        showlegend=False
-    ))
-
-    fig.add_hline(
-        y=0,
-        line_dash="solid",
-        line_color="#9b9b9b",
-        line_width=2,
-        annotation_text="Even",
-        annotation_position="right",
-        annotation_font_size=10,
-        annotation_font_color="#9b9b9b"
-    )
-
-    fig.update_layout(
-        showlegend=True,
-        xaxis_title="Distance around the lap (meters)",
-        yaxis_title="Time Gap (seconds)",
-        height=600,
-        plot_bgcolor='#0a0a0a',
-        paper_bgcolor='#000000',
-        hovermode='x unified',
-        font=dict(color='#9b9b9b', size=11, family='Inter'),
-        margin=dict(l=60, r=40, t=20, b=60),
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=1.02,
-            xanchor="left",
-            x=0,
-            font=dict(size=11, color='#ffffff'),
-            bgcolor='rgba(21, 21, 30, 0.95)',
-            bordercolor='#2a2a35',
-            borderwidth=1
-        ),
-        xaxis=dict(
-            gridcolor='#1a1a1a',
-            showgrid=True,
-            zeroline=False,
-            showline=True,
-            linewidth=1.5,
-            linecolor='#2a2a35',
-            title_font=dict(size=12, color='#9b9b9b')
-        ),
-        yaxis=dict(
-            gridcolor='#1a1a1a',
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor='#9b9b9b',
-            zerolinewidth=2,
-            showline=True,
-            linewidth=1.5,
-            linecolor='#2a2a35',
-            title_font=dict(size=12, color='#9b9b9b')
-        ),
-        annotations=[
-            dict(
-                text=f"↑ {driver2_name} ahead",
-                xref="paper", yref="paper",
-                x=0.98, y=0.98,
-                showarrow=False,
-                font=dict(size=11, color=color2),
-                bgcolor='rgba(21, 21, 30, 0.95)',
-                bordercolor='#2a2a35',
-                borderwidth=1,
-                borderpad=8,
-                xanchor='right'
-            ),
-            dict(
-                text=f"↓ {driver1_name} ahead",
-                xref="paper", yref="paper",
-                x=0.98, y=0.02,
-                showarrow=False,
-                font=dict(size=11, color=color1),
-                bgcolor='rgba(21, 21, 30, 0.95)',
-                bordercolor='#2a2a35',
-                borderwidth=1,
-                borderpad=8,
-                xanchor='right'
-            )
-        ]
-    )
-
-    return fig
+def render_chart(figure):
+    """Send a figure to the browser; serialization happens here, so it gets its own span."""
+    with span('render_chart'):
+        st.plotly_chart(figure, width='stretch', theme=None)
 
 
 # Main App Layout
 st.markdown("<div class='main-title'>F1 Driver Battle</div>", unsafe_allow_html=True)
 st.markdown("<div class='main-subtitle'>Professional telemetry analysis and driver comparison</div>", unsafe_allow_html=True)
 
+analysis_mode = ANALYSIS_MODES[0]
+race_pace_data = None
+degradation_data = None
+race_trace_data = None
+
 # Sidebar
 with st.sidebar:
     st.markdown("### Session Selection")
@@ -1022,23 +681,37 @@ with st.sidebar:
     # Check if mobile (you can enhance this with JavaScript detection)
     is_mobile = st.session_state.is_mobile
 
+    # Data source selection, only offered once something has been archived
+    archive_index = archived_sessions()
+    source = DATA_SOURCES[0]
+    if archive_index:
+        st.markdown('<p style="font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; letter-spacing: 0.08em; color: #b0b0b0; margin-bottom: 0.5rem;">Data Source</p>', unsafe_allow_html=True)
+        source = st.radio(
+            "Data Source",
+            options=DATA_SOURCES,
+            index=0,
+            label_visibility="collapsed",
+            horizontal=True,
+            help="Archive reads exported sessions from disk without network access"
+        )
+
     # Season Selection
     st.markdown('<p style="font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; letter-spacing: 0.08em; color: #b0b0b0; margin-bottom: 0.5rem;">Season</p>', unsafe_allow_html=True)
     year = st.radio(
         "Season",
-        options=list(range(2024, 2017, -1)),
+        options=sorted(archive_index, reverse=True) if source == "Archive" else list(SEASONS),
         index=0,
         label_visibility="collapsed",
         horizontal=True
     )
 
     try:
-        schedule = fastf1.get_event_schedule(year)
-        available_events = schedule[schedule['EventName'].notna()]['EventName'].tolist()
-        event_names = [event for event in available_events if event]
+        if source == "Archive":
+            event_names = list(archive_index[year])
+        else:
+            event_names = schedule_index.event_names(year)
     except Exception as e:
         st.error(f"Error loading schedule: {e}")
-        available_events = []
         event_names = []
 
     # Grand Prix Selection - Use expander with radio for mobile-friendly experience
@@ -1057,9 +730,15 @@ with st.sidebar:
 
     # Session Type Selection
     st.markdown('<p style="font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; letter-spacing: 0.08em; color: #b0b0b0; margin-bottom: 0.5rem; margin-top: 1rem;">Session Type</p>', unsafe_allow_html=True)
+    if not gp:
+        session_types = []
+    elif source == "Archive":
+        session_types = archive_index[year][gp]
+    else:
+        session_types = schedule_index.session_types(year, gp)
     session_type = st.radio(
         "Session Type",
-        options=["Qualifying", "Race", "Sprint", "Practice 1", "Practice 2", "Practice 3"],
+        options=session_types,
         index=0,
         label_visibility="collapsed",
         help="Qualifying and Race provide the most reliable comparison data"
@@ -1070,19 +749,22 @@ with st.sidebar:
     if st.button("Load Session"):
         if gp:
             # Clear previous comparison data
-            for key in ['driver1_data', 'driver2_data', 'driver1_name', 'driver2_name']:
+            for key in ['driver1_data', 'driver2_data', 'driver1_name', 'driver2_name',
+                        'multilap_data', 'field_data', 'theoretical_data']:
                 if key in st.session_state:
                     del st.session_state[key]
 
-            with st.spinner("Loading session data..."):
-                session, error = load_session(year, gp, session_type)
+            with st.spinner("Loading lap timing..."):
+                store, error = load_session(year, gp, session_type, source)
                 if error:
                     st.error(f"Error: {error}")
                     st.session_state.session = None
                     if 'loaded_session_params' in st.session_state:
                         del st.session_state['loaded_session_params']
                 else:
-                    st.session_state.session = session
+                    st.session_state.session = store
+                    start_prefetch(store)
+                    segment_index.prefetch(store)
                     st.session_state.year = year
                     st.session_state.gp = gp
                     st.session_state.session_type = session_type
@@ -1090,40 +772,38 @@ with st.sidebar:
                     st.session_state.loaded_session_params = {
                         'year': year,
                         'gp': gp,
-                        'session_type': session_type
+                        'session_type': session_type,
+                        'source': source
                     }
                     st.success(f"✓ Loaded {year} {gp} {session_type}")
         else:
             st.warning("Select a Grand Prix")
 
     if 'session' in st.session_state and st.session_state.session is not None:
-        session = st.session_state.session
-        drivers = session.laps['Driver'].unique().tolist()
-        drivers.sort()
+        store = st.session_state.session
+        drivers = store.drivers
+
+        prefetch = get_prefetch(store)
+        if prefetch is not None and not prefetch.done:
+            st.progress(prefetch.progress, text=f"Preparing telemetry ({prefetch.completed}/{prefetch.total} drivers)")
+        if prefetch is not None and prefetch.failed:
+            failed = prefetch.failed
+            st.caption(f"⚠️ Telemetry could not be prepared for {', '.join(sorted(failed))}; "
+                       "they load on demand instead")
+            with st.expander("Prefetch errors"):
+                for driver, error in sorted(failed.items()):
+                    st.text(f"{driver}: {error}")
 
         st.markdown("")
-        st.markdown("### Driver Selection")
+        st.markdown("### Analysis")
         st.markdown("")
 
-        # Driver 1 Selection
-        st.markdown('<p style="font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; letter-spacing: 0.08em; color: #b0b0b0; margin-bottom: 0.5rem;">Driver 1</p>', unsafe_allow_html=True)
-        with st.expander("🏎️ Select Driver 1", expanded=False):
-            driver1 = st.radio(
-                "Driver 1 List",
-                options=drivers,
-                index=0 if len(drivers) > 0 else None,
-                label_visibility="collapsed"
-            )
-
-        # Driver 2 Selection
-        st.markdown('<p style="font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; letter-spacing: 0.08em; color: #b0b0b0; margin-bottom: 0.5rem; margin-top: 1rem;">Driver 2</p>', unsafe_allow_html=True)
-        with st.expander("🏎️ Select Driver 2", expanded=False):
-            driver2 = st.radio(
-                "Driver 2 List",
-                options=drivers,
-                index=1 if len(drivers) > 1 else 0,
-                label_visibility="collapsed"
-            )
+        analysis_mode = st.radio(
+            "Analysis",
+            options=ANALYSIS_MODES,
+            index=0,
+            label_visibility="collapsed"
+        )
 
         st.markdown("")
 
@@ -1137,7 +817,8 @@ with st.sidebar:
             loaded_params = st.session_state.loaded_session_params
             if (loaded_params['year'] != year or
                 loaded_params['gp'] != gp or
-                loaded_params['session_type'] != session_type):
+                loaded_params['session_type'] != session_type or
+                loaded_params['source'] != source):
                 session_changed = True
 
         # Show warning if session details changed
@@ -1147,43 +828,601 @@ with st.sidebar:
         # Disable Compare button if session details don't match loaded session
         compare_disabled = session_changed or 'loaded_session_params' not in st.session_state
 
-        if st.button("Compare", disabled=compare_disabled):
-            if driver1 == driver2:
-                st.error("Select two different drivers")
+        if analysis_mode == "Driver Battle":
+            st.markdown("")
+            st.markdown("### Driver Selection")
+            st.markdown("")
+
+            # Driver 1 Selection
+            st.markdown('<p style="font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; letter-spacing: 0.08em; color: #b0b0b0; margin-bottom: 0.5rem;">Driver 1</p>', unsafe_allow_html=True)
+            with st.expander("🏎️ Select Driver 1", expanded=False):
+                driver1 = st.radio(
+                    "Driver 1 List",
+                    options=drivers,
+                    index=0 if len(drivers) > 0 else None,
+                    label_visibility="collapsed"
+                )
+
+            # Driver 2 Selection
+            st.markdown('<p style="font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; letter-spacing: 0.08em; color: #b0b0b0; margin-bottom: 0.5rem; margin-top: 1rem;">Driver 2</p>', unsafe_allow_html=True)
+            with st.expander("🏎️ Select Driver 2", expanded=False):
+                driver2 = st.radio(
+                    "Driver 2 List",
+                    options=drivers,
+                    index=1 if len(drivers) > 1 else 0,
+                    label_visibility="collapsed"
+                )
+
+            # Read by the delta and corner charts; changing them rebuilds only those two figures
+            with st.expander("Delta resolution", expanded=False):
+                st.slider(
+                    "Samples per lap",
+                    min_value=200,
+                    max_value=4000,
+                    value=DEFAULT_RESOLUTION,
+                    step=100,
+                    key='delta_resolution',
+                    help="Points the time delta is computed at along the lap"
+                )
+                st.slider(
+                    "Evenly spaced share (%)",
+                    min_value=0,
+                    max_value=100,
+                    value=int(round(ADAPTIVE_UNIFORM_WEIGHT * 100)),
+                    key='delta_uniform_percent',
+                    help="The rest of the samples go where speed changes fastest, mostly braking zones"
+                )
+
+            st.markdown("")
+
+            if st.button("Compare", disabled=compare_disabled):
+                if driver1 == driver2:
+                    st.error("Select two different drivers")
+                else:
+                    # Clear old data
+                    for key in ['driver1_data', 'driver2_data', 'driver1_name', 'driver2_name']:
+                        if key in st.session_state:
+                            del st.session_state[key]
+
+                    with st.spinner(f"Loading telemetry for {driver1} and {driver2}..."):
+                        (driver1_data, error1), (driver2_data, error2) = get_drivers_telemetry(
+                            store, [driver1, driver2]
+                        )
+
+                        if error1:
+                            st.error(f"Error loading {driver1}: {error1}")
+                        if error2:
+                            st.error(f"Error loading {driver2}: {error2}")
+                        if not (error1 or error2):
+                            st.session_state.driver1_data = driver1_data
+                            st.session_state.driver2_data = driver2_data
+                            st.session_state.driver1_name = driver1
+                            st.session_state.driver2_name = driver2
+                            st.success("✓ Comparison ready")
+                            st.rerun()
+
+        elif analysis_mode == "Multi-Lap":
+            st.markdown("")
+            st.markdown("### Lap Selection")
+            st.markdown("")
+
+            st.markdown('<p style="font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; letter-spacing: 0.08em; color: #b0b0b0; margin-bottom: 0.5rem;">Driver</p>', unsafe_allow_html=True)
+            with st.expander("🏎️ Select Driver", expanded=False):
+                lap_driver = st.radio(
+                    "Multi-Lap Driver List",
+                    options=drivers,
+                    index=0 if len(drivers) > 0 else None,
+                    label_visibility="collapsed"
+                )
+
+            st.markdown('<p style="font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; letter-spacing: 0.08em; color: #b0b0b0; margin-bottom: 0.5rem; margin-top: 1rem;">Laps</p>', unsafe_allow_html=True)
+            lap_source = st.radio(
+                "Lap Source",
+                options=["Fastest laps", "Stint"],
+                index=0,
+                label_visibility="collapsed",
+                horizontal=True
+            )
+
+            stint = None
+            lap_count = None
+            if lap_source == "Fastest laps":
+                lap_count = st.slider("Number of laps", min_value=2, max_value=MAX_MULTILAP_LAPS, value=5)
             else:
-                # Clear old data
-                for key in ['driver1_data', 'driver2_data', 'driver1_name', 'driver2_name']:
-                    if key in st.session_state:
-                        del st.session_state[key]
-
-                with st.spinner(f"Loading telemetry for {driver1} and {driver2}..."):
-                    driver1_data, error1 = get_driver_telemetry(
-                        session, driver1,
-                        st.session_state.year,
-                        st.session_state.gp,
-                        st.session_state.session_type
-                    )
-                    driver2_data, error2 = get_driver_telemetry(
-                        session, driver2,
-                        st.session_state.year,
-                        st.session_state.gp,
-                        st.session_state.session_type
+                stints = store.driver_stints(lap_driver) if lap_driver else []
+                if stints:
+                    stint = st.radio(
+                        "Stint",
+                        options=stints,
+                        index=0,
+                        format_func=lambda s: f"Stint {s}",
+                        horizontal=True
                     )
+                else:
+                    st.warning("No stint data for this driver")
+
+            st.markdown("")
+
+            if st.button("Analyze Laps", disabled=compare_disabled or (lap_source == "Stint" and stint is None)):
+                if 'multilap_data' in st.session_state:
+                    del st.session_state['multilap_data']
+
+                laps = select_laps(store, lap_driver, count=lap_count, stint=stint)
+                if len(laps) < 2:
+                    st.error("Need at least two timed laps to compare")
+                else:
+                    with st.spinner(f"Loading telemetry for {len(laps)} laps of {lap_driver}..."):
+                        multilap_data, error = get_multilap_telemetry(store, laps)
 
-                    if error1:
-                        st.error(f"Error loading {driver1}: {error1}")
-                    elif error2:
-                        st.error(f"Error loading {driver2}: {error2}")
+                    if error:
+                        st.error(error)
                     else:
-                        st.session_state.driver1_data = driver1_data
-                        st.session_state.driver2_data = driver2_data
-                        st.session_state.driver1_name = driver1
-                        st.session_state.driver2_name = driver2
-                        st.success("✓ Comparison ready")
+                        st.session_state.multilap_data = multilap_data
+                        st.success(f"✓ {len(laps)} laps ready")
                         st.rerun()
 
+        elif analysis_mode == "Field View":
+            st.markdown("")
+            st.caption("Every driver's fastest lap against every other one")
+            st.markdown("")
+
+            if st.button("Build Field View", disabled=compare_disabled):
+                if 'field_data' in st.session_state:
+                    del st.session_state['field_data']
+
+                with st.spinner(f"Loading fastest laps for {len(drivers)} drivers..."):
+                    field_data, error = get_field_telemetry(store)
+
+                if error:
+                    st.error(error)
+                else:
+                    st.session_state.field_data = field_data
+                    st.success(f"✓ {len(field_data['drivers'])} drivers ready")
+                    st.rerun()
+
+        elif analysis_mode == "Race Pace":
+            st.markdown("")
+            st.caption("Every driver's clean laps, corrected for fuel load")
+            st.markdown("")
+
+            fuel_correction = st.number_input(
+                "Fuel correction (s/lap)",
+                min_value=0.0,
+                max_value=0.2,
+                value=FUEL_CORRECTION,
+                step=0.005,
+                format="%.3f",
+                help="Time a car gains per lap as fuel burns off"
+            )
+            outlier_threshold = st.slider(
+                "Outlier threshold (% of median lap)",
+                min_value=101,
+                max_value=120,
+                value=int(round(OUTLIER_THRESHOLD * 100)),
+                help="Laps slower than this share of the driver's median clean lap are left out"
+            ) / 100
+
+            if "Race" not in store.session_type and "Sprint" not in store.session_type:
+                st.info("Race pace is most meaningful for Race and Sprint sessions")
+
+            # Works on the lap table only, so it is cheap enough to redo on every rerun
+            if not compare_disabled:
+                race_pace_data, error = get_race_pace(store, fuel_correction, outlier_threshold)
+                if error:
+                    st.error(error)
+
+        elif analysis_mode == "Tyre Degradation":
+            st.markdown("")
+            st.caption("Lap time against tyre age, fitted to every stint")
+            st.markdown("")
+
+            session_compounds = sorted(store.session.laps['Compound'].dropna().unique().tolist())
+            selected_compounds = st.multiselect(
+                "Compounds",
+                options=session_compounds,
+                default=session_compounds
+            )
+            min_stint_laps = st.slider(
+                "Minimum clean laps per stint",
+                min_value=3,
+                max_value=20,
+                value=MIN_STINT_LAPS
+            )
+            degradation_fuel = st.number_input(
+                "Fuel correction (s/lap)",
+                min_value=0.0,
+                max_value=0.2,
+                value=FUEL_CORRECTION,
+                step=0.005,
+                format="%.3f",
+                help="Without it, fuel burn-off hides part of the tyre degradation"
+            )
+
+            if not compare_disabled and selected_compounds:
+                degradation_data, error = get_degradation(
+                    store, degradation_fuel, selected_compounds, min_stint_laps
+                )
+                if error:
+                    st.error(error)
+
+        elif analysis_mode == "Race Trace":
+            st.markdown("")
+            st.caption("Every driver's gap to the leader, lap by lap")
+            st.markdown("")
+
+            if "Race" not in store.session_type and "Sprint" not in store.session_type:
+                st.info("The race trace is only meaningful for Race and Sprint sessions")
+
+            # Built once per session and cached, so reruns only look it up
+            if not compare_disabled:
+                race_trace_data, error = get_race_trace(store)
+                if error:
+                    st.error(error)
+
+        elif analysis_mode == "Theoretical Best":
+            st.markdown("")
+            st.caption("Best minisectors across every valid lap, per driver and for the field")
+            st.markdown("")
+
+            if st.button("Build Theoretical Best", disabled=compare_disabled):
+                if 'theoretical_data' in st.session_state:
+                    del st.session_state['theoretical_data']
+
+                with st.spinner(f"Loading every valid lap of {len(drivers)} drivers..."):
+                    theoretical_data, error = get_theoretical_best(store)
+
+                if error:
+                    st.error(error)
+                else:
+                    st.session_state.theoretical_data = theoretical_data
+                    st.success(f"✓ {len(theoretical_data['drivers'])} drivers ready")
+                    st.rerun()
+
+    # Timings and cache counters, shown with ?debug=1 in the URL
+    if st.query_params.get('debug'):
+        st.markdown("")
+        with st.expander("🛠️ Debug: timings and caches", expanded=False):
+            snapshot = metrics.snapshot()
+            if snapshot['stages']:
+                st.dataframe(
+                    pd.DataFrame.from_dict(snapshot['stages'], orient='index').round(2),
+                    width='stretch'
+                )
+            st.dataframe(pd.DataFrame.from_dict(snapshot['caches'], orient='index'), width='stretch')
+            if snapshot['counters']:
+                st.json(snapshot['counters'])
+            st.code(metrics.prometheus_text(), language='text')
+
 # Main content
-if all(key in st.session_state for key in ['driver1_data', 'driver2_data']):
+if analysis_mode == "Multi-Lap" and 'multilap_data' in st.session_state:
+    multilap_data = st.session_state.multilap_data
+    lap_numbers = multilap_data['lap_numbers']
+    lap_times = multilap_data['lap_times']
+    reference = multilap_data['reference']
+    final_delta = multilap_data['summary']['final_delta']
+
+    st.markdown(f"""
+    <div class='session-header'>
+        <div style='font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; color: #9b9b9b; letter-spacing: 0.08em; margin-bottom: 0.5rem;'>
+            {multilap_data['year']} {multilap_data['gp']} · {multilap_data['session_type']}
+        </div>
+        <div style='font-size: 1.25rem; font-weight: 700; color: #ffffff;'>
+            {multilap_data['driver']} · {len(lap_numbers)} laps
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Reference", f"Lap {lap_numbers[reference]}")
+    col2.metric("Best Lap", f"{lap_times[reference]:.3f}")
+    col3.metric("Mean Lap", f"{lap_times.mean():.3f}")
+    col4.metric("Lap Time σ", f"{lap_times.std():.3f}s")
+
+    multilap_key = session_key(multilap_data) + (multilap_data['driver'], tuple(lap_numbers))
+
+    st.markdown("<div class='section-header'>Delta to Reference Lap</div>", unsafe_allow_html=True)
+    multilap_delta_fig = figure_cache.get_or_build(
+        multilap_key + ('multilap_delta', MULTILAP_RESOLUTION),
+        lambda: create_multilap_delta_plot(multilap_data)
+    )
+    render_chart(multilap_delta_fig)
+
+    st.markdown("<div class='section-header'>Speed Consistency</div>", unsafe_allow_html=True)
+    speed_band_fig = figure_cache.get_or_build(
+        multilap_key + ('speed_band', MULTILAP_RESOLUTION),
+        lambda: create_speed_band_plot(multilap_data)
+    )
+    render_chart(speed_band_fig)
+
+    st.markdown("<div class='section-header'>Laps</div>", unsafe_allow_html=True)
+    st.dataframe(
+        pd.DataFrame({
+            'Lap': lap_numbers,
+            'Lap Time (s)': lap_times.round(3),
+            'Gap to Reference (s)': (lap_times - lap_times[reference]).round(3),
+            'Tire': multilap_data['compounds'],
+        }),
+        hide_index=True,
+        width='stretch'
+    )
+
+elif analysis_mode == "Field View" and 'field_data' in st.session_state:
+    field_data = st.session_state.field_data
+    comparison = field_data['comparison']
+    field_drivers = field_data['drivers']
+    lap_times = field_data['lap_times']
+    sectors_won = np.bincount(comparison['sector_winner'], minlength=len(field_drivers))
+
+    st.markdown(f"""
+    <div class='session-header'>
+        <div style='font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; color: #9b9b9b; letter-spacing: 0.08em; margin-bottom: 0.5rem;'>
+            {field_data['year']} {field_data['gp']} · {field_data['session_type']}
+        </div>
+        <div style='font-size: 1.25rem; font-weight: 700; color: #ffffff;'>
+            Fastest laps · {len(field_drivers)} drivers
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if field_data['excluded']:
+        st.info(f"Excluded (no complete fastest lap): {', '.join(field_data['excluded'])}")
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Fastest", field_drivers[0])
+    col2.metric("Best Lap", f"{lap_times[0]:.3f}")
+    col3.metric("Field Spread", f"{lap_times[-1] - lap_times[0]:.3f}s")
+    col4.metric("Most Minisectors", f"{field_drivers[int(sectors_won.argmax())]} ({sectors_won.max()})")
+
+    field_key = session_key(field_data) + (tuple(field_drivers), tuple(field_data['lap_numbers']))
+
+    st.markdown("<div class='section-header'>Lap Time Gap Matrix</div>", unsafe_allow_html=True)
+    field_gap_fig = figure_cache.get_or_build(
+        field_key + ('field_gap', DEFAULT_RESOLUTION),
+        lambda: create_field_gap_heatmap(field_data)
+    )
+    render_chart(field_gap_fig)
+
+    st.markdown("<div class='section-header'>Time Lost per Minisector</div>", unsafe_allow_html=True)
+    minisector_fig = figure_cache.get_or_build(
+        field_key + ('minisectors', DEFAULT_RESOLUTION),
+        lambda: create_minisector_heatmap(field_data)
+    )
+    render_chart(minisector_fig)
+
+    st.markdown("<div class='section-header'>Classification</div>", unsafe_allow_html=True)
+    st.dataframe(
+        pd.DataFrame({
+            'Driver': field_drivers,
+            'Team': field_data['teams'],
+            'Lap': field_data['lap_numbers'],
+            'Lap Time (s)': lap_times.round(3),
+            'Gap (s)': (lap_times - lap_times[0]).round(3),
+            'Tire': field_data['compounds'],
+            'Minisectors Won': sectors_won,
+        }),
+        hide_index=True,
+        width='stretch'
+    )
+
+elif analysis_mode == "Theoretical Best" and 'theoretical_data' in st.session_state:
+    theoretical_data = st.session_state.theoretical_data
+    theoretical_drivers = theoretical_data['drivers']
+    bounds = theoretical_data['sector_bounds']
+
+    st.markdown(f"""
+    <div class='session-header'>
+        <div style='font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; color: #9b9b9b; letter-spacing: 0.08em; margin-bottom: 0.5rem;'>
+            {theoretical_data['year']} {theoretical_data['gp']} · {theoretical_data['session_type']}
+        </div>
+        <div style='font-size: 1.25rem; font-weight: 700; color: #ffffff;'>
+            Theoretical best · {int(theoretical_drivers['Laps'].sum())} laps
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Fastest Lap", f"{theoretical_data['field_fastest']:.3f}", theoretical_data['field_fastest_driver'], delta_color="off")
+    col2.metric("Field Theoretical", f"{theoretical_data['field_theoretical']:.3f}")
+    col3.metric("Best Theoretical", theoretical_drivers['Driver'].iloc[0])
+    col4.metric("Most Left on Track", f"{theoretical_drivers['Gain'].max():.3f}s",
+                theoretical_drivers.loc[theoretical_drivers['Gain'].idxmax(), 'Driver'], delta_color="off")
+
+    st.markdown("<div class='section-header'>Fastest vs Theoretical Best</div>", unsafe_allow_html=True)
+    theoretical_fig = figure_cache.get_or_build(
+        session_key(theoretical_data) + ('theoretical_best', len(bounds) - 1),
+        lambda: create_theoretical_best_plot(theoretical_data)
+    )
+    render_chart(theoretical_fig)
+
+    st.markdown("<div class='section-header'>Drivers</div>", unsafe_allow_html=True)
+    st.dataframe(
+        pd.DataFrame({
+            'Driver': theoretical_drivers['Driver'],
+            'Team': theoretical_drivers['Team'],
+            'Laps': theoretical_drivers['Laps'],
+            'Fastest Lap': theoretical_drivers['FastestLap'],
+            'Fastest (s)': theoretical_drivers['Fastest'].round(3),
+            'Theoretical (s)': theoretical_drivers['Theoretical'].round(3),
+            'Left on Track (s)': theoretical_drivers['Gain'].round(3),
+            'Field Minisectors': theoretical_drivers['MinisectorsOwned'],
+        }),
+        hide_index=True,
+        width='stretch'
+    )
+
+    st.markdown("<div class='section-header'>Field's Best Minisectors</div>", unsafe_allow_html=True)
+    st.dataframe(
+        pd.DataFrame({
+            'Minisector': np.arange(1, len(bounds)),
+            'From (m)': bounds[:-1].round(),
+            'To (m)': bounds[1:].round(),
+            'Driver': theoretical_data['sector_owners'],
+            'Time (s)': theoretical_data['sector_times'].round(3),
+        }),
+        hide_index=True,
+        width='stretch'
+    )
+
+elif analysis_mode == "Race Pace" and race_pace_data is not None:
+    pace_laps = race_pace_data['laps']
+    pace_drivers = race_pace_data['drivers']
+    excluded = pace_laps['Excluded'][pace_laps['Excluded'] != ''].value_counts()
+
+    st.markdown(f"""
+    <div class='session-header'>
+        <div style='font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; color: #9b9b9b; letter-spacing: 0.08em; margin-bottom: 0.5rem;'>
+            {race_pace_data['year']} {race_pace_data['gp']} · {race_pace_data['session_type']}
+        </div>
+        <div style='font-size: 1.25rem; font-weight: 700; color: #ffffff;'>
+            Race pace · {len(pace_drivers)} drivers
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Best Pace", pace_drivers['Driver'].iloc[0])
+    col2.metric("Median Lap", f"{pace_drivers['Median'].iloc[0]:.3f}")
+    col3.metric("Clean Laps", f"{len(pace_laps) - excluded.sum()}")
+    col4.metric("Excluded", f"{excluded.sum()}")
+
+    pace_key = session_key(race_pace_data)
+    pace_settings = (race_pace_data['fuel_correction'], race_pace_data['threshold'])
+
+    st.markdown("<div class='section-header'>Race Pace Distribution</div>", unsafe_allow_html=True)
+    race_pace_fig = figure_cache.get_or_build(
+        pace_key + ('race_pace', pace_settings),
+        lambda: create_race_pace_plot(race_pace_data)
+    )
+    render_chart(race_pace_fig)
+
+    st.markdown("<div class='section-header'>Lap by Lap</div>", unsafe_allow_html=True)
+    stint_pace_fig = figure_cache.get_or_build(
+        pace_key + ('stint_pace', pace_settings),
+        lambda: create_stint_pace_plot(race_pace_data)
+    )
+    render_chart(stint_pace_fig)
+
+    st.markdown("<div class='section-header'>Stints</div>", unsafe_allow_html=True)
+    stints = race_pace_data['stints']
+    st.dataframe(
+        pd.DataFrame({
+            'Driver': stints['Driver'],
+            'Team': stints['Team'],
+            'Stint': stints['Stint'].astype(int),
+            'Tire': stints['Compound'],
+            'Laps': stints['Laps'],
+            'From Lap': stints['FirstLap'].astype(int),
+            'To Lap': stints['LastLap'].astype(int),
+            'Median (s)': stints['Median'].round(3),
+            'Best (s)': stints['Best'].round(3),
+            'σ (s)': stints['Std'].round(3),
+        }),
+        hide_index=True,
+        width='stretch'
+    )
+
+    if len(excluded):
+        st.caption("Excluded laps: " + ", ".join(f"{reason.lower()} {count}" for reason, count in excluded.items()))
+
+elif analysis_mode == "Tyre Degradation" and degradation_data is not None:
+    compound_rates = degradation_data['compounds']
+    fitted_stints = degradation_data['stints']
+
+    st.markdown(f"""
+    <div class='session-header'>
+        <div style='font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; color: #9b9b9b; letter-spacing: 0.08em; margin-bottom: 0.5rem;'>
+            {degradation_data['year']} {degradation_data['gp']} · {degradation_data['session_type']}
+        </div>
+        <div style='font-size: 1.25rem; font-weight: 700; color: #ffffff;'>
+            Tyre degradation · {len(fitted_stints)} stints
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    columns = st.columns(max(len(compound_rates), 1))
+    for column, (compound, rate, stint_count) in zip(
+            columns, compound_rates[['Compound', 'Rate', 'Stints']].itertuples(index=False)):
+        column.metric(compound.title(), f"{rate:+.3f}s/lap", f"{stint_count} stints", delta_color="off")
+
+    degradation_key = session_key(degradation_data) + (tuple(compound_rates['Compound']),)
+    degradation_settings = (degradation_data['fuel_correction'], degradation_data['min_laps'])
+
+    st.markdown("<div class='section-header'>Degradation by Team</div>", unsafe_allow_html=True)
+    rates_fig = figure_cache.get_or_build(
+        degradation_key + ('degradation_rates', degradation_settings),
+        lambda: create_degradation_rates_plot(degradation_data)
+    )
+    render_chart(rates_fig)
+
+    st.markdown("<div class='section-header'>Time Lost to Tyre Age</div>", unsafe_allow_html=True)
+    degradation_fig = figure_cache.get_or_build(
+        degradation_key + ('degradation', degradation_settings),
+        lambda: create_degradation_plot(degradation_data)
+    )
+    render_chart(degradation_fig)
+
+    st.markdown("<div class='section-header'>Stints</div>", unsafe_allow_html=True)
+    st.dataframe(
+        pd.DataFrame({
+            'Driver': fitted_stints['Driver'],
+            'Team': fitted_stints['Team'],
+            'Stint': fitted_stints['Stint'].astype(int),
+            'Tire': fitted_stints['Compound'],
+            'Laps': fitted_stints['Laps'],
+            'Tyre Age': (fitted_stints['FirstAge'].astype(int).astype(str) + '-'
+                         + fitted_stints['LastAge'].astype(int).astype(str)),
+            'Base (s)': fitted_stints['Base'].round(3),
+            'Rate (s/lap)': fitted_stints['Rate'].round(4),
+            'R²': fitted_stints['R2'].round(2),
+        }),
+        hide_index=True,
+        width='stretch'
+    )
+
+elif analysis_mode == "Race Trace" and race_trace_data is not None:
+    trace = race_trace_data['trace']
+    classification = race_trace_data['classification']
+    finishers = classification['Status'] != 'Retired'
+
+    st.markdown(f"""
+    <div class='session-header'>
+        <div style='font-size: 0.6875rem; font-weight: 700; text-transform: uppercase; color: #9b9b9b; letter-spacing: 0.08em; margin-bottom: 0.5rem;'>
+            {race_trace_data['year']} {race_trace_data['gp']} · {race_trace_data['session_type']}
+        </div>
+        <div style='font-size: 1.25rem; font-weight: 700; color: #ffffff;'>
+            Race trace · {trace.total_laps} laps
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Leader", classification['Driver'].iloc[0])
+    col2.metric("Laps", trace.total_laps)
+    col3.metric("Classified", int(finishers.sum()))
+    col4.metric("Retired", int((~finishers).sum()))
+
+    st.markdown("<div class='section-header'>Gap to Leader</div>", unsafe_allow_html=True)
+    race_trace_fig = figure_cache.get_or_build(
+        session_key(race_trace_data) + ('race_trace', trace.total_laps),
+        lambda: create_race_trace_plot(race_trace_data)
+    )
+    render_chart(race_trace_fig)
+
+    st.markdown("<div class='section-header'>Classification</div>", unsafe_allow_html=True)
+    st.dataframe(
+        pd.DataFrame({
+            'Position': np.arange(1, len(classification) + 1),
+            'Driver': classification['Driver'],
+            'Team': classification['Team'],
+            'Laps': classification['Laps'],
+            'Gap (s)': classification['Gap'].round(3),
+            'Status': classification['Status'],
+        }),
+        hide_index=True,
+        width='stretch'
+    )
+
+elif analysis_mode == "Driver Battle" and all(key in st.session_state for key in ['driver1_data', 'driver2_data']):
     driver1_data = st.session_state.driver1_data
     driver2_data = st.session_state.driver2_data
     driver1_name = st.session_state.driver1_name
@@ -1238,10 +1477,10 @@ if all(key in st.session_state for key in ['driver1_data', 'driver2_data']):
     time_diff = abs(lap_time_1 - lap_time_2)
     faster_driver = driver1_name if lap_time_1 < lap_time_2 else driver2_name
 
-    max_speed_1 = tel1['Speed'].max()
-    max_speed_2 = tel2['Speed'].max()
-    avg_speed_1 = tel1['Speed'].mean()
-    avg_speed_2 = tel2['Speed'].mean()
+    max_speed_1 = np.nanmax(tel1['Speed'])
+    max_speed_2 = np.nanmax(tel2['Speed'])
+    avg_speed_1 = np.nanmean(tel1['Speed'])
+    avg_speed_2 = np.nanmean(tel2['Speed'])
 
     # Driver comparison cards
     col1, col2, col3 = st.columns([1, 0.3, 1])
@@ -1306,8 +1545,13 @@ if all(key in st.session_state for key in ['driver1_data', 'driver2_data']):
 
     # Charts
     st.markdown("<div class='section-header'>Speed Comparison</div>", unsafe_allow_html=True)
-    speed_fig = create_speed_comparison(driver1_data, driver2_data, driver1_name, driver2_name)
-    st.plotly_chart(speed_fig, width='stretch')
+    figure_key = comparison_key(driver1_data, driver2_data, driver1_name, driver2_name)
+
+    speed_fig = figure_cache.get_or_build(
+        figure_key + ('speed', DEFAULT_POINT_BUDGET),
+        lambda: create_speed_comparison(driver1_data, driver2_data, driver1_name, driver2_name)
+    )
+    render_chart(speed_fig)
 
     st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
 
@@ -1317,13 +1561,42 @@ if all(key in st.session_state for key in ['driver1_data', 'driver2_data']):
         st.markdown("<div class='section-header'>Racing Line</div>", unsafe_allow_html=True)
         if driver1_data['data_issues'] or driver2_data['data_issues']:
             st.caption("⚠️ Track position data may be incomplete")
-        track_fig = create_track_map(driver1_data, driver2_data, driver1_name, driver2_name)
-        st.plotly_chart(track_fig, width='stretch')
+        track_fig = figure_cache.get_or_build(
+            figure_key + ('track', DEFAULT_POINT_BUDGET),
+            lambda: create_track_map(driver1_data, driver2_data, driver1_name, driver2_name)
+        )
+        render_chart(track_fig)
+
+    delta_resolution = st.session_state.get('delta_resolution', DEFAULT_RESOLUTION)
+    delta_uniform = st.session_state.get('delta_uniform_percent', round(ADAPTIVE_UNIFORM_WEIGHT * 100)) / 100
 
     with col2:
         st.markdown("<div class='section-header'>Time Delta</div>", unsafe_allow_html=True)
-        delta_fig = create_delta_time_plot(driver1_data, driver2_data, driver1_name, driver2_name)
-        st.plotly_chart(delta_fig, width='stretch')
+        delta_fig = figure_cache.get_or_build(
+            figure_key + ('delta', (delta_resolution, delta_uniform)),
+            lambda: create_delta_time_plot(driver1_data, driver2_data, driver1_name, driver2_name,
+                                           delta_resolution, delta_uniform)
+        )
+        render_chart(delta_fig)
+
+    try:
+        segments = segment_index.get(st.session_state.session)
+    except (OSError, ValueError) as e:
+        metrics.increment('segment_failures')
+        segments = None
+        st.caption(f"Corner by corner comparison unavailable: {e}")
+
+    if segments is not None:
+        st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
+        st.markdown("<div class='section-header'>Corner by Corner</div>", unsafe_allow_html=True)
+        segment_fig = figure_cache.get_or_build(
+            figure_key + ('segments', (delta_resolution, delta_uniform)),
+            lambda: create_segment_delta_plot(driver1_data, driver2_data, driver1_name, driver2_name, segments,
+                                              delta_resolution, delta_uniform)
+        )
+        render_chart(segment_fig)
+        if segments.source == 'speed_minima':
+            st.caption("Corners detected from speed minima on the session's fastest lap")
 
 else:
     # Welcome screen
@@ -1375,3 +1648,5 @@ st.markdown("""
     Unofficial application • Data provided by Fast-F1 • Not affiliated with Formula 1 or FIA
 </div>
 """, unsafe_allow_html=True)
+
+metrics.observe('rerun', time.perf_counter() - rerun_start)
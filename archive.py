@@ -0,0 +1,244 @@
+"""Offline columnar archive of session laps and per-lap telemetry.
+
+Sessions are exported to a Parquet dataset partitioned by year, event,
+session and driver:
+
+    archive/year=2024/event=bahrain_grand_prix/session=qualifying/
+        session.json            # display names and drivers
+        laps.parquet            # the slimmed lap table
+        driver=VER/telemetry.parquet   # one row group per lap
+        columns/                # memory-mapped copy, see column_store.py
+
+Loading an archived session never calls session.load() or the network: the
+lap table becomes a Fast-F1 Laps object and each lap's telemetry is a
+zero-copy slice of the memory-mapped columns (or, for archives without them,
+read from its own Parquet row group on first use).
+
+Usage:
+    python archive.py 2024 "Bahrain Grand Prix" Qualifying Race
+    python archive.py --rebuild-columns 2024 "Bahrain Grand Prix" Qualifying
+"""
+import argparse
+import glob
+import json
+import os
+import re
+
+import fastf1
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from bulk_telemetry import extract_driver_laps
+from column_store import ColumnStore, has_columns, write_columns
+from metrics import span
+from session_loader import ensure_telemetry, load_session_laps
+from telemetry_store import LapTelemetry, SessionStore
+
+ARCHIVE_DIR = 'archive'
+COLUMNS_DIR = 'columns'
+
+
+def _slug(name):
+    return re.sub(r'[^a-z0-9]+', '_', str(name).lower()).strip('_')
+
+
+def session_dir(year, gp, session_type, directory=ARCHIVE_DIR):
+    """Return the partition directory of one session."""
+    return os.path.join(directory, f"year={year}", f"event={_slug(gp)}", f"session={_slug(session_type)}")
+
+
+def _telemetry_path(path, driver):
+    return os.path.join(path, f"driver={driver}", 'telemetry.parquet')
+
+
+def _lap_table(lap_number, telemetry):
+    columns = {'LapNumber': pa.array(np.full(len(telemetry), lap_number, dtype=np.int16))}
+    for column in telemetry.columns:
+        columns[column] = pa.array(telemetry[column])
+    return pa.table(columns)
+
+
+def _driver_laps(session, driver):
+    """Yield (lap number, LapTelemetry) for a driver's laps, bulk extracted when possible."""
+    try:
+        ragged = extract_driver_laps(session, driver)
+    except Exception:
+        ragged = None
+
+    if ragged is not None:
+        for _, lap_number, telemetry in ragged:
+            yield lap_number, telemetry
+        return
+
+    for _, lap in session.laps.pick_drivers(driver).iterlaps():
+        try:
+            telemetry = LapTelemetry.from_frame(lap.get_telemetry())
+        except Exception:
+            continue  # laps without car or position data are skipped
+        yield int(lap['LapNumber']), telemetry
+
+
+def export_session(year, gp, session_type, directory=ARCHIVE_DIR):
+    """Load a session from Fast-F1 and write its laps and every lap's telemetry to the archive.
+
+    Returns the number of laps written.
+    """
+    session = load_session_laps(year, gp, session_type)
+    ensure_telemetry(session)
+    laps = SessionStore(year, gp, session_type, session).laps
+
+    path = session_dir(year, gp, session_type, directory)
+    os.makedirs(path, exist_ok=True)
+
+    stored = []
+    drivers = sorted(laps['Driver'].dropna().unique().tolist())
+    for driver in drivers:
+        driver_path = _telemetry_path(path, driver)
+        os.makedirs(os.path.dirname(driver_path), exist_ok=True)
+
+        writer = None
+        tmp_path = f"{driver_path}.tmp"
+        try:
+            for lap_number, telemetry in _driver_laps(session, driver):
+                if telemetry.empty:
+                    continue
+                table = _lap_table(lap_number, telemetry)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table, row_group_size=len(table))
+                stored.append((driver, lap_number, telemetry))
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is not None:
+            os.replace(tmp_path, driver_path)
+
+    laps.to_parquet(os.path.join(path, 'laps.parquet'), index=False)
+    write_columns(os.path.join(path, COLUMNS_DIR), stored)
+
+    # Written last, so a session only shows up in the archive once it is complete
+    with open(os.path.join(path, 'session.json'), 'w') as f:
+        json.dump({'year': year, 'gp': gp, 'session_type': session_type, 'drivers': drivers}, f, indent=1)
+
+    return len(stored)
+
+
+def _read_driver_laps(path, driver):
+    """Yield (driver, lap number, {channel: array}) for every lap in a driver's Parquet file."""
+    table = pq.read_table(_telemetry_path(path, driver))
+    lap_numbers = table.column('LapNumber').to_numpy()
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(lap_numbers)) + 1, [len(lap_numbers)]))
+    channels = {c: table.column(c).to_numpy() for c in table.column_names if c != 'LapNumber'}
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        yield driver, int(lap_numbers[start]), {c: values[start:stop] for c, values in channels.items()}
+
+
+def rebuild_columns(year, gp, session_type, directory=ARCHIVE_DIR):
+    """Rebuild a session's memory-mapped columns from its Parquet telemetry.
+
+    Returns the number of laps written.
+    """
+    path = session_dir(year, gp, session_type, directory)
+    with open(os.path.join(path, 'session.json')) as f:
+        drivers = json.load(f)['drivers']
+
+    stored = []
+    for driver in drivers:
+        if os.path.exists(_telemetry_path(path, driver)):
+            stored.extend(_read_driver_laps(path, driver))
+    write_columns(os.path.join(path, COLUMNS_DIR), stored)
+    return len(stored)
+
+
+def archived_sessions(directory=ARCHIVE_DIR):
+    """Return {year: {event: [session types]}} for every complete session in the archive."""
+    sessions = {}
+    for path in sorted(glob.glob(os.path.join(directory, 'year=*', 'event=*', 'session=*', 'session.json'))):
+        try:
+            with open(path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        sessions.setdefault(meta['year'], {}).setdefault(meta['gp'], []).append(meta['session_type'])
+    return sessions
+
+
+class ArchivedSession:
+    """Stand-in for a Fast-F1 Session holding only what the archive stores."""
+
+    def __init__(self, year, gp, session_type, laps):
+        self.event = {'EventName': gp, 'Year': year}
+        self.name = session_type
+        self.laps = fastf1.core.Laps(laps)
+
+
+class ArchiveStore(SessionStore):
+    """SessionStore whose lap telemetry is read from the archive instead of Fast-F1."""
+
+    source = "Archive"
+
+    def __init__(self, year, gp, session_type, directory=ARCHIVE_DIR, cache=None):
+        self.path = session_dir(year, gp, session_type, directory)
+        laps = pd.read_parquet(os.path.join(self.path, 'laps.parquet'))
+        session = ArchivedSession(year, gp, session_type, laps)
+        super().__init__(year, gp, session_type, session, cache)
+
+        columns_path = os.path.join(self.path, COLUMNS_DIR)
+        self.columns = ColumnStore(columns_path) if has_columns(columns_path) else None
+
+    def lap_telemetry(self, lap):
+        """Return stored telemetry for a lap from the mapped columns, or its Parquet row group."""
+        lap_number = int(lap['LapNumber'])
+        if self.columns is not None:
+            # Mapped slices cost no heap memory, so they bypass the LRU cache
+            telemetry = self.columns.lap(lap['Driver'], lap_number)
+            if telemetry is not None:
+                return telemetry
+
+        key = self.key + (lap['Driver'], lap_number)
+        telemetry = self.cache.get(key)
+        if telemetry is not None:
+            return telemetry
+
+        path = _telemetry_path(self.path, lap['Driver'])
+        if not os.path.exists(path):
+            return LapTelemetry({})
+        with span('read_archive_lap'):
+            table = pq.read_table(path, filters=[('LapNumber', '=', lap_number)])
+        data = {
+            column: table.column(column).to_numpy()
+            for column in table.column_names if column != 'LapNumber'
+        }
+        return self.cache.put(key, LapTelemetry(data))
+
+
+def load_archived_session(year, gp, session_type, directory=ARCHIVE_DIR):
+    """Open an archived session as a store, without calling session.load()."""
+    if not os.path.exists(os.path.join(session_dir(year, gp, session_type, directory), 'session.json')):
+        raise FileNotFoundError(f"{year} {gp} {session_type} is not in the archive")
+    return ArchiveStore(year, gp, session_type, directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export sessions to the offline telemetry archive")
+    parser.add_argument('year', type=int)
+    parser.add_argument('gp')
+    parser.add_argument('session_types', nargs='+')
+    parser.add_argument('--directory', default=ARCHIVE_DIR)
+    parser.add_argument('--rebuild-columns', action='store_true',
+                        help="only rebuild memory-mapped columns from already archived Parquet files")
+    args = parser.parse_args()
+
+    fastf1.Cache.enable_cache('cache')
+    for session_type in args.session_types:
+        if args.rebuild_columns:
+            laps = rebuild_columns(args.year, args.gp, session_type, args.directory)
+        else:
+            laps = export_session(args.year, args.gp, session_type, args.directory)
+        print(f"{args.year} {args.gp} {session_type}: {laps} laps")
+
+
+if __name__ == '__main__':
+    main()
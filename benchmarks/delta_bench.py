@@ -0,0 +1,98 @@
+"""Benchmark the vectorized delta engine against the previous list-comprehension code,
+and compare the accuracy of even and adaptive sample placement.
+
+Run from the repository root:
+
+    python benchmarks/delta_bench.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delta import compute_delta  # noqa: E402
+
+RESOLUTIONS = (1_000, 10_000, 100_000)
+REPEATS = 20
+
+ACCURACY_BUDGETS = (300, 1_000)
+REFERENCE_RESOLUTION = 200_000
+
+# (corner distance in m, minimum speed in km/h)
+CORNERS = ((800, 90), (1700, 140), (2600, 70), (3500, 180), (4400, 110))
+
+
+def synthetic_lap(samples=800, seed=0, pace=1.0):
+    """Build a deterministic lap with a realistic speed trace."""
+    rng = np.random.default_rng(seed)
+    distance = np.linspace(0, 5300, samples)
+    speed = np.clip(200 + 100 * np.sin(distance / 300) + rng.normal(0, 2, samples), 70, 340)
+    time = np.cumsum(np.diff(distance, prepend=0) / (speed / 3.6)) * pace
+    return {'Distance': distance, 'Speed': speed, 'Time': time}
+
+
+def cornered_lap(samples=800, corner_offset=0, min_speed_offset=0):
+    """Build a deterministic lap with short braking zones and long exits."""
+    distance = np.linspace(0, 5300, samples)
+    speed = np.full(samples, 320.0)
+    for corner, min_speed in CORNERS:
+        corner += corner_offset
+        min_speed += min_speed_offset
+        braking = (distance > corner - 120) & (distance <= corner)
+        speed[braking] = np.minimum(speed[braking], min_speed + (320 - min_speed) * (corner - distance[braking]) / 120)
+        exit_ = (distance > corner) & (distance < corner + 600)
+        speed[exit_] = np.minimum(speed[exit_], min_speed + (320 - min_speed) * (distance[exit_] - corner) / 600)
+    time = np.concatenate(([0], np.cumsum(np.diff(distance) / ((speed[1:] + speed[:-1]) / 2 / 3.6))))
+    return {'Distance': distance, 'Speed': speed, 'Time': time}
+
+
+def legacy_delta(tel1, tel2, resolution):
+    """The delta computation create_delta_time_plot used before the delta engine."""
+    min_distance = max(tel1['Distance'].min(), tel2['Distance'].min())
+    max_distance = min(tel1['Distance'].max(), tel2['Distance'].max())
+    common_distance = np.linspace(min_distance, max_distance, resolution)
+
+    time1 = np.interp(common_distance, tel1['Distance'], tel1['Time'])
+    time2 = np.interp(common_distance, tel2['Distance'], tel2['Time'])
+    delta = time1 - time2
+
+    delta_driver2_winning = [d if d > 0 else 0 for d in delta]
+    delta_driver1_winning = [d if d < 0 else 0 for d in delta]
+    return common_distance, delta, delta_driver2_winning, delta_driver1_winning
+
+
+def accuracy():
+    """Print the delta error of each sample placement against a dense reference."""
+    tel1 = cornered_lap()
+    tel2 = cornered_lap(corner_offset=15, min_speed_offset=8)
+    reference = compute_delta(tel1, tel2, REFERENCE_RESOLUTION, adaptive=False)
+
+    print(f"{'budget':>8}  {'placement':>9}  {'max err (ms)':>12}  {'mean err (ms)':>13}")
+    for budget in ACCURACY_BUDGETS:
+        for adaptive in (False, True):
+            gap = compute_delta(tel1, tel2, budget, adaptive=adaptive)
+            error = np.abs(np.interp(reference['distance'], gap['distance'], gap['delta']) - reference['delta'])
+            placement = 'adaptive' if adaptive else 'even'
+            print(f"{budget:>8}  {placement:>9}  {error.max() * 1e3:>12.2f}  {error.mean() * 1e3:>13.3f}")
+
+
+def main():
+    tel1 = synthetic_lap(seed=1)
+    tel2 = synthetic_lap(seed=2, pace=1.002)
+
+    print(f"{'samples':>8}  {'legacy (ms)':>12}  {'engine (ms)':>12}  {'speedup':>8}")
+    for resolution in RESOLUTIONS:
+        legacy = min(timeit.repeat(lambda: legacy_delta(tel1, tel2, resolution), number=1, repeat=REPEATS))
+        engine = min(timeit.repeat(lambda: compute_delta(tel1, tel2, resolution, adaptive=False),
+                                   number=1, repeat=REPEATS))
+        print(f"{resolution:>8}  {legacy * 1e3:>12.3f}  {engine * 1e3:>12.3f}  {legacy / engine:>7.1f}x")
+
+    print()
+    accuracy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""Deterministic fixture sessions for benchmarks, written in the offline archive layout.
+
+Fixtures are generated from fixed seeds, so every machine and every run gets
+byte-identical sessions without network access. They are built on first use
+under benchmarks/fixtures/ and reused afterwards. FixtureSession serves the
+same data as a Fast-F1 Session, so the Fast-F1 store path runs offline too.
+"""
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastf1.core import Laps, Session, Telemetry  # noqa: E402
+
+from archive import COLUMNS_DIR, session_dir  # noqa: E402
+from column_store import ColumnStore, write_columns  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+FIXTURE_YEAR = 2024
+FIXTURE_EVENT = "Fixture Grand Prix"
+
+# session type: (drivers, laps per driver)
+FIXTURE_SESSIONS = {
+    "Qualifying": (20, 12),
+    "Race": (20, 50),
+}
+
+LAP_LENGTH = 5300.0
+SAMPLES_PER_LAP = 750
+
+# Wall clock time of SessionTime zero, for the Date column of car and position data
+SESSION_START = pd.Timestamp('2024-03-02 15:00:00')
+
+# (corner distance in m, minimum speed in km/h)
+CORNERS = ((400, 95), (1250, 140), (1900, 70), (2800, 180), (3500, 110), (4300, 85), (4900, 160))
+
+TEAMS = (
+    'Red Bull Racing', 'Ferrari', 'Mercedes', 'McLaren', 'Aston Martin',
+    'Alpine', 'Williams', 'RB', 'Kick Sauber', 'Haas F1 Team',
+)
+DRIVERS = (
+    'VER', 'PER', 'LEC', 'SAI', 'HAM', 'RUS', 'NOR', 'PIA', 'ALO', 'STR',
+    'GAS', 'OCO', 'ALB', 'SAR', 'TSU', 'RIC', 'BOT', 'ZHO', 'HUL', 'MAG',
+)
+
+
+def fixture_lap(rng, pace):
+    """Build one lap of telemetry channels with braking zones, exits and sensor noise."""
+    distance = np.sort(rng.uniform(0, LAP_LENGTH, SAMPLES_PER_LAP))
+    distance[0] = 0.0
+    speed = np.full(SAMPLES_PER_LAP, 325.0)
+    for corner, min_speed in CORNERS:
+        min_speed = min_speed * rng.normal(1.0, 0.01)
+        braking = (distance > corner - 110) & (distance <= corner)
+        speed[braking] = np.minimum(speed[braking], min_speed + (325 - min_speed) * (corner - distance[braking]) / 110)
+        exit_ = (distance > corner) & (distance < corner + 550)
+        speed[exit_] = np.minimum(speed[exit_], min_speed + (325 - min_speed) * (distance[exit_] - corner) / 550)
+    speed = (speed / pace + rng.normal(0, 1.5, SAMPLES_PER_LAP)).astype(np.float32)
+
+    mean_speed = (speed[1:] + speed[:-1]) / 2 / 3.6
+    time = np.concatenate(([0.0], np.cumsum(np.diff(distance) / mean_speed)))
+
+    angle = distance / LAP_LENGTH * 2 * np.pi
+    return {
+        'Distance': distance,
+        'Time': time,
+        'Speed': speed,
+        'X': (2000 * np.cos(angle) + 300 * np.cos(3 * angle)).astype(np.float32),
+        'Y': (1200 * np.sin(angle) + 200 * np.sin(2 * angle)).astype(np.float32),
+        'Throttle': np.clip((speed - 80) / 2.4, 0, 100).astype(np.float32),
+        'Brake': (np.gradient(speed) < -1).astype(np.float32),
+        'nGear': np.clip(speed // 40 + 1, 1, 8).astype(np.float32),
+    }
+
+
+def build_fixture(session_type, directory=FIXTURES_DIR):
+    """Write one fixture session to the archive layout and return its directory."""
+    driver_count, lap_count = FIXTURE_SESSIONS[session_type]
+    rng = np.random.default_rng(sorted(FIXTURE_SESSIONS).index(session_type))
+
+    rows = []
+    stored = []
+    for number, driver in enumerate(DRIVERS[:driver_count], start=1):
+        team = TEAMS[(number - 1) // 2]
+        driver_pace = 1.0 + 0.002 * number
+        session_time = 0.0
+        for lap_number in range(1, lap_count + 1):
+            telemetry = fixture_lap(rng, driver_pace * rng.normal(1.0, 0.002))
+            lap_time = float(telemetry['Time'][-1])
+            stint = 1 if lap_number <= lap_count // 2 else 2
+            rows.append({
+                'Time': pd.Timedelta(seconds=session_time + lap_time),
+                'Driver': driver,
+                'DriverNumber': str(number),
+                'Team': team,
+                'LapTime': pd.Timedelta(seconds=lap_time),
+                'LapNumber': float(lap_number),
+                'Stint': float(stint),
+                'PitOutTime': pd.Timedelta(seconds=session_time) if lap_number == lap_count // 2 + 1 else pd.NaT,
+                'PitInTime': pd.Timedelta(seconds=session_time + lap_time) if lap_number == lap_count // 2 else pd.NaT,
+                'Sector1Time': pd.Timedelta(seconds=lap_time * 0.31),
+                'Sector2Time': pd.Timedelta(seconds=lap_time * 0.38),
+                'Sector3Time': pd.Timedelta(seconds=lap_time * 0.31),
+                'IsPersonalBest': True,
+                'Compound': 'SOFT' if stint == 1 else 'HARD',
+                'TyreLife': float(lap_number if stint == 1 else lap_number - lap_count // 2),
+                'FreshTyre': True,
+                'LapStartTime': pd.Timedelta(seconds=session_time),
+                'TrackStatus': '1',
+                'Position': float(number),
+                'Deleted': False,
+                'IsAccurate': True,
+            })
+            stored.append((driver, lap_number, telemetry))
+            session_time += lap_time
+
+    path = session_dir(FIXTURE_YEAR, FIXTURE_EVENT, session_type, directory)
+    os.makedirs(path, exist_ok=True)
+    pd.DataFrame(rows).to_parquet(os.path.join(path, 'laps.parquet'), index=False)
+    write_columns(os.path.join(path, COLUMNS_DIR), stored)
+    with open(os.path.join(path, 'session.json'), 'w') as f:
+        json.dump({
+            'year': FIXTURE_YEAR, 'gp': FIXTURE_EVENT, 'session_type': session_type,
+            'drivers': list(DRIVERS[:driver_count]),
+        }, f, indent=1)
+    return path
+
+
+def ensure_fixtures(directory=FIXTURES_DIR):
+    """Build any fixture session missing from directory."""
+    for session_type in FIXTURE_SESSIONS:
+        path = session_dir(FIXTURE_YEAR, FIXTURE_EVENT, session_type, directory)
+        if not os.path.exists(os.path.join(path, 'session.json')):
+            build_fixture(session_type, directory)
+
+
+class FixtureSession(Session):
+    """A Fast-F1 Session whose load() reads a fixture session instead of the live timing API.
+
+    Car and position data come back per driver number with Fast-F1's channels,
+    position samples falling between car samples as in the live feed, so
+    merge_channels and the bulk cut do the same work as on real data.
+    """
+
+    def __init__(self, session_type, directory=FIXTURES_DIR):
+        self.name = session_type
+        self.path = session_dir(FIXTURE_YEAR, FIXTURE_EVENT, session_type, directory)
+        self._t0_date = SESSION_START
+
+    def load(self, *, laps=True, telemetry=True, weather=True, messages=True):
+        if laps:
+            self._laps = Laps(pd.read_parquet(os.path.join(self.path, 'laps.parquet')), session=self)
+        if telemetry:
+            self._load_telemetry()
+
+    def _load_telemetry(self):
+        columns = ColumnStore(os.path.join(self.path, COLUMNS_DIR))
+        self._car_data, self._pos_data = {}, {}
+        for number, laps in self._laps.groupby('DriverNumber'):
+            stored = [
+                (start.total_seconds(), columns.lap(driver, lap_number))
+                for start, driver, lap_number in zip(laps['LapStartTime'], laps['Driver'], laps['LapNumber'])
+            ]
+            time = np.concatenate([start + lap['Time'] for start, lap in stored])
+            channel = {c: np.concatenate([lap[c] for _, lap in stored]) for c in ('Speed', 'X', 'Y', 'Throttle', 'Brake', 'nGear')}
+
+            car_time = pd.to_timedelta(time, unit='s')
+            car = pd.DataFrame({
+                'Date': SESSION_START + car_time, 'SessionTime': car_time, 'Time': car_time,
+                'RPM': channel['Speed'] * 40, 'Speed': channel['Speed'], 'nGear': channel['nGear'].astype(np.int64),
+                'Throttle': channel['Throttle'], 'Brake': channel['Brake'] > 0, 'DRS': 0, 'Source': 'car',
+            })
+            pos_seconds = (time[1:] + time[:-1]) / 2
+            pos_time = pd.to_timedelta(pos_seconds, unit='s')
+            pos = pd.DataFrame({
+                'Date': SESSION_START + pos_time, 'SessionTime': pos_time, 'Time': pos_time, 'Status': 'OnTrack',
+                'X': np.interp(pos_seconds, time, channel['X']), 'Y': np.interp(pos_seconds, time, channel['Y']),
+                'Z': 0.0, 'Source': 'pos',
+            })
+            self._car_data[number] = Telemetry(car, session=self, driver=number)
+            self._pos_data[number] = Telemetry(pos, session=self, driver=number)
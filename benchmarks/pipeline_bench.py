@@ -0,0 +1,204 @@
+"""Benchmark each stage of the load -> extract -> plot pipeline on local fixture sessions.
+
+Every stage is timed separately (best and median wall time over REPEATS runs,
+after one untimed warm-up), then run once more under tracemalloc for its peak
+Python/NumPy memory. Payload size is the stage's output: the lap table, the
+lap's telemetry arrays, or the figure's JSON. Loading and extraction are timed
+for both the Archive store and the Fast-F1 store (fed from the same fixture by
+FixtureSession); cold stages get a fresh store and telemetry cache every run,
+warm ones repeat a lookup that is already cached. Results are printed and saved as
+JSON; pass --compare with an earlier results file to see the ratio per stage.
+
+Run from the repository root:
+
+    python benchmarks/pipeline_bench.py
+    python benchmarks/pipeline_bench.py --output before.json
+    python benchmarks/pipeline_bench.py --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis import get_driver_telemetry, open_session, validate_telemetry_data  # noqa: E402
+from charts import create_delta_time_plot, create_speed_comparison, create_track_map  # noqa: E402
+from fixtures import (FIXTURE_EVENT, FIXTURE_SESSIONS, FIXTURE_YEAR, FIXTURES_DIR,  # noqa: E402
+                      FixtureSession, ensure_fixtures)
+from session_loader import ensure_telemetry  # noqa: E402
+from telemetry_store import SessionStore, TelemetryCache  # noqa: E402
+
+REPEATS = 20
+DRIVERS = ('VER', 'LEC')
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pipeline_results.json')
+
+BUILDERS = (
+    ('create_speed_comparison', create_speed_comparison),
+    ('create_track_map', create_track_map),
+    ('create_delta_time_plot', create_delta_time_plot),
+)
+
+
+def measure(stage, payload=None, repeats=REPEATS, setup=None):
+    """Time stage() and record its peak traced memory; payload(result) gives the output size.
+
+    With setup, every run (warm-up included) calls stage(setup()) and only the
+    stage itself is timed.
+    """
+    if setup is not None:
+        bound = stage
+        stage = lambda: bound(prepared)  # noqa: E731
+
+    prepared = setup() if setup else None
+    result = stage()
+
+    timings = []
+    for _ in range(repeats):
+        prepared = setup() if setup else None
+        start = time.perf_counter()
+        stage()
+        timings.append(time.perf_counter() - start)
+
+    prepared = setup() if setup else None
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    stage()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return result, {
+        'best_ms': min(timings) * 1e3,
+        'median_ms': statistics.median(timings) * 1e3,
+        'peak_bytes': peak,
+        'payload_bytes': payload(result) if payload else None,
+    }
+
+
+def bench_session(session_type, repeats=REPEATS):
+    """Run every stage against one fixture session and return {stage: metrics}."""
+    stages = {}
+    driver1, driver2 = DRIVERS
+
+    lap_table_bytes = lambda s: int(s.laps.memory_usage(deep=True).sum())  # noqa: E731
+    telemetry_bytes = lambda r: r[0]['telemetry'].nbytes  # noqa: E731
+    extract = lambda store: get_driver_telemetry(store, driver1)  # noqa: E731
+
+    # Archive loading has no process-level cache, so every call is a cold open
+    open_fixture = lambda: open_session(FIXTURE_YEAR, FIXTURE_EVENT, session_type, "Archive", FIXTURES_DIR)  # noqa: E731
+    store, stages['load_session (Archive)'] = measure(open_fixture, lap_table_bytes, repeats)
+    _, stages['get_driver_telemetry (Archive, cold)'] = measure(extract, telemetry_bytes, repeats, setup=open_fixture)
+    (data1, _), stages['get_driver_telemetry (Archive, warm)'] = measure(
+        lambda: extract(store), telemetry_bytes, repeats)
+    data2, _ = get_driver_telemetry(store, driver2)
+
+    # The Fast-F1 store over the same fixture. Fast-F1's own API parsing can't run
+    # offline, so loading covers the store; cold extraction is the bulk pass that
+    # merges the driver's car and position data and cuts every lap on a miss
+    def fastf1_laps():
+        session = FixtureSession(session_type)
+        session.load(laps=True, telemetry=False, weather=False, messages=True)
+        return session
+
+    new_store = lambda session: SessionStore(  # noqa: E731
+        FIXTURE_YEAR, FIXTURE_EVENT, session_type, session, TelemetryCache())
+    _, stages['load_session (Fast-F1)'] = measure(lambda: new_store(fastf1_laps()), lap_table_bytes, repeats)
+
+    session = fastf1_laps()
+    ensure_telemetry(session)
+    fastf1_store = new_store(session)
+    _, stages['get_driver_telemetry (Fast-F1, cold)'] = measure(
+        extract, telemetry_bytes, repeats, setup=lambda: new_store(session))
+    _, stages['get_driver_telemetry (Fast-F1, warm)'] = measure(
+        lambda: extract(fastf1_store), telemetry_bytes, repeats)
+
+    _, stages['validate_telemetry_data'] = measure(
+        lambda: validate_telemetry_data(data1, driver1), None, repeats)
+
+    for name, builder in BUILDERS:
+        figure, stages[name] = measure(
+            lambda: builder(data1, data2, driver1, driver2), lambda f: len(f.to_json()), repeats)
+        _, stages[f'to_json ({name})'] = measure(figure.to_json, len, repeats)
+
+    return stages
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _format_bytes(value):
+    if value is None:
+        return '-'
+    for unit in ('B', 'KiB', 'MiB'):
+        if value < 1024:
+            return f"{value:.0f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def report(results, baseline=None):
+    for session_type, stages in results['sessions'].items():
+        print(f"\n{session_type}")
+        header = f"{'stage':<42} {'best (ms)':>10} {'median (ms)':>12} {'peak mem':>10} {'payload':>10}"
+        print(header + ("  vs baseline" if baseline else ""))
+        for stage, metrics in stages.items():
+            line = (f"{stage:<42} {metrics['best_ms']:>10.3f} {metrics['median_ms']:>12.3f} "
+                    f"{_format_bytes(metrics['peak_bytes']):>10} {_format_bytes(metrics['payload_bytes']):>10}")
+            previous = (baseline or {}).get('sessions', {}).get(session_type, {}).get(stage)
+            if previous:
+                line += f"  {metrics['median_ms'] / previous['median_ms']:>6.2f}x"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the telemetry pipeline on local fixtures")
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--compare', help="earlier results file to compare median times against")
+    args = parser.parse_args()
+
+    ensure_fixtures()
+
+    results = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'repeats': args.repeats,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'plotly': plotly.__version__,
+        },
+        'sessions': {session_type: bench_session(session_type, args.repeats) for session_type in FIXTURE_SESSIONS},
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    report(results, baseline)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=1)
+    print(f"\nSaved {args.output}")
+
+
+if __name__ == '__main__':
+    main()
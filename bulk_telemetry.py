@@ -0,0 +1,162 @@
+"""Bulk extraction of every lap's telemetry for a driver in one pass.
+
+Lap.get_telemetry() re-slices, re-merges and re-integrates car and position
+data for each lap, and also computes the driver ahead from every other car.
+Here a driver's car and position data are merged once for the whole session,
+all lap windows are cut with one vectorized searchsorted over SessionTime, and
+per-lap Time and Distance come from a segmented cumulative sum. The result is
+a ragged array: one flat array per channel plus an offsets index.
+
+Unlike Lap.get_telemetry(), no interpolated sample is inserted exactly at the
+lap start and end; the first sample's distance covers the gap from the lap
+start instead, so lap distance and time stay consistent.
+"""
+import numpy as np
+
+from telemetry_store import COLUMN_DTYPES, OPTIONAL_TELEMETRY_COLUMNS, LapTelemetry
+
+# Channels taken straight from the merged data; Time and Distance are derived per lap
+_GATHERED_COLUMNS = ('Speed', 'X', 'Y') + OPTIONAL_TELEMETRY_COLUMNS
+
+
+class RaggedTelemetry:
+    """Telemetry of many laps as flat per-channel arrays with an offsets index.
+
+    Lap i occupies rows offsets[i]:offsets[i + 1] of every channel, and is
+    identified by drivers[i] and lap_numbers[i].
+    """
+
+    __slots__ = ('drivers', 'lap_numbers', 'offsets', 'columns', '_index')
+
+    def __init__(self, drivers, lap_numbers, offsets, columns):
+        self.drivers = np.asarray(drivers, dtype=object)
+        self.lap_numbers = np.asarray(lap_numbers, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.columns = columns
+        self._index = {
+            (driver, int(lap_number)): i
+            for i, (driver, lap_number) in enumerate(zip(self.drivers, self.lap_numbers))
+        }
+
+    @classmethod
+    def concatenate(cls, parts):
+        """Join several RaggedTelemetry (e.g. one per driver) into one."""
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls([], [], [0], {})
+        names = [c for c in parts[0].columns if all(c in part.columns for part in parts)]
+        shifts = np.cumsum([0] + [part.offsets[-1] for part in parts[:-1]])
+        offsets = np.concatenate([[0]] + [part.offsets[1:] + shift for part, shift in zip(parts, shifts)])
+        return cls(
+            np.concatenate([part.drivers for part in parts]),
+            np.concatenate([part.lap_numbers for part in parts]),
+            offsets,
+            {c: np.concatenate([part.columns[c] for part in parts]) for c in names},
+        )
+
+    def __len__(self):
+        return len(self.lap_numbers)
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def lap(self, i, copy=False):
+        """Return lap i as LapTelemetry whose arrays are views into the flat columns.
+
+        With copy=True the lap owns its arrays instead, so holding it doesn't
+        keep the whole flat block alive.
+        """
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        if copy:
+            return LapTelemetry({c: values[start:stop].copy() for c, values in self.columns.items()})
+        return LapTelemetry({c: values[start:stop] for c, values in self.columns.items()})
+
+    def find(self, driver, lap_number):
+        """Return the position of a (driver, lap number), or None."""
+        return self._index.get((driver, int(lap_number)))
+
+    def __iter__(self):
+        """Yield (driver, lap number, LapTelemetry) for every lap."""
+        for i in range(len(self)):
+            yield self.drivers[i], int(self.lap_numbers[i]), self.lap(i)
+
+
+def _seconds(values):
+    return values.dt.total_seconds().to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def merged_driver_data(session, driver_number):
+    """Merge a driver's whole-session position and car data once."""
+    pos = session.pos_data[driver_number]
+    car = session.car_data[driver_number]
+    return pos.merge_channels(car, frequency='original')
+
+
+def cut_laps(merged, laps):
+    """Cut a driver's merged telemetry into every lap of `laps` at once.
+
+    `merged` is one driver's whole-session telemetry with SessionTime; `laps`
+    are that driver's rows of the lap table. Laps without a start or end time,
+    or without samples, are left out.
+    """
+    session_time = _seconds(merged['SessionTime'])
+    starts = _seconds(laps['LapStartTime'])
+    ends = _seconds(laps['Time'])
+
+    # Every lap window in two searchsorted calls
+    lo = np.searchsorted(session_time, starts, side='left')
+    hi = np.searchsorted(session_time, ends, side='right')
+    keep = ~(np.isnan(starts) | np.isnan(ends)) & (hi - lo >= 2)
+    lo, hi, starts = lo[keep], hi[keep], starts[keep]
+
+    lengths = hi - lo
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    first = offsets[:-1]
+    # Row of the merged data behind every output sample
+    rows = np.arange(offsets[-1]) - np.repeat(first - lo, lengths)
+
+    columns = {}
+    time = session_time[rows] - np.repeat(starts, lengths)
+    columns['Time'] = time
+
+    speed = merged['Speed'].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+    # Distance per step; a lap's first step runs from the lap start to its first sample
+    step = np.diff(time, prepend=0.0)
+    step[first] = time[first]
+    moved = speed / 3.6 * step
+    # A missing Speed sample only blanks its own row, as Telemetry.integrate_distance
+    # does, instead of turning this lap and every later one NaN
+    missing = ~np.isfinite(moved)
+    moved[missing] = 0.0
+    travelled = np.cumsum(moved)
+    distance = travelled - np.repeat(travelled[first] - moved[first], lengths)
+    distance[missing] = np.nan
+    columns['Distance'] = distance
+
+    for column in _GATHERED_COLUMNS:
+        if column in merged.columns:
+            values = merged[column].to_numpy(dtype=COLUMN_DTYPES[column], na_value=np.nan)
+            columns[column] = values[rows]
+
+    columns = {c: columns[c].astype(COLUMN_DTYPES[c], copy=False) for c in COLUMN_DTYPES if c in columns}
+    driver = laps['Driver'].to_numpy()[keep]
+    lap_numbers = laps['LapNumber'].to_numpy()[keep]
+    return RaggedTelemetry(driver, lap_numbers, offsets, columns)
+
+
+def extract_driver_laps(session, driver, laps=None):
+    """Extract every lap of one driver (or the given subset of their laps) in one pass."""
+    if laps is None:
+        laps = session.laps.pick_drivers(driver)
+    if laps.empty:
+        return RaggedTelemetry([], [], [0], {})
+    driver_number = str(laps['DriverNumber'].iloc[0])
+    return cut_laps(merged_driver_data(session, driver_number), laps)
+
+
+def extract_session_laps(session, drivers=None):
+    """Extract every lap of every driver, merging car and position data once per driver."""
+    if drivers is None:
+        drivers = sorted(session.laps['Driver'].dropna().unique().tolist())
+    return RaggedTelemetry.concatenate([extract_driver_laps(session, driver) for driver in drivers])
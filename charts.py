@@ -0,0 +1,668 @@
+"""Plotly figure builders for the driver comparison.
+
+Styling comes from the shared theme template; builders only add data traces
+and the few layout settings specific to each chart.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+from delta import ADAPTIVE_UNIFORM_WEIGHT, DEFAULT_RESOLUTION, compute_delta
+from downsample import DEFAULT_POINT_BUDGET, downsample_indices
+from theme import (ANNOTATION_BOX, CHART_TEMPLATE, COMPOUND_COLORS, DRIVER1_FALLBACK,
+                   DRIVER2_FALLBACK, UNKNOWN_COMPOUND_COLOR, team_palette)
+
+
+def create_speed_comparison(driver1_data, driver2_data, driver1_name, driver2_name, max_points=DEFAULT_POINT_BUDGET):
+    """Create professional speed comparison chart."""
+    tel1 = driver1_data['telemetry']
+    tel2 = driver2_data['telemetry']
+    idx1 = downsample_indices(tel1['Distance'], tel1['Speed'], max_points)
+    idx2 = downsample_indices(tel2['Distance'], tel2['Speed'], max_points)
+
+    color1 = team_palette(driver1_data['team'], DRIVER1_FALLBACK)['line']
+    color2 = team_palette(driver2_data['team'], DRIVER2_FALLBACK)['line']
+
+    hovertemplate = '<b>%{fullData.name}</b><br>Distance: %{x:.0f}m<br>Speed: %{y:.0f} km/h<extra></extra>'
+
+    return go.Figure(
+        data=[
+            dict(
+                type='scatter',
+                x=tel1['Distance'][idx1],
+                y=tel1['Speed'][idx1],
+                mode='lines',
+                name=f"{driver1_name} (Lap {driver1_data['lap_number']})",
+                line=dict(color=color1, width=3),
+                hovertemplate=hovertemplate
+            ),
+            dict(
+                type='scatter',
+                x=tel2['Distance'][idx2],
+                y=tel2['Speed'][idx2],
+                mode='lines',
+                name=f"{driver2_name} (Lap {driver2_data['lap_number']})",
+                line=dict(color=color2, width=3),
+                hovertemplate=hovertemplate
+            ),
+        ],
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis_title="Distance (m)",
+            yaxis_title="Speed (km/h)",
+            height=500
+        )
+    )
+
+
+def create_track_map(driver1_data, driver2_data, driver1_name, driver2_name, max_points=DEFAULT_POINT_BUDGET):
+    """Create professional track map visualization."""
+    tel1 = driver1_data['telemetry']
+    tel2 = driver2_data['telemetry']
+    idx1 = downsample_indices(tel1['X'], tel1['Y'], max_points, extrema=tel1['Speed'])
+    idx2 = downsample_indices(tel2['X'], tel2['Y'], max_points, extrema=tel2['Speed'])
+
+    color1 = team_palette(driver1_data['team'], DRIVER1_FALLBACK)['line']
+    color2 = team_palette(driver2_data['team'], DRIVER2_FALLBACK)['line']
+
+    hovertemplate = '<b>%{fullData.name}</b><br>Speed: %{customdata:.0f} km/h<extra></extra>'
+
+    return go.Figure(
+        data=[
+            # Driver 2 racing line - thick, dashed, semi-transparent background
+            dict(
+                type='scatter',
+                x=tel2['X'][idx2],
+                y=tel2['Y'][idx2],
+                mode='lines',
+                name=f"{driver2_name} (Lap {driver2_data['lap_number']})",
+                line=dict(color=color2, width=8, dash='dash'),
+                opacity=0.5,
+                customdata=tel2['Speed'][idx2],
+                hovertemplate=hovertemplate
+            ),
+            # Driver 1 racing line - solid, bright, on top
+            dict(
+                type='scatter',
+                x=tel1['X'][idx1],
+                y=tel1['Y'][idx1],
+                mode='lines',
+                name=f"{driver1_name} (Lap {driver1_data['lap_number']})",
+                line=dict(color=color1, width=3),
+                customdata=tel1['Speed'][idx1],
+                hovertemplate=hovertemplate
+            ),
+        ],
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis_title="X Position (m)",
+            yaxis_title="Y Position (m)",
+            yaxis=dict(scaleanchor="x", scaleratio=1),
+            hovermode='closest',
+            height=600
+        )
+    )
+
+
+def create_delta_time_plot(driver1_data, driver2_data, driver1_name, driver2_name, resolution=DEFAULT_RESOLUTION,
+                           uniform_weight=ADAPTIVE_UNIFORM_WEIGHT):
+    """Create intuitive delta time plot with color coding."""
+    gap = compute_delta(driver1_data['telemetry'], driver2_data['telemetry'], resolution,
+                        uniform_weight=uniform_weight)
+
+    palette1 = team_palette(driver1_data['team'], DRIVER1_FALLBACK)
+    palette2 = team_palette(driver2_data['team'], DRIVER2_FALLBACK)
+
+    return go.Figure(
+        data=[
+            dict(
+                type='scatter',
+                x=gap['distance'],
+                y=gap['driver2_ahead'],
+                mode='lines',
+                name=f'{driver2_name} faster here',
+                line=dict(color=palette2['line'], width=0),
+                fill='tozeroy',
+                fillcolor=palette2['fill'],
+                hovertemplate=f'<b>{driver2_name} gaining</b><br>Distance: %{{x:.0f}}m<br>Advantage: %{{y:.3f}}s<extra></extra>'
+            ),
+            dict(
+                type='scatter',
+                x=gap['distance'],
+                y=gap['driver1_ahead'],
+                mode='lines',
+                name=f'{driver1_name} faster here',
+                line=dict(color=palette1['line'], width=0),
+                fill='tozeroy',
+                fillcolor=palette1['fill'],
+                hovertemplate=f'<b>{driver1_name} gaining</b><br>Distance: %{{x:.0f}}m<br>Advantage: %{{y:.3f}}s<extra></extra>'
+            ),
+            dict(
+                type='scatter',
+                x=gap['distance'],
+                y=gap['delta'],
+                mode='lines',
+                name='Gap between drivers',
+                line=dict(color='#ffffff', width=2),
+                hovertemplate='Distance: %{x:.0f}m<br>Time gap: %{y:.3f}s<extra></extra>',
+                showlegend=False
+            ),
+        ],
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis_title="Distance around the lap (meters)",
+            yaxis_title="Time Gap (seconds)",
+            height=600,
+            legend_font_size=11,
+            yaxis=dict(zeroline=True, zerolinecolor='#9b9b9b', zerolinewidth=2),
+            shapes=[
+                dict(
+                    type='line',
+                    xref='x domain', x0=0, x1=1,
+                    yref='y', y0=0, y1=0,
+                    line=dict(color="#9b9b9b", width=2, dash="solid")
+                )
+            ],
+            annotations=[
+                dict(
+                    text="Even",
+                    xref='x domain', x=1,
+                    yref='y', y=0,
+                    showarrow=False,
+                    xanchor='left',
+                    yanchor='middle',
+                    font=dict(size=10, color="#9b9b9b")
+                ),
+                dict(
+                    ANNOTATION_BOX,
+                    text=f"↑ {driver2_name} ahead",
+                    x=0.98, y=0.98,
+                    font=dict(size=11, color=palette2['line']),
+                    xanchor='right'
+                ),
+                dict(
+                    ANNOTATION_BOX,
+                    text=f"↓ {driver1_name} ahead",
+                    x=0.98, y=0.02,
+                    font=dict(size=11, color=palette1['line']),
+                    xanchor='right'
+                )
+            ]
+        )
+    )
+
+
+def create_multilap_delta_plot(multilap_data):
+    """Create delta-to-reference plot for many laps with a consistency band."""
+    summary = multilap_data['summary']
+    distance = summary['distance'].astype(np.float32)
+    palette = team_palette(multilap_data['team'], DRIVER1_FALLBACK)
+    reference_lap = multilap_data['lap_numbers'][multilap_data['reference']]
+
+    lap_traces = [
+        dict(
+            type='scatter',
+            x=distance,
+            y=delta.astype(np.float32),
+            mode='lines',
+            name=f"Lap {lap_number}",
+            line=dict(color=palette['line'], width=1),
+            opacity=0.35,
+            showlegend=False,
+            hovertemplate='<b>%{fullData.name}</b><br>Distance: %{x:.0f}m<br>Gap: %{y:+.3f}s<extra></extra>'
+        )
+        for lap_number, delta in zip(multilap_data['lap_numbers'], summary['delta'])
+    ]
+
+    band = [
+        dict(
+            type='scatter',
+            x=distance,
+            y=(summary['delta_mean'] - summary['delta_std']).astype(np.float32),
+            mode='lines',
+            line=dict(width=0),
+            hoverinfo='skip',
+            showlegend=False
+        ),
+        dict(
+            type='scatter',
+            x=distance,
+            y=(summary['delta_mean'] + summary['delta_std']).astype(np.float32),
+            mode='lines',
+            name='Mean ± 1σ',
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor=palette['fill'],
+            hoverinfo='skip'
+        ),
+        dict(
+            type='scatter',
+            x=distance,
+            y=summary['delta_mean'].astype(np.float32),
+            mode='lines',
+            name='Mean gap',
+            line=dict(color='#ffffff', width=2, dash='dash'),
+            hovertemplate='Distance: %{x:.0f}m<br>Mean gap: %{y:+.3f}s<extra></extra>'
+        ),
+    ]
+
+    return go.Figure(
+        data=lap_traces + band,
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis_title="Distance around the lap (meters)",
+            yaxis_title=f"Gap to Lap {reference_lap} (seconds)",
+            yaxis=dict(zeroline=True, zerolinecolor='#9b9b9b', zerolinewidth=2),
+            hovermode='closest',
+            height=550
+        )
+    )
+
+
+def create_speed_band_plot(multilap_data):
+    """Create speed envelope plot showing lap-to-lap spread against the reference lap."""
+    summary = multilap_data['summary']
+    distance = summary['distance'].astype(np.float32)
+    palette = team_palette(multilap_data['team'], DRIVER1_FALLBACK)
+    reference_lap = multilap_data['lap_numbers'][multilap_data['reference']]
+
+    return go.Figure(
+        data=[
+            dict(
+                type='scatter',
+                x=distance,
+                y=summary['speed_min'].astype(np.float32),
+                mode='lines',
+                line=dict(width=0),
+                hoverinfo='skip',
+                showlegend=False
+            ),
+            dict(
+                type='scatter',
+                x=distance,
+                y=summary['speed_max'].astype(np.float32),
+                mode='lines',
+                name='Min-max range',
+                line=dict(width=0),
+                fill='tonexty',
+                fillcolor=palette['fill'],
+                hoverinfo='skip'
+            ),
+            dict(
+                type='scatter',
+                x=distance,
+                y=summary['speed_mean'].astype(np.float32),
+                mode='lines',
+                name='Mean speed',
+                line=dict(color='#ffffff', width=2, dash='dash'),
+                hovertemplate='Mean: %{y:.0f} km/h<extra></extra>'
+            ),
+            dict(
+                type='scatter',
+                x=distance,
+                y=summary['speed_reference'].astype(np.float32),
+                mode='lines',
+                name=f"Lap {reference_lap} (reference)",
+                line=dict(color=palette['line'], width=2),
+                hovertemplate='<b>%{fullData.name}</b><br>Distance: %{x:.0f}m<br>Speed: %{y:.0f} km/h<extra></extra>'
+            ),
+        ],
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis_title="Distance (m)",
+            yaxis_title="Speed (km/h)",
+            height=500
+        )
+    )
+
+
+def create_field_gap_heatmap(field_data):
+    """Create all-pairs fastest lap gap heatmap for the whole field."""
+    drivers = field_data['drivers']
+    comparison = field_data['comparison']
+    minisectors = comparison['sector_times'].shape[1]
+
+    return go.Figure(
+        data=[
+            dict(
+                type='heatmap',
+                x=drivers,
+                y=drivers,
+                z=comparison['pairwise_gap'].astype(np.float32),
+                customdata=comparison['pairwise_sectors_won'],
+                zmid=0,
+                colorscale=[[0.0, '#66bb6a'], [0.5, '#15151e'], [1.0, '#E10600']],
+                colorbar=dict(title=dict(text='Gap (s)', side='right')),
+                hovertemplate=f'<b>%{{y}}</b> vs %{{x}}<br>Gap: %{{z:+.3f}}s<br>Minisectors won: %{{customdata}}/{minisectors}<extra></extra>'
+            )
+        ],
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis=dict(title="Compared with", showgrid=False, side='top'),
+            yaxis=dict(title="Driver", showgrid=False, autorange='reversed'),
+            hovermode='closest',
+            height=650
+        )
+    )
+
+
+def create_minisector_heatmap(field_data):
+    """Create heatmap of each driver's time lost to the fastest driver in every minisector."""
+    drivers = field_data['drivers']
+    comparison = field_data['comparison']
+    bounds = comparison['sector_bounds']
+    labels = [f"{i + 1}" for i in range(len(bounds) - 1)]
+    starts = bounds[:-1].astype(np.float32)
+
+    return go.Figure(
+        data=[
+            dict(
+                type='heatmap',
+                x=labels,
+                y=drivers,
+                z=comparison['sector_gap'].astype(np.float32),
+                customdata=np.broadcast_to(starts, comparison['sector_gap'].shape),
+                zmin=0,
+                colorscale=[[0.0, '#66bb6a'], [0.1, '#1f1f28'], [1.0, '#E10600']],
+                colorbar=dict(title=dict(text='Lost (s)', side='right')),
+                hovertemplate='<b>%{y}</b> · minisector %{x} (from %{customdata:.0f}m)<br>Lost to fastest: %{z:.3f}s<extra></extra>'
+            )
+        ],
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis=dict(title="Minisector", showgrid=False),
+            yaxis=dict(title="Driver", showgrid=False, autorange='reversed'),
+            hovermode='closest',
+            height=650
+        )
+    )
+
+
+def create_segment_delta_plot(driver1_data, driver2_data, driver1_name, driver2_name, segments, resolution=DEFAULT_RESOLUTION,
+                              uniform_weight=ADAPTIVE_UNIFORM_WEIGHT):
+    """Create corner-by-corner time gain/loss bars between two drivers."""
+    gap = compute_delta(driver1_data['telemetry'], driver2_data['telemetry'], resolution,
+                        uniform_weight=uniform_weight)
+    gains = segments.segment_deltas(gap['distance'], gap['delta']).astype(np.float32)
+
+    palette1 = team_palette(driver1_data['team'], DRIVER1_FALLBACK)
+    palette2 = team_palette(driver2_data['team'], DRIVER2_FALLBACK)
+    colors = np.where(gains > 0, palette2['line'], palette1['line'])
+    leaders = np.where(gains > 0, driver2_name, driver1_name)
+
+    return go.Figure(
+        data=[
+            dict(
+                type='bar',
+                x=segments.labels,
+                y=gains,
+                customdata=leaders,
+                marker=dict(color=colors.tolist()),
+                hovertemplate='<b>%{x}</b><br>%{customdata} gains %{y:.3f}s<extra></extra>'
+            )
+        ],
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis=dict(title="Corner", showgrid=False),
+            yaxis=dict(title="Time gained (seconds)", zeroline=True, zerolinecolor='#9b9b9b'),
+            hovermode='closest',
+            showlegend=False,
+            height=400,
+            annotations=[
+                dict(
+                    ANNOTATION_BOX,
+                    text=f"↑ {driver2_name} gains",
+                    x=0.98, y=0.98,
+                    font=dict(size=11, color=palette2['line']),
+                    xanchor='right'
+                ),
+                dict(
+                    ANNOTATION_BOX,
+                    text=f"↓ {driver1_name} gains",
+                    x=0.98, y=0.02,
+                    font=dict(size=11, color=palette1['line']),
+                    xanchor='right',
+                    yanchor='bottom'
+                )
+            ]
+        )
+    )
+
+
+def create_race_pace_plot(pace_data):
+    """Create box plot of each driver's fuel-corrected clean laps, fastest median first."""
+    clean = pace_data['laps'][pace_data['laps']['Excluded'] == '']
+    by_driver = clean.groupby('Driver').indices
+
+    traces = []
+    for driver, team in zip(pace_data['drivers']['Driver'], pace_data['drivers']['Team']):
+        laps = clean.iloc[by_driver[driver]]
+        palette = team_palette(team, DRIVER1_FALLBACK)
+        traces.append(dict(
+            type='box',
+            y=laps['FuelCorrected'].to_numpy(dtype=np.float32),
+            name=driver,
+            customdata=laps['LapNumber'].to_numpy(dtype=np.int16),
+            marker=dict(color=palette['line'], size=4),
+            line=dict(color=palette['line'], width=1.5),
+            fillcolor=palette['fill'],
+            boxpoints='all',
+            jitter=0.4,
+            pointpos=0,
+            showlegend=False,
+            hovertemplate='<b>%{x}</b> · Lap %{customdata}<br>Corrected: %{y:.3f}s<extra></extra>'
+        ))
+
+    return go.Figure(
+        data=traces,
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis=dict(title="Driver", showgrid=False),
+            yaxis_title="Fuel-corrected lap time (seconds)",
+            hovermode='closest',
+            height=550
+        )
+    )
+
+
+def create_stint_pace_plot(pace_data):
+    """Create lap-by-lap fuel-corrected pace per driver, with markers colored by compound."""
+    clean = pace_data['laps'][pace_data['laps']['Excluded'] == '']
+    compound_colors = clean['Compound'].map(COMPOUND_COLORS).fillna(UNKNOWN_COMPOUND_COLOR)
+    by_driver = clean.groupby('Driver').indices
+
+    traces = []
+    for driver, team in zip(pace_data['drivers']['Driver'], pace_data['drivers']['Team']):
+        rows = by_driver[driver]
+        laps = clean.iloc[rows]
+        palette = team_palette(team, DRIVER1_FALLBACK)
+        traces.append(dict(
+            type='scatter',
+            x=laps['LapNumber'].to_numpy(dtype=np.int16),
+            y=laps['FuelCorrected'].to_numpy(dtype=np.float32),
+            mode='lines+markers',
+            name=driver,
+            customdata=laps['Compound'].to_numpy(),
+            line=dict(color=palette['line'], width=1.5),
+            marker=dict(color=compound_colors.to_numpy()[rows].tolist(), size=6,
+                        line=dict(color=palette['line'], width=1)),
+            hovertemplate='<b>%{fullData.name}</b> · Lap %{x}<br>Corrected: %{y:.3f}s<br>%{customdata}<extra></extra>'
+        ))
+
+    return go.Figure(
+        data=traces,
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis_title="Lap",
+            yaxis_title="Fuel-corrected lap time (seconds)",
+            hovermode='closest',
+            height=550
+        )
+    )
+
+
+def _compound_order(compounds):
+    """Known compounds softest first, then anything else in the order given."""
+    known = [c for c in COMPOUND_COLORS if c in set(compounds)]
+    return known + [c for c in dict.fromkeys(compounds) if c not in COMPOUND_COLORS]
+
+
+def create_degradation_plot(degradation_data):
+    """Create time lost against tyre age for every fitted stint, grouped by compound."""
+    laps = degradation_data['laps']
+    stints = degradation_data['stints']
+
+    traces = []
+    for compound in _compound_order(stints['Compound'].tolist()):
+        color = COMPOUND_COLORS.get(compound, UNKNOWN_COMPOUND_COLOR)
+        compound_laps = laps[laps['Compound'] == compound]
+        compound_stints = stints[stints['Compound'] == compound]
+
+        # Every stint's fitted line in one trace, separated by NaN gaps
+        ages = compound_stints[['FirstAge', 'LastAge']].to_numpy()
+        lost = ages * compound_stints['Rate'].to_numpy()[:, None]
+        gap = np.full((len(ages), 1), np.nan)
+        labels = np.repeat((compound_stints['Driver'] + ' · stint '
+                            + compound_stints['Stint'].astype(int).astype(str)).to_numpy(), 3)
+
+        traces.append(dict(
+            type='scatter',
+            x=compound_laps['TyreLife'].to_numpy(dtype=np.float32),
+            y=compound_laps['TimeLost'].to_numpy(dtype=np.float32),
+            customdata=compound_laps['Driver'].to_numpy(),
+            mode='markers',
+            name=compound.title(),
+            legendgroup=compound,
+            marker=dict(color=color, size=5, opacity=0.4),
+            hovertemplate='<b>%{customdata}</b> · tyre age %{x:.0f}<br>Lost: %{y:+.3f}s<extra></extra>'
+        ))
+        traces.append(dict(
+            type='scatter',
+            x=np.hstack([ages, gap]).ravel().astype(np.float32),
+            y=np.hstack([lost, gap]).ravel().astype(np.float32),
+            customdata=labels,
+            mode='lines',
+            name=f"{compound.title()} fits",
+            legendgroup=compound,
+            showlegend=False,
+            line=dict(color=color, width=1.5),
+            opacity=0.8,
+            hovertemplate='<b>%{customdata}</b><br>Tyre age %{x:.0f}: %{y:+.3f}s<extra></extra>'
+        ))
+
+    return go.Figure(
+        data=traces,
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis_title="Tyre age (laps)",
+            yaxis_title="Time lost to the stint's fitted base (seconds)",
+            hovermode='closest',
+            height=550
+        )
+    )
+
+
+def create_degradation_rates_plot(degradation_data):
+    """Create grouped bars of each team's lap-weighted degradation rate per compound."""
+    teams = degradation_data['teams']
+    team_order = teams.groupby('Team')['Rate'].mean().sort_values().index.tolist()
+
+    traces = []
+    for compound in _compound_order(degradation_data['compounds']['Compound'].tolist()):
+        rates = teams[teams['Compound'] == compound].set_index('Team').reindex(team_order)
+        traces.append(dict(
+            type='bar',
+            x=team_order,
+            y=rates['Rate'].to_numpy(dtype=np.float32),
+            customdata=rates[['Stints', 'Laps']].to_numpy(),
+            name=compound.title(),
+            marker=dict(color=COMPOUND_COLORS.get(compound, UNKNOWN_COMPOUND_COLOR)),
+            hovertemplate=('<b>%{x}</b> · %{fullData.name}<br>%{y:.3f}s per lap of tyre age'
+                           '<br>%{customdata[0]} stints, %{customdata[1]} laps<extra></extra>')
+        ))
+
+    return go.Figure(
+        data=traces,
+        layout=dict(
+            template=CHART_TEMPLATE,
+            barmode='group',
+            xaxis=dict(title="Team", showgrid=False),
+            yaxis_title="Degradation (seconds per lap)",
+            hovermode='closest',
+            height=450
+        )
+    )
+
+
+def create_race_trace_plot(trace_data):
+    """Create every driver's gap to the leader lap by lap, in finishing order."""
+    trace = trace_data['trace']
+    column = {driver: i for i, driver in enumerate(trace.drivers)}
+    lap_numbers = trace.lap_numbers.astype(np.int16)
+
+    traces = []
+    seen_teams = set()
+    for driver, team in trace_data['classification'][['Driver', 'Team']].itertuples(index=False):
+        j = column[driver]
+        palette = team_palette(team, DRIVER1_FALLBACK)
+        # Second driver of a team gets a dashed line in the same color
+        dash = 'dash' if team in seen_teams else 'solid'
+        seen_teams.add(team)
+        traces.append(dict(
+            type='scatter',
+            x=lap_numbers,
+            y=trace.gap[:, j].astype(np.float32),
+            customdata=trace.laps_down[:, j],
+            mode='lines',
+            name=driver,
+            line=dict(color=palette['line'], width=2, dash=dash),
+            hovertemplate='<b>%{fullData.name}</b> · Lap %{x}<br>Gap: %{y:.3f}s<br>Laps down: %{customdata}<extra></extra>'
+        ))
+
+    return go.Figure(
+        data=traces,
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis_title="Lap",
+            yaxis=dict(title="Gap to leader (seconds)", autorange='reversed'),
+            hovermode='closest',
+            height=600
+        )
+    )
+
+
+def create_theoretical_best_plot(theoretical_data):
+    """Create each driver's fastest and theoretical best lap as gaps to the field's theoretical best."""
+    drivers = theoretical_data['drivers']
+    reference = theoretical_data['field_theoretical']
+    palettes = [team_palette(team, DRIVER1_FALLBACK) for team in drivers['Team']]
+
+    return go.Figure(
+        data=[
+            dict(
+                type='bar',
+                x=drivers['Driver'],
+                y=(drivers['Fastest'] - reference).to_numpy(dtype=np.float32),
+                customdata=drivers['FastestLap'].to_numpy(),
+                name='Fastest lap',
+                marker=dict(color=[p['fill'] for p in palettes], line=dict(color=[p['line'] for p in palettes], width=1.5)),
+                hovertemplate='<b>%{x}</b> · Lap %{customdata}<br>Fastest: +%{y:.3f}s<extra></extra>'
+            ),
+            dict(
+                type='scatter',
+                x=drivers['Driver'],
+                y=(drivers['Theoretical'] - reference).to_numpy(dtype=np.float32),
+                customdata=drivers['Gain'].to_numpy(dtype=np.float32),
+                mode='markers',
+                name='Theoretical best',
+                marker=dict(color='#ffffff', size=10, symbol='diamond'),
+                hovertemplate='<b>%{x}</b><br>Theoretical: +%{y:.3f}s<br>Left on track: %{customdata:.3f}s<extra></extra>'
+            ),
+        ],
+        layout=dict(
+            template=CHART_TEMPLATE,
+            xaxis=dict(title="Driver", showgrid=False),
+            yaxis_title="Gap to the field's theoretical best (seconds)",
+            hovermode='closest',
+            height=500
+        )
+    )
@@ -0,0 +1,101 @@
+"""Memory-mapped telemetry columns for one archived session.
+
+Every lap of every driver is concatenated into one .npy file per channel, and
+a small offset index maps (driver, lap number) to its [start, stop) rows.
+Files are opened with np.load(mmap_mode='r'), so a lap is a zero-copy slice
+of the mapping and worker processes on one host share the OS page cache
+instead of each holding its own copy.
+"""
+import json
+import os
+import threading
+
+import numpy as np
+
+from telemetry_store import COLUMN_DTYPES, LapTelemetry
+
+INDEX_FILE = 'index.json'
+
+
+def write_columns(directory, laps):
+    """Write laps as memory-mappable column files plus their offset index.
+
+    `laps` is an iterable of (driver, lap_number, telemetry) where telemetry
+    maps channel names to equal-length arrays. Channels missing from a lap
+    are filled with NaN. The index is written last, so a partially written
+    store is never opened.
+    """
+    laps = list(laps)
+    os.makedirs(directory, exist_ok=True)
+    columns = [c for c in COLUMN_DTYPES if any(c in telemetry for _, _, telemetry in laps)]
+
+    lengths = np.array([len(telemetry['Distance']) for _, _, telemetry in laps], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+    for column in columns:
+        values = np.full(offsets[-1], np.nan, dtype=COLUMN_DTYPES[column])
+        for (_, _, telemetry), start, stop in zip(laps, offsets[:-1], offsets[1:]):
+            if column in telemetry:
+                values[start:stop] = telemetry[column]
+        path = os.path.join(directory, f"{column}.npy")
+        tmp_path = f"{path}.tmp.npy"
+        np.save(tmp_path, values)
+        os.replace(tmp_path, path)
+
+    index = {'columns': columns, 'laps': {}}
+    for (driver, lap_number, _), start, stop in zip(laps, offsets[:-1], offsets[1:]):
+        index['laps'].setdefault(driver, {})[str(lap_number)] = [int(start), int(stop)]
+
+    tmp_path = os.path.join(directory, f"{INDEX_FILE}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f)
+    os.replace(tmp_path, os.path.join(directory, INDEX_FILE))
+
+
+def has_columns(directory):
+    return os.path.exists(os.path.join(directory, INDEX_FILE))
+
+
+class ColumnStore:
+    """Read-only, memory-mapped telemetry columns with a (driver, lap) offset index."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE)) as f:
+            index = json.load(f)
+        self.columns = tuple(index['columns'])
+        self._offsets = {
+            (driver, int(lap_number)): (start, stop)
+            for driver, laps in index['laps'].items()
+            for lap_number, (start, stop) in laps.items()
+        }
+        self._arrays = None
+        self._lock = threading.Lock()
+
+    def _mapped(self):
+        # Mapped on first read; the mapping itself costs no memory until pages are touched
+        if self._arrays is None:
+            with self._lock:
+                if self._arrays is None:
+                    self._arrays = {
+                        column: np.load(os.path.join(self.directory, f"{column}.npy"), mmap_mode='r')
+                        for column in self.columns
+                    }
+        return self._arrays
+
+    def __contains__(self, key):
+        return key in self._offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def lap(self, driver, lap_number):
+        """Return a lap's telemetry as views into the mapped columns, or None if it isn't stored."""
+        bounds = self._offsets.get((driver, int(lap_number)))
+        if bounds is None:
+            return None
+        start, stop = bounds
+        # np.asarray drops the memmap subclass but keeps the view, so nothing is copied
+        return LapTelemetry({
+            column: np.asarray(values[start:stop]) for column, values in self._mapped().items()
+        })
@@ -0,0 +1,81 @@
+"""Tyre degradation: a lap time vs tyre age line fitted to every stint at once.
+
+Each stint's design matrix is [1, tyre age] over its clean, fuel-corrected
+laps. Rather than fitting stints one by one, the 2x2 normal equations of all
+of them are accumulated with np.bincount over a stint index and solved as one
+stacked system, so a whole race fits in a single np.linalg.solve call.
+"""
+import numpy as np
+
+# Fewest clean laps a stint needs for its fit to mean anything
+MIN_STINT_LAPS = 5
+
+
+def fit_stints(pace, min_laps=MIN_STINT_LAPS, compounds=None):
+    """Fit lap time = base + rate * tyre age to every stint of the race pace laps.
+
+    `pace` is the output of race_pace.clean_laps. Returns (stints, laps):
+    stints has one row per fitted stint with Base (s), Rate (s per lap of tyre
+    age) and R2; laps are the laps behind the fits, with TimeLost, the lap's
+    time relative to its stint's fitted base.
+    """
+    clean = pace[(pace['Excluded'] == '') & pace['TyreLife'].notna() & pace['Stint'].notna()]
+    if compounds is not None:
+        clean = clean[clean['Compound'].isin(compounds)]
+
+    grouped = clean.groupby(['Driver', 'Stint'], sort=True)
+    stint = grouped.ngroup().to_numpy()
+    stints = grouped.agg(
+        Team=('Team', 'first'),
+        Compound=('Compound', 'first'),
+        Laps=('LapNumber', 'size'),
+        FirstAge=('TyreLife', 'min'),
+        LastAge=('TyreLife', 'max'),
+    ).reset_index()
+
+    x = clean['TyreLife'].to_numpy(dtype=np.float64)
+    y = clean['FuelCorrected'].to_numpy(dtype=np.float64)
+    count = len(stints)
+    n = np.bincount(stint, minlength=count).astype(np.float64)
+    sx = np.bincount(stint, x, count)
+    sy = np.bincount(stint, y, count)
+    sxx = np.bincount(stint, x * x, count)
+    sxy = np.bincount(stint, x * y, count)
+    syy = np.bincount(stint, y * y, count)
+
+    # A line needs enough laps and more than one tyre age
+    fitted = (n >= min_laps) & (n * sxx - sx * sx > 0)
+
+    # Normal equations [[n, sx], [sx, sxx]] @ [base, rate] = [sy, sxy], one per stint
+    lhs = np.stack([np.stack([n, sx], axis=-1), np.stack([sx, sxx], axis=-1)], axis=1)[fitted]
+    rhs = np.stack([sy, sxy], axis=-1)[fitted]
+    coefficients = np.full((count, 2), np.nan)
+    if len(lhs):
+        coefficients[fitted] = np.linalg.solve(lhs, rhs[..., None])[..., 0]
+    base, rate = coefficients[:, 0], coefficients[:, 1]
+
+    time_lost = y - base[stint]
+    residual = np.bincount(stint, (time_lost - rate[stint] * x) ** 2, count)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total = syy - sy * sy / n
+        r2 = np.where(total > 0, 1 - residual / total, np.nan)
+
+    stints['Base'] = base
+    stints['Rate'] = rate
+    stints['R2'] = r2
+
+    keep = fitted[stint]
+    laps = clean[keep].assign(TimeLost=time_lost[keep])
+    return stints[fitted].reset_index(drop=True), laps
+
+
+def degradation_rates(stints, by):
+    """Lap-weighted mean degradation rate per group, e.g. by='Compound' or ['Team', 'Compound']."""
+    rates = stints.assign(Weighted=stints['Rate'] * stints['Laps']).groupby(by).agg(
+        Stints=('Rate', 'size'),
+        Laps=('Laps', 'sum'),
+        Weighted=('Weighted', 'sum'),
+        Median=('Rate', 'median'),
+    )
+    rates['Rate'] = rates.pop('Weighted') / rates['Laps']
+    return rates.reset_index()
@@ -0,0 +1,85 @@
+"""Shape-preserving downsampling of telemetry traces before they are plotted.
+
+Uses Largest-Triangle-Three-Buckets (LTTB): the trace is split into equal-size
+buckets and from each bucket the point forming the largest triangle with its
+neighbours is kept, which preserves peaks and troughs far better than striding.
+"""
+import numpy as np
+
+# Default maximum number of points per plotted trace
+DEFAULT_POINT_BUDGET = 500
+
+# Cap on refinement passes over all buckets; a lap at the default budget settles in about five
+MAX_PASSES = 8
+
+
+def _triangle_choice(x, y, rows, valid, anchor_x, anchor_y, next_x, next_y):
+    """Return, per bucket, the index of the point forming the largest triangle."""
+    area = np.abs(
+        (anchor_x - next_x)[:, None] * (y[rows] - anchor_y[:, None])
+        - (anchor_x[:, None] - x[rows]) * (next_y - anchor_y)[:, None]
+    )
+    area = np.where(valid, np.nan_to_num(area, nan=-1.0), -2.0)
+    return rows[np.arange(len(rows)), np.argmax(area, axis=1)]
+
+
+def lttb_indices(x, y, max_points=DEFAULT_POINT_BUDGET):
+    """Return sorted indices of the points LTTB keeps, always including both ends.
+
+    Points are bucketed by position in the sequence, so this works for paths
+    whose x is not monotonic (e.g. a track map in X/Y).
+
+    All buckets are scored at once instead of one after another. The first
+    pass anchors each bucket on the previous bucket's mean; every further pass
+    anchors it on the point the previous pass kept there. Once a pass changes
+    nothing the result is exactly sequential LTTB; traces that haven't settled
+    after MAX_PASSES keep the last pass's choice.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    buckets = max_points - 2
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.intp)
+    counts = np.diff(edges)
+
+    # Mean of each bucket; the last bucket's "next" point is the final sample
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    # Buckets padded to a common width; padding repeats a real index and is masked out
+    offsets = np.arange(counts.max())
+    valid = offsets < counts[:, None]
+    rows = np.minimum(edges[:-1, None] + offsets, n - 2)
+
+    prev_x = np.append(x[0], avg_x[:-1])
+    prev_y = np.append(y[0], avg_y[:-1])
+    chosen = _triangle_choice(x, y, rows, valid, prev_x, prev_y, next_x, next_y)
+    for _ in range(MAX_PASSES - 1):
+        anchor = np.append(0, chosen[:-1])
+        refined = _triangle_choice(x, y, rows, valid, x[anchor], y[anchor], next_x, next_y)
+        if np.array_equal(refined, chosen):
+            break
+        chosen = refined
+    return np.concatenate([[0], chosen, [n - 1]])
+
+
+def downsample_indices(x, y, max_points=DEFAULT_POINT_BUDGET, extrema=None):
+    """Return LTTB indices for (x, y), plus the minimum and maximum of `extrema`.
+
+    `extrema` defaults to y, so the top speed and slowest corner of a speed
+    trace survive regardless of bucketing. The result may therefore hold up to
+    two points more than max_points.
+    """
+    keep = lttb_indices(x, y, max_points)
+    if len(keep) == len(x):
+        return keep
+
+    values = np.asarray(y if extrema is None else extrema, dtype=np.float64)
+    if np.isnan(values).all():
+        return keep
+    return np.union1d(keep, [np.nanargmin(values), np.nanargmax(values)])
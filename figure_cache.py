@@ -0,0 +1,71 @@
+"""Memoized Plotly figures so reruns that don't change the comparison skip rebuilding them.
+
+Figures are keyed by everything that affects their content: the session and the
+data source it was loaded from, the driver pair and their lap numbers, the chart
+type and its sample budget.
+"""
+import threading
+from collections import OrderedDict
+
+from metrics import metrics, span
+
+DEFAULT_MAX_FIGURES = 64
+
+
+class FigureCache:
+    """Bounded LRU cache of built Plotly figures."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_FIGURES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """Return the cached figure for key, calling build() to create it on a miss."""
+        with self._lock:
+            figure = self._entries.get(key)
+            if figure is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return figure
+            self.misses += 1
+
+        # Keys end in (chart type, sample budget), which names the span
+        with span('build_figure', chart=key[-2]):
+            figure = build()
+
+        with self._lock:
+            self._entries[key] = figure
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+
+# Shared by every rerun and user in this process
+figure_cache = FigureCache()
+metrics.register_cache('figures', figure_cache.stats)
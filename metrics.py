@@ -0,0 +1,219 @@
+"""Per-stage timing spans and cache counters for the whole process.
+
+Stages are timed with `span(name)`; each finished span is folded into a
+per-stage summary and logged as one JSON line on the 'f1.metrics' logger.
+Caches register a stats() callable, so their hit/miss counters are read at
+snapshot time rather than duplicated here. Everything is exposed as a dict
+snapshot or as Prometheus text exposition format, which serve_metrics()
+publishes over HTTP at /metrics.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger('f1.metrics')
+
+PROMETHEUS_PREFIX = 'f1'
+
+# Environment variables read by configure_logging() and start_metrics_server()
+LOG_LEVEL_ENV = 'F1_METRICS_LOG_LEVEL'
+PORT_ENV = 'F1_METRICS_PORT'
+
+
+class StageStats:
+    """Running count, total, max and last duration of one stage, in seconds."""
+
+    __slots__ = ('count', 'total', 'max', 'last', 'errors')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.errors = 0
+
+    def add(self, seconds, error=False):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+        self.errors += error
+
+
+class Metrics:
+    """Thread-safe registry of stage timings, counters and cache stats sources."""
+
+    def __init__(self):
+        self._stages = {}
+        self._counters = {}
+        self._sources = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds, error=False, **fields):
+        """Record one finished stage and log it as a structured line."""
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.add(seconds, error)
+        if logger.isEnabledFor(logging.INFO):
+            record = {'event': 'span', 'stage': stage, 'ms': round(seconds * 1e3, 3), 'error': error}
+            record.update(fields)
+            logger.info(json.dumps(record, default=str))
+
+    @contextmanager
+    def span(self, stage, **fields):
+        """Time the enclosed block as one run of stage; extra fields go to the log line."""
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start, error, **fields)
+
+    def timed(self, stage):
+        """Decorator timing every call of a function as one run of stage."""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def increment(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def register_cache(self, name, stats):
+        """Expose a cache's stats() dict (hits, misses, entries, ...) under name."""
+        with self._lock:
+            self._sources[name] = stats
+
+    def snapshot(self):
+        """Return {'stages', 'counters', 'caches'} as plain dicts."""
+        with self._lock:
+            stages = {
+                stage: {
+                    'count': s.count,
+                    'errors': s.errors,
+                    'total_ms': s.total * 1e3,
+                    'mean_ms': s.total / s.count * 1e3 if s.count else 0.0,
+                    'max_ms': s.max * 1e3,
+                    'last_ms': s.last * 1e3,
+                }
+                for stage, s in self._stages.items()
+            }
+            counters = dict(self._counters)
+            sources = dict(self._sources)
+        caches = {name: stats() for name, stats in sources.items()}
+        return {'stages': stages, 'counters': counters, 'caches': caches}
+
+    def prometheus_text(self):
+        """Render the snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        p = PROMETHEUS_PREFIX
+        lines = [
+            f'# HELP {p}_stage_seconds Time spent per pipeline stage.',
+            f'# TYPE {p}_stage_seconds summary',
+        ]
+        for stage, s in sorted(snapshot['stages'].items()):
+            lines.append(f'{p}_stage_seconds_count{{stage="{stage}"}} {s["count"]}')
+            lines.append(f'{p}_stage_seconds_sum{{stage="{stage}"}} {s["total_ms"] / 1e3:.6f}')
+        lines.append(f'# TYPE {p}_stage_seconds_max gauge')
+        for stage, s in sorted(snapshot['stages'].items()):
+            lines.append(f'{p}_stage_seconds_max{{stage="{stage}"}} {s["max_ms"] / 1e3:.6f}')
+        lines.append(f'# TYPE {p}_stage_errors_total counter')
+        for stage, s in sorted(snapshot['stages'].items()):
+            lines.append(f'{p}_stage_errors_total{{stage="{stage}"}} {s["errors"]}')
+
+        for metric, key, kind in (('cache_hits_total', 'hits', 'counter'),
+                                  ('cache_misses_total', 'misses', 'counter'),
+                                  ('cache_evictions_total', 'evictions', 'counter'),
+                                  ('cache_entries', 'entries', 'gauge'),
+                                  ('cache_bytes', 'nbytes', 'gauge')):
+            values = [(name, stats[key]) for name, stats in sorted(snapshot['caches'].items()) if key in stats]
+            if values:
+                lines.append(f'# TYPE {p}_{metric} {kind}')
+                lines.extend(f'{p}_{metric}{{cache="{name}"}} {value}' for name, value in values)
+
+        for counter, value in sorted(snapshot['counters'].items()):
+            lines.append(f'# TYPE {p}_{counter}_total counter')
+            lines.append(f'{p}_{counter}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+
+# Shared by every rerun and user in this process
+metrics = Metrics()
+span = metrics.span
+timed = metrics.timed
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def configure_logging(level=None):
+    """Send span lines to stderr, one JSON object per line, unless a handler is already attached.
+
+    The level defaults to $F1_METRICS_LOG_LEVEL, or INFO. The logger doesn't
+    propagate, so the lines aren't repeated by whatever the root logger does.
+    """
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV, 'INFO').upper()
+    logger.setLevel(level)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = metrics.prometheus_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes every few seconds would drown the span lines
+
+
+def serve_metrics(port, host='0.0.0.0'):
+    """Serve the Prometheus text at http://host:port/metrics from a daemon thread, once per process."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name='metrics-http', daemon=True).start()
+        return _server
+
+
+def start_metrics_server():
+    """Start serve_metrics() on $F1_METRICS_PORT if it is set; return the server or None."""
+    port = os.environ.get(PORT_ENV)
+    if not port:
+        return None
+    try:
+        return serve_metrics(int(port))
+    except (OSError, ValueError) as e:
+        logger.warning(json.dumps({'event': 'metrics_server_failed', 'port': port, 'error': str(e)}))
+        return None
@@ -0,0 +1,82 @@
+"""Background prefetch of every driver's fastest-lap telemetry.
+
+As soon as a session is loaded, worker threads start extracting fastest laps
+into the telemetry cache, quickest drivers first, so that a later Compare
+click is almost always a cache hit.
+"""
+import threading
+import weakref
+
+from workers import prefetch_executor
+
+# Keyed by the store itself: the Archive and Fast-F1 stores of a session share
+# store.key, and a job goes away with the store it prefetches for
+_jobs = weakref.WeakKeyDictionary()
+_jobs_lock = threading.Lock()
+
+
+class PrefetchJob:
+    """Progress of the background prefetch for one session."""
+
+    def __init__(self, drivers):
+        self.drivers = drivers
+        self.total = len(drivers)
+        self.completed = 0
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def _run(self, store, driver):
+        error = None
+        try:
+            lap = store.fastest_lap(driver)
+            if lap is not None:
+                store.lap_telemetry(lap)
+        except Exception as e:
+            error = str(e)
+        with self._lock:
+            if error is not None:
+                self.errors[driver] = error
+            self.completed += 1
+
+    @property
+    def done(self):
+        return self.completed >= self.total
+
+    @property
+    def progress(self):
+        return self.completed / self.total if self.total else 1.0
+
+    @property
+    def failed(self):
+        """Return {driver: error} for the drivers whose prefetch raised so far."""
+        with self._lock:
+            return dict(self.errors)
+
+
+def drivers_by_pace(store):
+    """Return the session's drivers ordered by their fastest lap time, deleted laps aside."""
+    laps = store.laps.dropna(subset=['LapTime'])
+    if 'Deleted' in laps.columns:
+        laps = laps[~laps['Deleted'].fillna(False).astype(bool)]
+    best = laps.groupby('Driver')['LapTime'].min().sort_values()
+    ordered = best.index.tolist()
+    return ordered + [d for d in store.drivers if d not in best.index]
+
+
+def start_prefetch(store):
+    """Queue fastest-lap extraction for every driver in the session, once per store."""
+    with _jobs_lock:
+        job = _jobs.get(store)
+        if job is not None:
+            return job
+        job = _jobs[store] = PrefetchJob(drivers_by_pace(store))
+
+    for driver in job.drivers:
+        prefetch_executor.submit(job._run, store, driver)
+    return job
+
+
+def get_prefetch(store):
+    """Return the prefetch job for a store, or None if none was started."""
+    with _jobs_lock:
+        return _jobs.get(store)
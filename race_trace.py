@@ -0,0 +1,116 @@
+"""Gap-to-leader race trace for the whole field, from the lap table alone.
+
+The lap table is scattered once into dense (laps x drivers) matrices; a
+cumulative sum of lap durations down the lap axis gives every driver's
+elapsed race time at the end of every lap, and the leader's time on each lap
+is the row minimum. Laps a driver never completed, because they retired or
+were lapped, are NaN, so the whole field stays one rectangular array.
+Traces only depend on the session, so they are cached per session.
+"""
+import numpy as np
+import pandas as pd
+
+from metrics import metrics
+from session_cache import SessionCache
+
+
+class RaceTrace:
+    """Elapsed time, gap to the leader and laps down for every driver on every lap.
+
+    Matrices are indexed [lap, driver], with lap i being lap_numbers[i] and
+    driver j being drivers[j]; NaN marks laps a driver did not complete.
+    """
+
+    def __init__(self, drivers, teams, elapsed):
+        self.drivers = drivers
+        self.teams = teams
+        self.elapsed = elapsed
+        self.lap_numbers = np.arange(1, elapsed.shape[0] + 1)
+
+        # The leader is whoever completed each lap first
+        self.leader_elapsed = np.nanmin(elapsed, axis=1)
+        self.gap = elapsed - self.leader_elapsed[:, None]
+
+        # Leader laps completed by the time each driver completed each lap
+        completed = ~np.isnan(elapsed)
+        leader_laps = np.searchsorted(self.leader_elapsed, np.where(completed, elapsed, np.inf), side='right')
+        self.laps_down = np.where(completed, np.maximum(leader_laps - self.lap_numbers[:, None], 0), -1)
+        # Last lap each driver completed; a gap earlier in the race doesn't lower it
+        self.laps_completed = np.where(completed.any(axis=0), len(elapsed) - np.argmax(completed[::-1], axis=0), 0)
+
+    @property
+    def total_laps(self):
+        return len(self.lap_numbers)
+
+    def classification(self):
+        """Return the finishing order with laps completed, final gap and status."""
+        driver_index = np.arange(len(self.drivers))
+        last = np.maximum(self.laps_completed - 1, 0)
+        final_elapsed = self.elapsed[last, driver_index]
+        final_gap = self.gap[last, driver_index]
+        laps_down = self.total_laps - self.laps_completed
+
+        # Lapped cars still cross the line after the leader finishes; retired cars stop before
+        finished = (laps_down == 0) | (final_elapsed >= self.leader_elapsed[-1])
+        status = np.where(
+            laps_down == 0, 'Finished',
+            np.where(finished, [f"+{n} lap{'s' if n > 1 else ''}" for n in laps_down], 'Retired')
+        )
+
+        order = np.lexsort((final_elapsed, -self.laps_completed))
+        return pd.DataFrame({
+            'Driver': self.drivers[order],
+            'Team': self.teams[order],
+            'Laps': self.laps_completed[order],
+            'Gap': np.where(laps_down == 0, final_gap, np.nan)[order],
+            'Status': status[order],
+        })
+
+
+def _seconds(values):
+    return values.dt.total_seconds().to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def build_race_trace(laps):
+    """Build the race trace of a session's lap table."""
+    # Fast-F1 adds a generated last lap for cars that retire on track; it was never completed
+    generated = laps['FastF1Generated'].fillna(False).astype(bool) if 'FastF1Generated' in laps.columns else False
+    laps = laps[laps['LapNumber'].notna() & laps['Driver'].notna() & ~generated]
+    if laps.empty:
+        raise ValueError("No laps to build a race trace from")
+
+    drivers, driver_index = np.unique(laps['Driver'].to_numpy(dtype=str), return_inverse=True)
+    lap_index = laps['LapNumber'].to_numpy(dtype=np.int64) - 1
+    shape = (lap_index.max() + 1, len(drivers))
+
+    # Pivot: every lap into its [lap, driver] cell in one scatter per column
+    lap_end = np.full(shape, np.nan)
+    lap_end[lap_index, driver_index] = _seconds(laps['Time'])
+    lap_time = np.full(shape, np.nan)
+    lap_time[lap_index, driver_index] = _seconds(laps['LapTime'])
+
+    # Everyone starts together; fall back to lap 1's end minus its duration
+    first_lap = lap_index == 0
+    start = np.nanmin(_seconds(laps['LapStartTime'])[first_lap]) if first_lap.any() else np.nan
+    if np.isnan(start):
+        start = np.nanmin(lap_end[0] - lap_time[0])
+
+    # Laps without a recorded LapTime take their duration from consecutive lap end times;
+    # a lap with neither (e.g. the lap a car retired on) was not completed
+    previous_end = np.vstack([np.full((1, shape[1]), start), lap_end[:-1]])
+    duration = np.where(np.isnan(lap_time), lap_end - previous_end, lap_time)
+    completed = np.isfinite(duration)
+
+    # A missing duration makes every later sum NaN rather than short; laps with
+    # a recorded end time after such a gap are placed by that time instead
+    elapsed = np.cumsum(duration, axis=0)
+    elapsed = np.where(np.isnan(elapsed) & completed, lap_end - start, elapsed)
+    elapsed = np.where(completed, elapsed, np.nan)
+
+    teams = laps.groupby('Driver')['Team'].first().reindex(drivers).to_numpy()
+    return RaceTrace(drivers, teams, elapsed)
+
+
+# Shared by every rerun and user in this process
+race_trace_cache = SessionCache(lambda store: build_race_trace(store.laps), 'build_race_trace')
+metrics.register_cache('race_traces', race_trace_cache.stats)
@@ -0,0 +1,155 @@
+"""Pre-built index of the event schedule for the seasons the app supports.
+
+Each season is fetched from Fast-F1 at most once per process and persisted to a
+JSON snapshot, so sidebar reruns never call fastf1.get_event_schedule. A season
+that hasn't finished yet is fetched again once its snapshot is SNAPSHOT_TTL old,
+so sessions added or rescheduled during the year show up.
+"""
+import json
+import os
+import threading
+import time
+
+import fastf1
+import pandas as pd
+
+SEASONS = tuple(range(2024, 2017, -1))
+
+# Session types the app can compare, in the order the sidebar lists them. The
+# sprint formats renamed their sessions: 2021's Saturday sprint was "Sprint
+# Qualifying", 2023's sprint grid was set in a "Sprint Shootout" and from 2024
+# that shootout is "Sprint Qualifying" again.
+SESSION_TYPES = (
+    "Qualifying", "Race", "Sprint", "Sprint Qualifying", "Sprint Shootout",
+    "Practice 1", "Practice 2", "Practice 3",
+)
+
+SNAPSHOT_PATH = os.path.join('cache', 'schedule_index.json')
+
+# Age after which an unfinished season's snapshot is fetched again (s)
+SNAPSHOT_TTL = 12 * 3600
+
+
+def build_season(year):
+    """Fetch one season's schedule and reduce it to round number, name and sessions."""
+    schedule = fastf1.get_event_schedule(year, include_testing=False)
+
+    events = []
+    for _, event in schedule.iterrows():
+        name = event['EventName']
+        if pd.isna(name) or not name:
+            continue
+        sessions = [event.get(f'Session{i}') for i in range(1, 6)]
+        sessions = [s for s in sessions if isinstance(s, str) and s and s != 'None']
+        date = pd.Timestamp(event.get('EventDate'))
+        events.append({
+            'round': int(event['RoundNumber']),
+            'name': name,
+            'date': None if pd.isna(date) else date.date().isoformat(),
+            # Known types in sidebar order, then anything Fast-F1 names that isn't listed yet
+            'sessions': [s for s in SESSION_TYPES if s in sessions] + [s for s in sessions if s not in SESSION_TYPES],
+        })
+
+    events.sort(key=lambda e: e['round'])
+    return events
+
+
+def season_finished(events, now=None):
+    """True once the last event of a season is over; seasons without dates count as unfinished."""
+    dates = [event.get('date') for event in events]
+    if not dates or None in dates:
+        return False
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    return pd.Timestamp(max(dates)) + pd.Timedelta(days=1) < now
+
+
+class ScheduleIndex:
+    """Event names, round numbers and available session types per season."""
+
+    def __init__(self, path=SNAPSHOT_PATH, ttl=SNAPSHOT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._seasons = {}
+        self._fetched = {}
+        self._lock = threading.Lock()
+        self._load_snapshot()
+
+    def _load_snapshot(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for year, season in data.items():
+            # Snapshots written before fetch times were kept hold a bare event list
+            if isinstance(season, list):
+                season = {'fetched': 0.0, 'events': season}
+            self._seasons[int(year)] = season['events']
+            self._fetched[int(year)] = season['fetched']
+
+    def save(self):
+        """Write the index to its snapshot file."""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = f"{self.path}.tmp"
+        data = {
+            str(year): {'fetched': self._fetched.get(year, 0.0), 'events': events}
+            for year, events in self._seasons.items()
+        }
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def _stale(self, year):
+        events = self._seasons[year]
+        return not season_finished(events) and time.time() - self._fetched.get(year, 0.0) > self.ttl
+
+    def events(self, year):
+        """Return the events of a season, fetching and snapshotting it on first use.
+
+        An unfinished season is fetched again once its snapshot is older than
+        the TTL; if that fetch fails the snapshot keeps serving until the next TTL.
+        """
+        events = self._seasons.get(year)
+        if events is not None and not self._stale(year):
+            return events
+
+        with self._lock:
+            if year not in self._seasons:
+                self._seasons[year] = build_season(year)
+                self._fetched[year] = time.time()
+                self.save()
+            elif self._stale(year):
+                try:
+                    self._seasons[year] = build_season(year)
+                except Exception:
+                    pass  # keep the snapshot rather than emptying the sidebar
+                self._fetched[year] = time.time()
+                self.save()
+            return self._seasons[year]
+
+    def build(self, seasons=SEASONS):
+        """Make sure every season in seasons is indexed."""
+        for year in seasons:
+            self.events(year)
+
+    def event_names(self, year):
+        return [event['name'] for event in self.events(year)]
+
+    def event(self, year, event_name):
+        for event in self.events(year):
+            if event['name'] == event_name:
+                return event
+        return None
+
+    def session_types(self, year, event_name):
+        """Return the comparable session types that exist for an event."""
+        event = self.event(year, event_name)
+        if event is None:
+            return list(SESSION_TYPES)
+        return event['sessions']
+
+
+# Shared by every rerun and user in this process
+schedule_index = ScheduleIndex()
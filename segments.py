@@ -0,0 +1,251 @@
+"""Per-circuit corner segmentation, built once and persisted next to the Fast-F1 cache.
+
+A circuit's lap is split into one segment per corner, with boundaries halfway
+between consecutive apexes. Corner positions come from Fast-F1's circuit info
+where available, otherwise from speed minima on the session's fastest lap.
+Only circuit info segments are written to disk; speed minima depend on the
+session they came from (a wet FP1 brakes elsewhere than qualifying), so they
+are kept in memory for that session alone. Any comparison at that circuit then reduces to per-segment gain/loss with a
+single np.add.reduceat over the delta trace.
+"""
+import json
+import os
+import re
+import threading
+import weakref
+
+import numpy as np
+
+from metrics import span
+from workers import prefetch_executor
+
+SEGMENTS_DIR = os.path.join('cache', 'segments')
+
+# Speed minima closer than this are treated as one corner (m)
+MIN_CORNER_SPACING = 150.0
+# A minimum must sit this far below the fastest point within the window either side of it
+MIN_CORNER_DROP = 20.0  # km/h
+PROMINENCE_WINDOW = 300.0  # m
+_SMOOTHING_WINDOW = 9
+
+
+def corners_from_circuit_info(session):
+    """Return [(label, distance)] for the circuit's corners, or None if unavailable."""
+    try:
+        circuit_info = session.get_circuit_info()
+    except Exception:
+        return None
+    if circuit_info is None or circuit_info.corners.empty:
+        return None
+
+    corners = circuit_info.corners.dropna(subset=['Distance']).sort_values('Distance')
+    labels = corners['Number'].astype(int).astype(str) + corners['Letter'].fillna('').astype(str)
+    return [(f"T{label}", float(distance)) for label, distance in zip(labels, corners['Distance'])]
+
+
+def _window_max(values, starts, stops):
+    """Max of values[start:stop] for many windows in one np.maximum.reduceat call."""
+    if len(starts) == 0:
+        return np.empty(0)
+    padded = np.append(values, -np.inf)
+    # Even slots of the interleaved bounds are the windows; odd slots are discarded
+    bounds = np.column_stack((starts, stops)).ravel()
+    return np.maximum.reduceat(padded, bounds)[::2]
+
+
+def corners_from_speed(distance, speed, min_spacing=MIN_CORNER_SPACING, min_drop=MIN_CORNER_DROP):
+    """Return [(label, distance)] at the significant speed minima of a lap."""
+    distance = np.asarray(distance, dtype=np.float64)
+    speed = np.asarray(speed, dtype=np.float64)
+    kernel = np.ones(_SMOOTHING_WINDOW) / _SMOOTHING_WINDOW
+    smooth = np.convolve(speed, kernel, mode='same')
+
+    candidates = np.flatnonzero((smooth[1:-1] < smooth[:-2]) & (smooth[1:-1] <= smooth[2:])) + 1
+
+    # Prominence: the fastest point within the window on either side must be min_drop quicker
+    left = np.searchsorted(distance, distance[candidates] - PROMINENCE_WINDOW)
+    right = np.searchsorted(distance, distance[candidates] + PROMINENCE_WINDOW, side='right')
+    before = _window_max(smooth, left, candidates + 1)
+    after = _window_max(smooth, candidates, right)
+    apexes = candidates[(np.minimum(before, after) - smooth[candidates]) >= min_drop]
+
+    # Merge minima of the same corner, keeping the slowest one
+    kept = []
+    for index in apexes:
+        if kept and distance[index] - distance[kept[-1]] < min_spacing:
+            if smooth[index] < smooth[kept[-1]]:
+                kept[-1] = index
+        else:
+            kept.append(index)
+    return [(f"T{number}", float(distance[index])) for number, index in enumerate(kept, start=1)]
+
+
+def segment_boundaries(corner_distances, lap_distance):
+    """Split [0, lap_distance] halfway between consecutive corners."""
+    corner_distances = np.asarray(corner_distances, dtype=np.float64)
+    midpoints = (corner_distances[:-1] + corner_distances[1:]) / 2
+    return np.concatenate(([0.0], midpoints, [lap_distance]))
+
+
+class Segments:
+    """Corner labels and segment boundary distances for one circuit."""
+
+    def __init__(self, labels, corners, boundaries, source):
+        self.labels = list(labels)
+        self.corners = np.asarray(corners, dtype=np.float64)
+        self.boundaries = np.asarray(boundaries, dtype=np.float64)
+        self.source = source
+
+    @classmethod
+    def from_corners(cls, corners, lap_distance, source):
+        labels = [label for label, _ in corners]
+        distances = [distance for _, distance in corners]
+        return cls(labels, distances, segment_boundaries(distances, lap_distance), source)
+
+    def to_dict(self):
+        return {
+            'labels': self.labels,
+            'corners': self.corners.tolist(),
+            'boundaries': self.boundaries.tolist(),
+            'source': self.source,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['labels'], data['corners'], data['boundaries'], data['source'])
+
+    def __len__(self):
+        return len(self.labels)
+
+    def segment_deltas(self, distance, delta):
+        """Sum a cumulative delta trace into per-segment gain/loss.
+
+        `distance` is the sorted grid the `delta` (..., samples) trace is
+        sampled on. Returns (..., segments) where each value is how much the
+        delta grew across that segment; segments outside the grid are zero.
+        """
+        delta = np.asarray(delta)
+        starts = np.searchsorted(distance, self.boundaries[:-1])
+        starts = np.minimum(starts, len(distance) - 1)
+        steps = np.diff(delta, axis=-1, prepend=delta[..., :1])
+
+        gains = np.add.reduceat(steps, starts, axis=-1)
+        # reduceat returns the single element at an empty segment, not zero
+        empty = np.diff(np.append(starts, len(distance))) <= 0
+        gains[..., empty] = 0
+        return gains
+
+
+def _circuit_filename(year, gp):
+    slug = re.sub(r'[^a-z0-9]+', '_', str(gp).lower()).strip('_')
+    return f"{year}_{slug}.json"
+
+
+class SegmentIndex:
+    """Segments per circuit, built on first use and kept on disk for every later session."""
+
+    def __init__(self, directory=SEGMENTS_DIR):
+        self.directory = directory
+        self._segments = {}
+        # Speed minima fallbacks, keyed by store.key and never persisted
+        self._session_segments = {}
+        # Sessions whose circuit info fetch already failed, so it isn't retried on every rerun
+        self._no_circuit_info = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, _circuit_filename(*key))
+
+    def _load(self, key):
+        try:
+            with open(self._path(key)) as f:
+                segments = Segments.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+        # Snapshots written before fallbacks stopped being persisted are ignored
+        return segments if segments.source == 'circuit_info' else None
+
+    def save(self, key, segments):
+        """Write one circuit's segments to its snapshot file."""
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(segments.to_dict(), f, indent=1)
+        os.replace(tmp_path, path)
+
+    def build(self, store):
+        """Segment a session's circuit from circuit info, falling back to speed minima.
+
+        Raises ValueError when there is nothing to segment from, including
+        when the fastest lap's telemetry can't be extracted.
+        """
+        fastest = store.session.laps.pick_fastest()
+        if fastest is None:
+            raise ValueError("No timed lap to segment the circuit from")
+        try:
+            telemetry = store.lap_telemetry(fastest)
+        except Exception as e:
+            raise ValueError(f"No telemetry for the fastest lap: {e}") from e
+        if telemetry.empty:
+            raise ValueError("No telemetry for the fastest lap")
+        lap_distance = float(np.nanmax(telemetry['Distance']))
+
+        corners = None
+        if store.session not in self._no_circuit_info:
+            corners = corners_from_circuit_info(store.session)
+            if not corners:
+                self._no_circuit_info.add(store.session)
+        source = 'circuit_info'
+        if not corners:
+            corners = corners_from_speed(telemetry['Distance'], telemetry['Speed'])
+            source = 'speed_minima'
+        if not corners:
+            raise ValueError("No corners found on the fastest lap")
+        return Segments.from_corners(corners, lap_distance, source)
+
+    def _cached(self, store):
+        segments = self._segments.get((store.year, store.gp))
+        if segments is None:
+            segments = self._session_segments.get(store.key)
+        return segments
+
+    def get(self, store):
+        """Return the segments for a store's circuit, loading or building them on first use.
+
+        Circuits are keyed by season and event, since layouts change between
+        seasons; a speed minima fallback only serves the session it came from.
+        """
+        key = (store.year, store.gp)
+        segments = self._cached(store)
+        if segments is not None:
+            return segments
+
+        with self._lock:
+            segments = self._cached(store)
+            if segments is None:
+                segments = self._load(key)
+                if segments is None:
+                    with span('segment_circuit'):
+                        segments = self.build(store)
+                    if segments.source == 'circuit_info':
+                        self.save(key, segments)
+                if segments.source == 'circuit_info':
+                    self._segments[key] = segments
+                else:
+                    self._session_segments[store.key] = segments
+            return segments
+
+    def prefetch(self, store):
+        """Build a store's segments in the prefetch pool, so the first render finds them ready."""
+        def build():
+            try:
+                self.get(store)
+            except (OSError, ValueError):
+                pass  # get() raises the same error again when the page asks for them
+        return prefetch_executor.submit(build)
+
+
+# Shared by every rerun and user in this process
+segment_index = SegmentIndex()
@@ -0,0 +1,58 @@
+"""Per-session results derived once and shared by every rerun and user.
+
+Results such as the race trace or the minisector time matrix only depend on
+the session, so each is built on first use and kept in a small LRU keyed by
+the store's (year, gp, session type).
+"""
+import threading
+from collections import OrderedDict
+
+from metrics import span
+
+DEFAULT_MAX_SESSIONS = 16
+
+
+class SessionCache:
+    """Bounded LRU cache of one derived result per session, built by build(store)."""
+
+    def __init__(self, build, stage, max_entries=DEFAULT_MAX_SESSIONS):
+        self.build = build
+        self.stage = stage
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, store):
+        """Return the result for a store's session, building it on first use."""
+        key = store.key
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        with span(self.stage):
+            result = self.build(store)
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
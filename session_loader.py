@@ -0,0 +1,47 @@
+"""Staged loading of Fast-F1 sessions.
+
+Stage 1 loads lap timing and race control messages, which is all the sidebar
+needs to list drivers; the messages are what mark laps deleted for track
+limits, so pick_fastest() never returns one. Stage 2 loads car and position
+data the first time a comparison needs it.
+"""
+import threading
+import weakref
+
+import fastf1
+
+from metrics import span
+
+# Per-session locks so concurrent reruns don't load the same telemetry twice
+_locks = weakref.WeakKeyDictionary()
+_locks_guard = threading.Lock()
+_telemetry_loaded = weakref.WeakSet()
+
+
+def load_session_laps(year, gp, session_type):
+    """Load lap timing data and race control messages for a session, skipping telemetry and weather."""
+    with span('load_laps', year=year, gp=gp, session_type=session_type):
+        session = fastf1.get_session(year, gp, session_type)
+        session.load(laps=True, telemetry=False, weather=False, messages=True)
+    return session
+
+
+def _session_lock(session):
+    with _locks_guard:
+        lock = _locks.get(session)
+        if lock is None:
+            lock = _locks[session] = threading.Lock()
+        return lock
+
+
+def ensure_telemetry(session):
+    """Load car and position data for a session if it hasn't been loaded yet."""
+    if session in _telemetry_loaded:
+        return
+
+    with _session_lock(session):
+        if session in _telemetry_loaded:
+            return
+        with span('load_telemetry'):
+            session.load(laps=False, telemetry=True, weather=False, messages=False)
+        _telemetry_loaded.add(session)
@@ -0,0 +1,264 @@
+"""Compact per-session store of lap timing and per-lap telemetry arrays.
+
+The app only ever reads a handful of telemetry channels, so instead of caching
+whole Fast-F1 objects we keep one read-only NumPy array per channel per lap.
+Cache hits hand out those arrays directly without copying.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from metrics import metrics, span
+from session_loader import ensure_telemetry
+
+# Channels kept for every lap; Time is stored as seconds from the lap start
+TELEMETRY_COLUMNS = ('Distance', 'Speed', 'X', 'Y', 'Time')
+OPTIONAL_TELEMETRY_COLUMNS = ('Throttle', 'Brake', 'nGear')
+
+COLUMN_DTYPES = {
+    'Distance': np.float64,
+    'Time': np.float64,
+    'Speed': np.float32,
+    'X': np.float32,
+    'Y': np.float32,
+    'Throttle': np.float32,
+    'Brake': np.float32,
+    'nGear': np.float32,
+}
+
+# Upper bound on telemetry held in memory per worker process
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# Lap table columns kept from session.laps
+LAP_COLUMNS = (
+    'Time', 'Driver', 'DriverNumber', 'Team', 'LapTime', 'LapNumber',
+    'Stint', 'PitOutTime', 'PitInTime', 'Sector1Time', 'Sector2Time',
+    'Sector3Time', 'IsPersonalBest', 'Compound', 'TyreLife', 'FreshTyre',
+    'LapStartTime', 'TrackStatus', 'Position', 'Deleted', 'IsAccurate',
+    'FastF1Generated',
+)
+
+
+class LapTelemetry:
+    """Read-only columnar telemetry for a single lap."""
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data):
+        for values in data.values():
+            values.flags.writeable = False
+        self._data = data
+
+    @classmethod
+    def from_frame(cls, telemetry):
+        """Build from a Fast-F1 Telemetry DataFrame, keeping only the stored channels."""
+        data = {}
+        for column in TELEMETRY_COLUMNS + OPTIONAL_TELEMETRY_COLUMNS:
+            if column not in telemetry.columns:
+                continue
+            values = telemetry[column]
+            if column == 'Time':
+                values = values.dt.total_seconds()
+            data[column] = np.ascontiguousarray(
+                values.to_numpy(dtype=COLUMN_DTYPES[column], na_value=np.nan)
+            )
+        return cls(data)
+
+    @property
+    def columns(self):
+        return tuple(self._data)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self._data.values())
+
+    def __getitem__(self, column):
+        return self._data[column]
+
+    def __contains__(self, column):
+        return column in self._data
+
+    def __len__(self):
+        return len(next(iter(self._data.values()), ()))
+
+
+class TelemetryCache:
+    """Size-bounded LRU cache of LapTelemetry keyed by (year, gp, session_type, driver, lap)."""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return cached telemetry for key, or None on a miss."""
+        with self._lock:
+            telemetry = self._entries.get(key)
+            if telemetry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return telemetry
+
+    def put(self, key, telemetry):
+        """Insert telemetry, evicting least recently used entries to stay under max_bytes."""
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing
+
+            self._entries[key] = telemetry
+            self.nbytes += telemetry.nbytes
+            while self.nbytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+            return telemetry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'nbytes': self.nbytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+# Shared by every session and user in this process
+telemetry_cache = TelemetryCache()
+metrics.register_cache('telemetry', telemetry_cache.stats)
+
+
+class SessionStore:
+    """Lap timing table and per-lap telemetry arrays for one loaded session."""
+
+    # Data source name shown in the sidebar and part of every figure cache key
+    source = "Fast-F1"
+
+    def __init__(self, year, gp, session_type, session, cache=None):
+        self.year = year
+        self.gp = gp
+        self.session_type = session_type
+        self.session = session
+        self.cache = cache if cache is not None else telemetry_cache
+
+        columns = [c for c in LAP_COLUMNS if c in session.laps.columns]
+        self.laps = session.laps[columns].reset_index(drop=True)
+
+        # Drivers whose bulk pass has already run, whether or not it succeeded;
+        # their laps that aren't cached come from per-lap extraction
+        self._bulk_extracted = set()
+        self._driver_locks = {}
+        self._locks_guard = threading.Lock()
+
+    @property
+    def key(self):
+        return (self.year, self.gp, self.session_type)
+
+    @property
+    def drivers(self):
+        return sorted(self.laps['Driver'].dropna().unique().tolist())
+
+    def driver_stints(self, driver):
+        """Return the stint numbers a driver ran in this session."""
+        stints = self.laps.loc[self.laps['Driver'] == driver, 'Stint'].dropna()
+        return sorted(stints.astype(int).unique().tolist())
+
+    def fastest_lap(self, driver):
+        """Return a driver's fastest Fast-F1 Lap, or None if they have no timed lap."""
+        driver_laps = self.session.laps.pick_drivers(driver)
+        if driver_laps.empty:
+            return None
+        lap = driver_laps.pick_fastest()
+        if lap is None or pd.isna(lap['LapTime']):
+            return None
+        return lap
+
+    def _driver_lock(self, driver):
+        with self._locks_guard:
+            lock = self._driver_locks.get(driver)
+            if lock is None:
+                lock = self._driver_locks[driver] = threading.Lock()
+            return lock
+
+    def extract_driver(self, driver):
+        """Extract every lap of a driver in one bulk pass and cache them all.
+
+        Returns the RaggedTelemetry, or None if the driver's car and position
+        data can't be bulk extracted.
+        """
+        # Imported here because bulk_telemetry builds on LapTelemetry from this module
+        from bulk_telemetry import extract_driver_laps
+
+        if driver in self._bulk_extracted:
+            return None
+        ensure_telemetry(self.session)
+        self._bulk_extracted.add(driver)
+        try:
+            with span('extract_driver', driver=driver):
+                ragged = extract_driver_laps(self.session, driver)
+        except Exception:
+            return None
+
+        # Cached laps own copies of their rows: a view would pin the driver's whole
+        # flat block while the cache only accounts for the lap's own bytes
+        for i, (driver_code, lap_number) in enumerate(zip(ragged.drivers, ragged.lap_numbers)):
+            self.cache.put(self.key + (driver_code, int(lap_number)), ragged.lap(i, copy=True))
+        return ragged
+
+    def lap_telemetry(self, lap):
+        """Return stored telemetry for a Fast-F1 Lap, extracting it on first use.
+
+        The first miss for a driver extracts all of their laps at once. Laps
+        the bulk pass can't cut, or that were evicted since, fall back to
+        Lap.get_telemetry() rather than repeating the bulk pass.
+        """
+        driver = lap['Driver']
+        key = self.key + (driver, int(lap['LapNumber']))
+        telemetry = self.cache.get(key)
+        if telemetry is not None:
+            return telemetry
+
+        if driver not in self._bulk_extracted:
+            with self._driver_lock(driver):
+                # Another thread may have extracted this driver while we waited
+                if driver not in self._bulk_extracted:
+                    self.extract_driver(driver)
+            # The bulk pass cached every lap it could cut, this one included if it could
+            telemetry = self.cache.get(key)
+            if telemetry is not None:
+                return telemetry
+
+        ensure_telemetry(self.session)
+        with span('extract_lap'):
+            telemetry = LapTelemetry.from_frame(lap.get_telemetry())
+        return self.cache.put(key, telemetry)
@@ -0,0 +1,52 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+from fastf1.core import Laps, Session
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_session(rows, messages=()):
+    """Build a Fast-F1 Session with the given lap rows and race control messages, without loading anything."""
+    session = Session.__new__(Session)
+    session._laps = Laps(pd.DataFrame(rows), session=session)
+    session._race_control_messages = pd.DataFrame({'Message': list(messages)})
+    return session
+
+
+def lap_row(driver, number, lap_time, **fields):
+    """One lap table row with the columns the app reads, timed at lap_time seconds."""
+    row = {
+        'Time': pd.Timedelta(seconds=100 + 90 * number),
+        'Driver': driver,
+        'DriverNumber': {'VER': '1', 'LEC': '16'}.get(driver, '99'),
+        'Team': 'Red Bull Racing' if driver == 'VER' else 'Ferrari',
+        'LapTime': pd.Timedelta(seconds=lap_time) if lap_time is not None else pd.NaT,
+        'LapNumber': float(number),
+        'Stint': 1.0,
+        'PitOutTime': pd.NaT,
+        'PitInTime': pd.NaT,
+        'IsPersonalBest': True,
+        'Compound': 'SOFT',
+        'TyreLife': float(number),
+        'LapStartTime': pd.Timedelta(seconds=100 + 90 * (number - 1)),
+        'TrackStatus': '1',
+        'Deleted': None,
+        'FastF1Generated': False,
+        'IsAccurate': True,
+    }
+    row.update(fields)
+    return row
+
+
+@pytest.fixture
+def deleted_lap_session():
+    """VER's quickest lap (lap 3, 1:29.500) deleted for track limits by race control."""
+    rows = [lap_row('VER', n, t) for n, t in enumerate([91.0, 90.2, 89.5, 90.0, 90.4], start=1)]
+    rows += [lap_row('LEC', n, t) for n, t in enumerate([91.2, 90.3, 90.1, 90.6, 90.8], start=1)]
+    messages = ["CAR 1 (VER) TIME 1:29.500 DELETED - TRACK LIMITS AT TURN 4 LAP 3 14:05:11"]
+    session = make_session(rows, messages)
+    session._set_laps_deleted_from_rcm()
+    return session
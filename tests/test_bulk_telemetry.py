@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from bulk_telemetry import cut_laps
+
+
+def merged_data(seconds=300.0, rate=4.0, seed=0):
+    """A driver's whole-session merged telemetry, sampled at `rate` Hz from t=100 s."""
+    session_time = 100.0 + np.arange(0.0, seconds, 1 / rate)
+    speed = 200 + 80 * np.sin(session_time / 7) + np.random.default_rng(seed).normal(0, 3, len(session_time))
+    return pd.DataFrame({
+        'SessionTime': pd.to_timedelta(session_time, unit='s'),
+        'Speed': speed,
+        'X': np.cos(session_time / 15),
+        'Y': np.sin(session_time / 15),
+    })
+
+
+def driver_laps(starts):
+    return pd.DataFrame({
+        'Driver': 'VER',
+        'LapNumber': np.arange(1.0, len(starts)),
+        'LapStartTime': pd.to_timedelta(starts[:-1], unit='s'),
+        'Time': pd.to_timedelta(starts[1:], unit='s'),
+    })
+
+
+def lap_distance(merged, start, end):
+    """Distance as Lap.get_telemetry() integrates it: one lap on its own, NaN steps skipped."""
+    lap = merged[(merged['SessionTime'] >= pd.Timedelta(seconds=start))
+                 & (merged['SessionTime'] <= pd.Timedelta(seconds=end))]
+    time = (lap['SessionTime'] - pd.Timedelta(seconds=start)).dt.total_seconds()
+    step = time.diff()
+    step.iloc[0] = time.iloc[0]
+    return (lap['Speed'] / 3.6 * step).cumsum().to_numpy()
+
+
+def test_distance_is_integrated_per_lap():
+    merged = merged_data()
+    starts = [100.2, 190.0, 281.3, 370.0]
+    ragged = cut_laps(merged, driver_laps(starts))
+
+    assert len(ragged) == 3
+    for i in range(3):
+        np.testing.assert_allclose(ragged.lap(i)['Distance'], lap_distance(merged, starts[i], starts[i + 1]))
+
+
+def test_missing_speed_only_blanks_its_own_sample():
+    merged = merged_data()
+    merged.loc[[20, 21], 'Speed'] = np.nan
+    starts = [100.2, 190.0, 281.3, 370.0]
+    ragged = cut_laps(merged, driver_laps(starts))
+
+    first = ragged.lap(0)['Distance']
+    assert np.isnan(first).sum() == 2
+    np.testing.assert_allclose(first, lap_distance(merged, starts[0], starts[1]))
+    for i in (1, 2):
+        distance = ragged.lap(i)['Distance']
+        assert np.isfinite(distance).all()
+        np.testing.assert_allclose(distance, lap_distance(merged, starts[i], starts[i + 1]))
@@ -0,0 +1,43 @@
+import numpy as np
+
+from downsample import downsample_indices, lttb_indices
+
+
+def sequential_lttb(x, y, max_points):
+    """Textbook LTTB, one bucket after another."""
+    n = len(x)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.intp)
+    keep = [0]
+    for i in range(max_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 1 < max_points - 2:
+            next_x, next_y = x[stop:edges[i + 2]].mean(), y[stop:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        a = keep[-1]
+        area = np.abs((x[a] - next_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (next_y - y[a]))
+        keep.append(start + int(np.argmax(area)))
+    return np.array(keep + [n - 1])
+
+
+def lap_trace(samples=900, seed=0):
+    distance = np.linspace(0.0, 5400.0, samples)
+    speed = 210 + 90 * np.sin(distance / 310) + np.random.default_rng(seed).normal(0, 2, samples)
+    return distance, speed
+
+
+def test_matches_sequential_lttb_on_a_lap_at_the_default_budget():
+    for seed in range(3):
+        distance, speed = lap_trace(seed=seed)
+        np.testing.assert_array_equal(lttb_indices(distance, speed), sequential_lttb(distance, speed, 500))
+
+
+def test_keeps_ends_and_extrema():
+    distance, speed = lap_trace()
+    keep = downsample_indices(distance, speed, 100)
+
+    assert np.all(np.diff(keep) > 0)
+    assert keep[0] == 0 and keep[-1] == len(distance) - 1
+    assert np.argmax(speed) in keep and np.argmin(speed) in keep
+    assert len(keep) <= 102
+    np.testing.assert_array_equal(lttb_indices(distance, speed, 1000), np.arange(len(distance)))
@@ -0,0 +1,48 @@
+import json
+import logging
+import urllib.request
+
+import metrics as metrics_module
+from metrics import Metrics
+
+
+def test_spans_are_logged_as_json_lines(caplog):
+    registry = Metrics()
+    with caplog.at_level(logging.INFO, logger='f1.metrics'):
+        with registry.span('extract', driver='VER'):
+            pass
+
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record['event'] == 'span' and record['stage'] == 'extract' and record['driver'] == 'VER'
+    assert registry.snapshot()['stages']['extract']['count'] == 1
+
+
+def test_configure_logging_attaches_one_handler():
+    logger = metrics_module.logger
+    handlers, level, propagate = list(logger.handlers), logger.level, logger.propagate
+    try:
+        logger.handlers.clear()
+        metrics_module.configure_logging()
+        metrics_module.configure_logging()
+        assert len(logger.handlers) == 1
+        assert logger.isEnabledFor(logging.INFO)
+    finally:
+        logger.handlers[:] = handlers
+        logger.setLevel(level)
+        logger.propagate = propagate
+
+
+def test_metrics_are_served_over_http(monkeypatch):
+    monkeypatch.setattr(metrics_module, '_server', None)
+    server = metrics_module.serve_metrics(0, host='127.0.0.1')
+    try:
+        metrics_module.metrics.increment('test_scrapes')
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            body = response.read().decode()
+        assert response.headers['Content-Type'].startswith('text/plain')
+        assert '# TYPE f1_test_scrapes_total counter' in body
+        assert metrics_module.serve_metrics(0) is server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,60 @@
+import gc
+
+import prefetch
+from conftest import lap_row, make_session
+from telemetry_store import SessionStore, TelemetryCache
+
+
+class QueuedExecutor:
+    """Holds submitted work instead of running it."""
+
+    def __init__(self):
+        self.queued = []
+
+    def submit(self, function, *args):
+        self.queued.append((function, args))
+
+
+def test_jobs_are_per_store_and_dropped_with_it(monkeypatch, deleted_lap_session):
+    executor = QueuedExecutor()
+    monkeypatch.setattr(prefetch, 'prefetch_executor', executor)
+
+    fastf1_store = SessionStore(2024, "Bahrain Grand Prix", "Qualifying", deleted_lap_session, TelemetryCache())
+    archive_store = SessionStore(2024, "Bahrain Grand Prix", "Qualifying", deleted_lap_session, TelemetryCache())
+    assert fastf1_store.key == archive_store.key
+
+    job = prefetch.start_prefetch(fastf1_store)
+    assert sorted(job.drivers) == ['LEC', 'VER']
+    assert prefetch.start_prefetch(fastf1_store) is job
+    assert prefetch.get_prefetch(archive_store) is None
+    assert prefetch.start_prefetch(archive_store) is not job
+    assert len(executor.queued) == 4
+
+    executor.queued.clear()
+    del fastf1_store, archive_store
+    gc.collect()
+    assert len(prefetch._jobs) == 0
+
+
+def test_deleted_laps_do_not_move_a_driver_up(monkeypatch):
+    rows = [lap_row('VER', 1, 90.5), lap_row('VER', 2, 89.0), lap_row('LEC', 1, 91.0), lap_row('LEC', 2, 89.8)]
+    session = make_session(rows, ["CAR 1 (VER) TIME 1:29.000 DELETED - TRACK LIMITS AT TURN 4 LAP 2 14:05:11"])
+    session._set_laps_deleted_from_rcm()
+    store = SessionStore(2024, "Bahrain Grand Prix", "Qualifying", session, TelemetryCache())
+
+    assert prefetch.drivers_by_pace(store) == ['LEC', 'VER']
+
+
+def test_failures_are_recorded_per_driver():
+    class FailingStore:
+        def fastest_lap(self, driver):
+            if driver == 'VER':
+                raise KeyError('Speed')
+            return None
+
+    job = prefetch.PrefetchJob(['VER', 'LEC'])
+    for driver in job.drivers:
+        job._run(FailingStore(), driver)
+
+    assert job.done
+    assert job.failed == {'VER': "'Speed'"}
@@ -0,0 +1,34 @@
+import os
+
+import pandas as pd
+
+from analysis import get_race_pace, session_key
+from archive import ArchiveStore, session_dir
+from race_pace import clean_laps, driver_pace
+from telemetry_store import SessionStore, TelemetryCache
+
+
+def test_deleted_laps_are_excluded(deleted_lap_session):
+    pace = clean_laps(deleted_lap_session.laps, fuel_correction=0.0)
+
+    deleted = pace[(pace['Driver'] == 'VER') & (pace['LapNumber'] == 3)]
+    assert deleted['Excluded'].item() == 'Deleted'
+    assert (pace.loc[pace['Driver'] == 'LEC', 'Excluded'].isin(['', 'First lap'])).all()
+
+    ver = driver_pace(pace).set_index('Driver').loc['VER']
+    assert ver['Laps'] == 3
+    assert ver['Median'] == 90.2
+
+
+def test_archive_and_fastf1_results_have_distinct_keys(tmp_path, deleted_lap_session):
+    path = session_dir(2024, "Bahrain Grand Prix", "Race", str(tmp_path))
+    os.makedirs(path)
+    pd.DataFrame(deleted_lap_session.laps).to_parquet(os.path.join(path, 'laps.parquet'), index=False)
+
+    fastf1_store = SessionStore(2024, "Bahrain Grand Prix", "Race", deleted_lap_session, TelemetryCache())
+    archive_store = ArchiveStore(2024, "Bahrain Grand Prix", "Race", str(tmp_path), TelemetryCache())
+    fastf1_pace, _ = get_race_pace(fastf1_store)
+    archive_pace, _ = get_race_pace(archive_store)
+
+    assert fastf1_store.key == archive_store.key
+    assert session_key(fastf1_pace) != session_key(archive_pace)
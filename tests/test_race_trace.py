@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from race_trace import build_race_trace
+
+START = 100.0
+PACE = {'AAA': 90.0, 'BBB': 91.0, 'CCC': 92.0}
+
+
+def race_laps(laps=6):
+    """Three cars lapping at constant pace from a common start."""
+    rows = []
+    for driver, pace in PACE.items():
+        for number in range(1, laps + 1):
+            rows.append({
+                'Driver': driver,
+                'Team': f"Team {driver}",
+                'LapNumber': float(number),
+                'LapStartTime': pd.Timedelta(seconds=START + pace * (number - 1)),
+                'Time': pd.Timedelta(seconds=START + pace * number),
+                'LapTime': pd.Timedelta(seconds=pace),
+                'FastF1Generated': False,
+            })
+    return pd.DataFrame(rows)
+
+
+def retire(laps, driver, lap_number, generated_lap=True):
+    """CCC stops on track during lap_number: no time for it, plus Fast-F1's generated phantom lap."""
+    laps = laps[~((laps['Driver'] == driver) & (laps['LapNumber'] >= lap_number))]
+    rows = [{
+        'Driver': driver, 'Team': f"Team {driver}", 'LapNumber': float(lap_number),
+        'LapStartTime': pd.Timedelta(seconds=START + PACE[driver] * (lap_number - 1)),
+        'Time': pd.NaT, 'LapTime': pd.NaT, 'FastF1Generated': False,
+    }]
+    if generated_lap:
+        rows[0].update(Time=pd.Timedelta(seconds=START + PACE[driver] * lap_number + 300), FastF1Generated=True)
+    laps = pd.concat([laps, pd.DataFrame(rows)], ignore_index=True)
+    for column in ('LapStartTime', 'Time', 'LapTime'):
+        laps[column] = pd.to_timedelta(laps[column])
+    return laps
+
+
+def test_retired_car_never_leads_or_counts_the_lap_it_stopped_on():
+    for generated_lap in (False, True):
+        trace = build_race_trace(retire(race_laps(), 'CCC', 4, generated_lap))
+        ccc = list(trace.drivers).index('CCC')
+
+        np.testing.assert_allclose(trace.gap[3], [0.0, 4.0, np.nan])
+        assert np.isnan(trace.gap[3:, ccc]).all()
+        assert trace.laps_completed[ccc] == 3
+
+        classification = trace.classification().set_index('Driver')
+        assert classification.loc['CCC', 'Status'] == 'Retired'
+        assert classification.loc['CCC', 'Laps'] == 3
+        assert classification.loc['AAA', 'Status'] == 'Finished'
+
+
+def test_missing_lap_mid_race_does_not_shorten_later_laps():
+    laps = race_laps()
+    gap_lap = (laps['Driver'] == 'BBB') & (laps['LapNumber'] == 3)
+    laps.loc[gap_lap, ['Time', 'LapTime']] = pd.NaT
+
+    trace = build_race_trace(laps)
+    bbb = list(trace.drivers).index('BBB')
+
+    assert np.isnan(trace.elapsed[2, bbb])
+    np.testing.assert_allclose(trace.gap[3:, bbb], [4.0, 5.0, 6.0])
+    assert trace.laps_completed[bbb] == 6
+    assert trace.classification().set_index('Driver').loc['BBB', 'Status'] == 'Finished'
@@ -0,0 +1,85 @@
+import json
+
+import fastf1
+import pandas as pd
+
+import schedule
+from schedule import ScheduleIndex, build_season, season_finished
+
+
+def event_row(round_number, name, date, sessions):
+    row = {'RoundNumber': round_number, 'EventName': name, 'EventDate': pd.Timestamp(date)}
+    row.update({f'Session{i}': session for i, session in enumerate(sessions, start=1)})
+    return row
+
+
+SPRINT_2021 = ("Practice 1", "Qualifying", "Practice 2", "Sprint Qualifying", "Race")
+CONVENTIONAL = ("Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race")
+
+
+def season_2021():
+    return pd.DataFrame([
+        event_row(10, "British Grand Prix", "2021-07-18", SPRINT_2021),
+        event_row(1, "Bahrain Grand Prix", "2021-03-28", CONVENTIONAL),
+    ])
+
+
+def test_legacy_sprint_sessions_are_kept(monkeypatch):
+    monkeypatch.setattr(fastf1, 'get_event_schedule', lambda year, include_testing: season_2021())
+    events = build_season(2021)
+
+    assert [e['name'] for e in events] == ["Bahrain Grand Prix", "British Grand Prix"]
+    assert events[1]['sessions'] == ["Qualifying", "Race", "Sprint Qualifying", "Practice 1", "Practice 2"]
+    assert events[0]['date'] == "2021-03-28"
+    assert season_finished(events, now="2022-01-01")
+    assert not season_finished(events, now="2021-07-01")
+
+
+def test_unfinished_season_is_fetched_again_after_the_ttl(monkeypatch, tmp_path):
+    fetches = []
+
+    def get_event_schedule(year, include_testing):
+        fetches.append(year)
+        rows = [event_row(1, "Bahrain Grand Prix", "2099-03-02", CONVENTIONAL)]
+        if len(fetches) > 1:
+            rows.append(event_row(2, "Saudi Arabian Grand Prix", "2099-03-09", CONVENTIONAL))
+        return pd.DataFrame(rows)
+
+    monkeypatch.setattr(fastf1, 'get_event_schedule', get_event_schedule)
+    clock = [1000.0]
+    monkeypatch.setattr(schedule.time, 'time', lambda: clock[0])
+
+    path = str(tmp_path / 'schedule_index.json')
+    index = ScheduleIndex(path, ttl=60)
+    assert index.event_names(2099) == ["Bahrain Grand Prix"]
+    clock[0] += 30
+    assert ScheduleIndex(path, ttl=60).event_names(2099) == ["Bahrain Grand Prix"]
+    clock[0] += 60
+    assert index.event_names(2099) == ["Bahrain Grand Prix", "Saudi Arabian Grand Prix"]
+    assert fetches == [2099, 2099]
+
+
+def test_finished_season_snapshot_is_never_refetched(monkeypatch, tmp_path):
+    monkeypatch.setattr(fastf1, 'get_event_schedule', lambda year, include_testing: season_2021())
+    path = str(tmp_path / 'schedule_index.json')
+    ScheduleIndex(path, ttl=0).events(2021)
+
+    def offline(year, include_testing):
+        raise AssertionError("finished season fetched again")
+
+    monkeypatch.setattr(fastf1, 'get_event_schedule', offline)
+    assert ScheduleIndex(path, ttl=0).session_types(2021, "British Grand Prix")[-1] == "Practice 2"
+
+
+def test_old_snapshot_is_refreshed_and_kept_when_offline(monkeypatch, tmp_path):
+    path = tmp_path / 'schedule_index.json'
+    path.write_text(json.dumps({"2021": [{'round': 1, 'name': "Bahrain Grand Prix", 'sessions': ["Race"]}]}))
+
+    def offline(year, include_testing):
+        raise ValueError("Failed to load any schedule data.")
+
+    monkeypatch.setattr(fastf1, 'get_event_schedule', offline)
+    assert ScheduleIndex(str(path)).session_types(2021, "Bahrain Grand Prix") == ["Race"]
+
+    monkeypatch.setattr(fastf1, 'get_event_schedule', lambda year, include_testing: season_2021())
+    assert ScheduleIndex(str(path), ttl=-1).event_names(2021) == ["Bahrain Grand Prix", "British Grand Prix"]
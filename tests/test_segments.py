@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from segments import SegmentIndex
+from telemetry_store import LapTelemetry
+
+
+class CircuitInfo:
+    def __init__(self, distances):
+        self.corners = pd.DataFrame({
+            'Number': np.arange(1, len(distances) + 1), 'Letter': '', 'Distance': distances,
+        })
+
+
+class FakeSession:
+    """Lap table stand-in with a fastest lap and a circuit info lookup that counts its calls."""
+
+    def __init__(self, circuit_info=None):
+        self.circuit_info = circuit_info
+        self.circuit_info_calls = 0
+        self.laps = self
+
+    def pick_fastest(self):
+        return {'Driver': 'VER', 'LapNumber': 1}
+
+    def get_circuit_info(self):
+        self.circuit_info_calls += 1
+        if self.circuit_info is None:
+            raise ConnectionError("circuit info unavailable")
+        return self.circuit_info
+
+
+class FakeStore:
+    def __init__(self, session_type, session, apexes=(800.0, 2500.0, 4100.0), telemetry_error=None):
+        self.year, self.gp, self.session_type = 2024, "Bahrain Grand Prix", session_type
+        self.session = session
+        self.apexes = apexes
+        self.telemetry_error = telemetry_error
+
+    @property
+    def key(self):
+        return (self.year, self.gp, self.session_type)
+
+    def lap_telemetry(self, lap):
+        if self.telemetry_error is not None:
+            raise self.telemetry_error
+        distance = np.linspace(0.0, 5400.0, 1000)
+        speed = np.full_like(distance, 300.0)
+        for apex in self.apexes:
+            speed = np.minimum(speed, 90 + np.abs(distance - apex) * 0.5)
+        return LapTelemetry({'Distance': distance, 'Speed': speed.astype(np.float32)})
+
+
+def test_speed_minima_fallback_is_per_session_and_not_persisted(tmp_path):
+    index = SegmentIndex(str(tmp_path))
+    wet_fp1 = FakeStore("Practice 1", FakeSession(), apexes=(700.0, 2300.0))
+    qualifying = FakeStore("Qualifying", FakeSession())
+
+    assert index.get(wet_fp1).source == 'speed_minima'
+    assert len(index.get(wet_fp1)) == 2
+    assert len(index.get(qualifying)) == 3
+    assert os.listdir(tmp_path) == []
+    assert wet_fp1.session.circuit_info_calls == 1
+
+
+def test_circuit_info_is_persisted_for_the_whole_weekend(tmp_path):
+    qualifying = FakeStore("Qualifying", FakeSession(CircuitInfo([810.0, 2490.0, 4120.0])))
+    segments = SegmentIndex(str(tmp_path)).get(qualifying)
+    assert segments.source == 'circuit_info' and segments.labels == ['T1', 'T2', 'T3']
+
+    race = FakeStore("Race", FakeSession())
+    reloaded = SegmentIndex(str(tmp_path)).get(race)
+    np.testing.assert_allclose(reloaded.corners, segments.corners)
+    assert race.session.circuit_info_calls == 0
+
+
+def test_circuit_info_failure_is_not_retried(tmp_path):
+    store = FakeStore("Qualifying", FakeSession(), apexes=())
+    index = SegmentIndex(str(tmp_path))
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            index.get(store)
+    assert store.session.circuit_info_calls == 1
+
+
+def test_telemetry_failures_surface_as_value_error(tmp_path):
+    store = FakeStore("Qualifying", FakeSession(), telemetry_error=KeyError('Speed'))
+    with pytest.raises(ValueError, match="No telemetry"):
+        SegmentIndex(str(tmp_path)).get(store)
@@ -0,0 +1,31 @@
+import fastf1
+
+import session_loader
+from telemetry_store import SessionStore
+
+
+class RecordingSession:
+    def __init__(self):
+        self.loads = []
+
+    def load(self, **kwargs):
+        self.loads.append(kwargs)
+
+
+def test_lap_stage_loads_race_control_messages(monkeypatch):
+    session = RecordingSession()
+    monkeypatch.setattr(fastf1, 'get_session', lambda *args: session)
+
+    assert session_loader.load_session_laps(2024, "Bahrain Grand Prix", "Qualifying") is session
+    assert session.loads == [dict(laps=True, telemetry=False, weather=False, messages=True)]
+
+
+def test_deleted_lap_is_not_picked_as_fastest(deleted_lap_session):
+    laps = deleted_lap_session.laps
+    assert laps.loc[(laps['Driver'] == 'VER') & (laps['LapNumber'] == 3), 'Deleted'].item()
+
+    store = SessionStore(2024, "Bahrain Grand Prix", "Qualifying", deleted_lap_session)
+    fastest = store.fastest_lap('VER')
+    assert fastest['LapNumber'] == 4
+    assert fastest['LapTime'].total_seconds() == 90.0
+    assert store.fastest_lap('LEC')['LapNumber'] == 3
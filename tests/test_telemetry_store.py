@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from fastf1.core import Lap
+
+import bulk_telemetry
+import telemetry_store
+from bulk_telemetry import RaggedTelemetry
+from telemetry_store import SessionStore, TelemetryCache
+
+
+def driver_block(driver, laps=4, samples=100):
+    """A driver's laps as one flat RaggedTelemetry block."""
+    rows = laps * samples
+    columns = {
+        'Time': np.tile(np.linspace(0.0, 90.0, samples), laps),
+        'Distance': np.tile(np.linspace(0.0, 5000.0, samples), laps),
+        'Speed': np.linspace(80.0, 320.0, rows).astype(np.float32),
+    }
+    offsets = np.arange(laps + 1) * samples
+    return RaggedTelemetry([driver] * laps, np.arange(1, laps + 1), offsets, columns)
+
+
+def test_cached_laps_do_not_share_the_flat_block(monkeypatch, deleted_lap_session):
+    block = driver_block('VER')
+    monkeypatch.setattr(bulk_telemetry, 'extract_driver_laps', lambda session, driver: block)
+    monkeypatch.setattr(telemetry_store, 'ensure_telemetry', lambda session: None)
+
+    cache = TelemetryCache()
+    store = SessionStore(2024, "Bahrain Grand Prix", "Qualifying", deleted_lap_session, cache)
+    lap = deleted_lap_session.laps.pick_drivers('VER').iloc[1]
+    telemetry = store.lap_telemetry(lap)
+
+    np.testing.assert_array_equal(telemetry['Speed'], block.lap(1)['Speed'])
+    assert len(cache) == 4
+    assert cache.nbytes == sum(values.nbytes for values in block.columns.values())
+    for lap_number in range(1, 5):
+        cached = cache.get(store.key + ('VER', lap_number))
+        for column, values in block.columns.items():
+            assert not np.shares_memory(cached[column], values)
+
+
+def test_laps_the_bulk_pass_skips_fall_back_without_repeating_it(monkeypatch, deleted_lap_session):
+    calls = []
+
+    def extract_driver_laps(session, driver):
+        calls.append(driver)
+        return driver_block(driver)
+
+    def get_telemetry(lap):
+        return pd.DataFrame({'Distance': [0.0, 10.0], 'Speed': [100.0, 110.0], 'X': [0.0, 1.0],
+                             'Y': [0.0, 1.0], 'Time': pd.to_timedelta([0.0, 0.3], unit='s')})
+
+    monkeypatch.setattr(bulk_telemetry, 'extract_driver_laps', extract_driver_laps)
+    monkeypatch.setattr(telemetry_store, 'ensure_telemetry', lambda session: None)
+    monkeypatch.setattr(Lap, 'get_telemetry', get_telemetry)
+
+    cache = TelemetryCache()
+    store = SessionStore(2024, "Bahrain Grand Prix", "Qualifying", deleted_lap_session, cache)
+    ver = deleted_lap_session.laps.pick_drivers('VER')
+
+    # Lap 5 isn't in the bulk block, as for a lap cut_laps leaves out
+    assert len(store.lap_telemetry(ver.iloc[4])) == 2
+    assert len(store.lap_telemetry(ver.iloc[2])) == 100
+    cache.clear()
+    assert len(store.lap_telemetry(ver.iloc[4])) == 2
+    assert calls == ['VER']
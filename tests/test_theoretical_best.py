@@ -0,0 +1,19 @@
+from theoretical_best import fastest_laps, valid_laps
+
+
+def test_deleted_laps_are_not_valid(deleted_lap_session):
+    laps = valid_laps(deleted_lap_session.laps)
+
+    ver = laps.loc[laps['Driver'] == 'VER', 'LapNumber'].tolist()
+    assert ver == [1.0, 2.0, 4.0, 5.0]
+    assert len(laps[laps['Driver'] == 'LEC']) == 5
+
+
+def test_fastest_laps_match_pick_fastest(deleted_lap_session):
+    fastest = fastest_laps(deleted_lap_session.laps)
+
+    for driver in ('VER', 'LEC'):
+        lap = deleted_lap_session.laps.pick_drivers(driver).pick_fastest()
+        assert fastest.loc[driver, 'LapNumber'] == lap['LapNumber']
+        assert fastest.loc[driver, 'LapTime'] == lap['LapTime'].total_seconds()
+    assert fastest.loc['VER', 'LapNumber'] == 4
@@ -0,0 +1,21 @@
+import warmup
+
+
+def test_sessions_are_matched_against_the_schedule(monkeypatch):
+    events = [
+        {'round': 1, 'name': "Bahrain Grand Prix", 'sessions': ["Qualifying", "Race"]},
+        {'round': 10, 'name': "British Grand Prix", 'sessions': ["Qualifying", "Race", "Sprint Qualifying"]},
+    ]
+    monkeypatch.setattr(warmup.schedule_index, 'events', lambda year: events)
+
+    selected = warmup.select_sessions([2021], session_types=["Sprint Qualifying", "Race"])
+    assert selected == [
+        (2021, "Bahrain Grand Prix", "Race"),
+        (2021, "British Grand Prix", "Race"),
+        (2021, "British Grand Prix", "Sprint Qualifying"),
+    ]
+
+
+def test_session_names_are_not_limited_to_known_types():
+    args = warmup.build_parser().parse_args(['2021', '--sessions', "Sprint Qualifying", "Sprint Race"])
+    assert args.sessions == ["Sprint Qualifying", "Sprint Race"]
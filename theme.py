@@ -0,0 +1,111 @@
+"""Shared chart theme and team color palette, built once at import.
+
+Every chart uses the registered 'f1_dark' Plotly template, so figures only
+carry their data traces and a few chart-specific settings in their JSON.
+"""
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Team colors for visualization (2024 season)
+TEAM_COLORS = {
+    'Red Bull Racing': '#3671C6',
+    'Ferrari': '#E8002D',
+    'Mercedes': '#27F4D2',
+    'McLaren': '#FF8000',
+    'Aston Martin': '#229971',
+    'Alpine': '#FF87BC',
+    'Williams': '#64C4FF',
+    'AlphaTauri': '#5E8FAA',
+    'Alfa Romeo': '#C92D4B',
+    'Haas F1 Team': '#B6BABD',
+    'RB': '#6692FF',
+    'Kick Sauber': '#52E252'
+}
+
+# Pirelli compound colors
+COMPOUND_COLORS = {
+    'SOFT': '#DA291C',
+    'MEDIUM': '#FFD12E',
+    'HARD': '#F0F0EC',
+    'INTERMEDIATE': '#43B02A',
+    'WET': '#0067AD',
+}
+UNKNOWN_COMPOUND_COLOR = '#9b9b9b'
+
+# Fallback colors for the first and second driver of a comparison
+DRIVER1_FALLBACK = '#FF0000'
+DRIVER2_FALLBACK = '#0000FF'
+
+FILL_ALPHA = 0.3
+
+CHART_TEMPLATE = 'f1_dark'
+
+_AXIS = dict(
+    gridcolor='#1a1a1a',
+    showgrid=True,
+    zeroline=False,
+    showline=True,
+    linewidth=1.5,
+    linecolor='#2a2a35',
+    title_font=dict(size=12, color='#9b9b9b')
+)
+
+# Boxed corner labels, e.g. "driver ahead" hints on the delta chart
+ANNOTATION_BOX = dict(
+    xref="paper", yref="paper",
+    showarrow=False,
+    bgcolor='rgba(21, 21, 30, 0.95)',
+    bordercolor='#2a2a35',
+    borderwidth=1,
+    borderpad=8
+)
+
+
+def hex_to_rgba(color, alpha):
+    """Convert a '#RRGGBB' color to an rgba() string."""
+    return f'rgba({int(color[1:3], 16)}, {int(color[3:5], 16)}, {int(color[5:7], 16)}, {alpha})'
+
+
+def _palette_entry(color):
+    return {'line': color, 'fill': hex_to_rgba(color, FILL_ALPHA)}
+
+
+TEAM_PALETTE = {team: _palette_entry(color) for team, color in TEAM_COLORS.items()}
+_FALLBACK_PALETTE = {color: _palette_entry(color) for color in (DRIVER1_FALLBACK, DRIVER2_FALLBACK)}
+
+
+def team_palette(team, fallback):
+    """Return the {'line', 'fill'} colors for a team, or for the fallback color."""
+    palette = TEAM_PALETTE.get(team)
+    if palette is None:
+        palette = _FALLBACK_PALETTE.get(fallback) or _palette_entry(fallback)
+    return palette
+
+
+def _register_template():
+    template = go.layout.Template()
+    template.layout.update(
+        showlegend=True,
+        hovermode='x unified',
+        plot_bgcolor='#0a0a0a',
+        paper_bgcolor='#000000',
+        font=dict(color='#9b9b9b', size=11, family='Inter'),
+        margin=dict(l=60, r=40, t=20, b=60),
+        legend=dict(
+            orientation="h",
+            yanchor="top",
+            y=1.02,
+            xanchor="left",
+            x=0,
+            font=dict(size=12, color='#ffffff'),
+            bgcolor='rgba(21, 21, 30, 0.95)',
+            bordercolor='#2a2a35',
+            borderwidth=1
+        ),
+        xaxis=_AXIS,
+        yaxis=_AXIS
+    )
+    pio.templates[CHART_TEMPLATE] = template
+
+
+_register_template()
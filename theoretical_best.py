@@ -0,0 +1,144 @@
+"""Theoretical best laps from the quickest minisectors across every lap.
+
+Every valid lap of a session is aligned onto one distance grid and cut into
+minisectors once, giving a (laps x minisectors) time matrix with rows grouped
+by driver, cached per session. A driver's best minisectors are then one
+np.minimum.reduceat over their block of rows, and the field's one min over
+the whole matrix, so re-reading them for hundreds of laps costs nothing.
+"""
+import numpy as np
+import pandas as pd
+
+from alignment import DEFAULT_MINISECTORS, align_laps, complete_laps, minisector_times
+from delta import DEFAULT_RESOLUTION
+from metrics import metrics
+from session_cache import SessionCache
+from workers import extract_executor
+
+
+def valid_laps(laps):
+    """Return timed laps that are not in/out laps or deleted, grouped by driver in lap order."""
+    keep = laps['LapTime'].notna() & laps['PitInTime'].isna() & laps['PitOutTime'].isna()
+    if 'Deleted' in laps.columns:
+        keep &= ~laps['Deleted'].fillna(False).astype(bool)
+    return laps[keep].sort_values(['Driver', 'LapNumber'], kind='stable')
+
+
+def fastest_laps(laps):
+    """Return every driver's pick_fastest() lap number and time in seconds, indexed by driver.
+
+    Like Laps.pick_fastest(), only laps marked as personal bests count.
+    """
+    timed = laps[laps['LapTime'].notna()]
+    if 'IsPersonalBest' in timed.columns:
+        timed = timed[timed['IsPersonalBest'] == True]  # noqa: E712
+    fastest = timed.loc[timed.groupby('Driver')['LapTime'].idxmin(), ['Driver', 'LapNumber', 'LapTime']]
+    return pd.DataFrame({
+        'LapNumber': fastest['LapNumber'].to_numpy(),
+        'LapTime': fastest['LapTime'].dt.total_seconds().to_numpy(),
+    }, index=fastest['Driver'].to_numpy())
+
+
+class MinisectorTimes:
+    """Time spent in every minisector on every valid lap of a session.
+
+    Row i of `times` is lap lap_numbers[i]; rows are grouped by driver, with
+    driver j's laps starting at row starts[j]. `bounds` holds the minisector
+    boundary distances.
+    """
+
+    def __init__(self, drivers, teams, starts, lap_numbers, lap_times, times, bounds, fastest):
+        self.drivers = drivers
+        self.teams = teams
+        self.starts = starts
+        self.lap_numbers = lap_numbers
+        self.lap_times = lap_times
+        self.times = times
+        self.bounds = bounds
+        self.fastest = fastest
+
+    @property
+    def counts(self):
+        return np.diff(np.append(self.starts, len(self.times)))
+
+    def theoretical_best(self):
+        """Compare every driver's and the field's best minisectors with their fastest lap.
+
+        A theoretical best is the quickest lap of the group minus the time it
+        lost to the group's best time in each minisector; the aligned range
+        can stop short of the line, so the lap's own official time is the base.
+        """
+        row_driver = np.repeat(np.arange(len(self.drivers)), self.counts)
+
+        # Every driver's best time in every minisector in one reduction
+        best = np.minimum.reduceat(self.times, self.starts, axis=0)
+        quickest = np.lexsort((self.lap_times, row_driver))[self.starts]
+        lost = self.times[quickest].sum(axis=1) - best.sum(axis=1)
+        theoretical = self.lap_times[quickest] - lost
+
+        field_best = self.times.min(axis=0)
+        owners = row_driver[self.times.argmin(axis=0)]
+        field_quickest = int(np.argmin(self.lap_times))
+        field_theoretical = self.lap_times[field_quickest] - (self.times[field_quickest].sum() - field_best.sum())
+
+        fastest = self.fastest.reindex(self.drivers)
+        drivers = pd.DataFrame({
+            'Driver': self.drivers,
+            'Team': self.teams,
+            'Laps': self.counts,
+            'FastestLap': fastest['LapNumber'].to_numpy(),
+            'Fastest': fastest['LapTime'].to_numpy(),
+            'Theoretical': theoretical,
+            'Gain': fastest['LapTime'].to_numpy() - theoretical,
+            'MinisectorsOwned': np.bincount(owners, minlength=len(self.drivers)),
+        }).sort_values('Theoretical', kind='stable').reset_index(drop=True)
+
+        return {
+            'drivers': drivers,
+            'field_theoretical': field_theoretical,
+            'field_fastest': float(np.nanmin(self.fastest['LapTime'])),
+            'field_fastest_driver': str(self.fastest['LapTime'].idxmin()),
+            'sector_times': field_best,
+            'sector_owners': self.drivers[owners],
+            'sector_gap': best - field_best,
+            'sector_bounds': self.bounds,
+        }
+
+
+def _lap_telemetry(store, lap):
+    try:
+        return store.lap_telemetry(lap)
+    except Exception:
+        return None
+
+
+def build_minisector_times(store, minisectors=DEFAULT_MINISECTORS, resolution=DEFAULT_RESOLUTION):
+    """Align every valid lap of a session and cut it into minisectors."""
+    laps = valid_laps(store.session.laps)
+    lap_list = [laps.iloc[i] for i in range(len(laps))]
+    telemetry = list(extract_executor.map(lambda lap: _lap_telemetry(store, lap), lap_list))
+
+    usable = np.array([t is not None and len(t) >= 2 for t in telemetry], dtype=bool)
+    if usable.sum() < 2:
+        raise ValueError("Need at least two laps with telemetry")
+    keep = np.flatnonzero(usable)
+    keep = keep[complete_laps([telemetry[i] for i in keep])]
+
+    aligned = align_laps([telemetry[i] for i in keep], resolution, channels=('Time',))
+    times, bounds = minisector_times(aligned, minisectors)
+
+    kept = laps.iloc[keep]
+    drivers, starts = np.unique(kept['Driver'].to_numpy(dtype=str), return_index=True)
+    teams = kept['Team'].to_numpy()[starts]
+    return MinisectorTimes(
+        drivers, teams, starts,
+        kept['LapNumber'].to_numpy(dtype=np.int64),
+        kept['LapTime'].dt.total_seconds().to_numpy(),
+        times, aligned['distance'][bounds],
+        fastest_laps(store.session.laps),
+    )
+
+
+# Shared by every rerun and user in this process
+minisector_cache = SessionCache(build_minisector_times, 'build_minisector_times')
+metrics.register_cache('minisectors', minisector_cache.stats)
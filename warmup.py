@@ -0,0 +1,148 @@
+"""Warm the Fast-F1 cache and the offline archive ahead of deployment.
+
+Every selected session is loaded through Fast-F1 (filling cache/) and exported
+to the archive, so no user ever waits on a cold load. Progress is recorded in
+a manifest after each session; a rerun skips everything already marked done.
+
+Usage:
+    python warmup.py 2023-2024
+    python warmup.py 2024 --events "Bahrain Grand Prix" 5 --sessions Qualifying Race --workers 4
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import fastf1
+
+from archive import ARCHIVE_DIR, export_session
+from schedule import schedule_index
+
+DEFAULT_SESSIONS = ("Qualifying", "Race")
+DEFAULT_WORKERS = 2
+CACHE_DIR = 'cache'
+MANIFEST_FILE = 'manifest.json'
+
+
+def parse_years(value):
+    """Parse '2024' or an inclusive range like '2018-2024'."""
+    first, _, last = value.partition('-')
+    first = int(first)
+    last = int(last) if last else first
+    return list(range(min(first, last), max(first, last) + 1))
+
+
+def select_sessions(years, events=None, session_types=DEFAULT_SESSIONS):
+    """List (year, event name, session type) to warm, in schedule order.
+
+    `events` holds event names or round numbers; None selects every event.
+    """
+    wanted = {str(event) for event in events} if events else None
+    selected = []
+    for year in years:
+        for event in schedule_index.events(year):
+            if wanted is not None and event['name'] not in wanted and str(event['round']) not in wanted:
+                continue
+            for session_type in event['sessions']:
+                if session_type in session_types:
+                    selected.append((year, event['name'], session_type))
+    return selected
+
+
+def manifest_key(year, gp, session_type):
+    return f"{year}|{gp}|{session_type}"
+
+
+class Manifest:
+    """Per-session warm-up results, saved after every update so runs can resume."""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def done(self, key):
+        return self.entries.get(key, {}).get('status') == 'ok'
+
+    def record(self, key, **entry):
+        entry['finished_at'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self.entries[key] = entry
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+def _init_worker(cache_dir):
+    fastf1.Cache.enable_cache(cache_dir)
+    fastf1.set_log_level('WARNING')
+
+
+def warm_session(year, gp, session_type, directory):
+    """Load and archive one session; runs in a worker process."""
+    start = time.perf_counter()
+    laps = export_session(year, gp, session_type, directory)
+    return {'laps': laps, 'seconds': round(time.perf_counter() - start, 1)}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Pre-populate the Fast-F1 cache and the offline archive")
+    parser.add_argument('years', type=parse_years, help="season or inclusive range, e.g. 2024 or 2018-2024")
+    parser.add_argument('--events', nargs='+', help="event names or round numbers (default: all)")
+    parser.add_argument('--sessions', nargs='+', default=list(DEFAULT_SESSIONS),
+                        help="session names as listed in the schedule (default: Qualifying Race)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--directory', default=ARCHIVE_DIR)
+    parser.add_argument('--manifest', help=f"manifest path (default: <directory>/{MANIFEST_FILE})")
+    parser.add_argument('--force', action='store_true', help="redo sessions the manifest marks as done")
+    return parser
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if not os.path.exists(CACHE_DIR):
+        os.makedirs(CACHE_DIR)
+    _init_worker(CACHE_DIR)
+
+    manifest = Manifest(args.manifest or os.path.join(args.directory, MANIFEST_FILE))
+    sessions = select_sessions(args.years, args.events, args.sessions)
+    # Names come from the schedule itself, so older and renamed sessions
+    # (e.g. 2021 "Sprint Qualifying") can be warmed; reject ones it never lists
+    unknown = set(args.sessions) - {session_type for _, _, session_type in sessions}
+    if unknown:
+        parser.error(f"no selected event has session(s): {', '.join(sorted(unknown))}")
+    pending = [s for s in sessions if args.force or not manifest.done(manifest_key(*s))]
+    print(f"{len(sessions)} sessions selected, {len(sessions) - len(pending)} already done")
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(CACHE_DIR,)) as pool:
+        futures = {pool.submit(warm_session, *session, args.directory): session for session in pending}
+        for future in as_completed(futures):
+            session = futures[future]
+            key = manifest_key(*session)
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                manifest.record(key, status='failed', error=str(e))
+                print(f"FAILED {' '.join(map(str, session))}: {e}")
+            else:
+                manifest.record(key, status='ok', **result)
+                print(f"ok     {' '.join(map(str, session))}: {result['laps']} laps in {result['seconds']}s")
+
+    print(f"{len(pending) - failed} warmed, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
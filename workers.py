@@ -0,0 +1,12 @@
+"""Thread pools shared by every rerun and user in this process."""
+from concurrent.futures import ThreadPoolExecutor
+
+PREFETCH_WORKERS = 2
+EXTRACT_WORKERS = 4
+
+# Background warm-up of the telemetry cache after a session loads
+prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='prefetch')
+
+# Telemetry extraction for the drivers a user is comparing right now, kept
+# separate so a Compare click never queues behind prefetch work
+extract_executor = ThreadPoolExecutor(max_workers=EXTRACT_WORKERS, thread_name_prefix='extract')